@@ -0,0 +1 @@
+"""Performance benchmarks for Pantsagon use cases."""
@@ -0,0 +1,41 @@
+"""pytest-benchmark entry point for the suite in ``benchmarks.suite``.
+
+Not collected by a plain ``pytest`` run; invoke it explicitly::
+
+    pytest benchmarks/bench_pytest.py --benchmark-json=out.json
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from benchmarks import suite  # noqa: F401  # pyright: ignore[reportUnusedImport]  (registers benchmarks)
+from benchmarks.fixtures import configure
+from benchmarks.harness import REGISTRY, Benchmark, missing_requirements
+
+pytest.importorskip("pytest_benchmark")
+
+CASES = [
+    pytest.param(bench, param, id=bench.case_id(param))
+    for bench in REGISTRY
+    for param in bench.params
+]
+
+
+@pytest.mark.parametrize(("bench", "param"), CASES)
+def test_benchmark(benchmark: Any, bench: Benchmark, param: int, tmp_path: Path) -> None:
+    missing = missing_requirements(bench)
+    if missing:
+        pytest.skip(f"missing {', '.join(missing)}")
+    configure()
+    rounds = iter(range(1_000_000))
+
+    def _setup() -> tuple[tuple[Any], dict[str, Any]]:
+        round_dir = tmp_path / str(next(rounds))
+        round_dir.mkdir()
+        return (bench.setup(round_dir, param),), {}
+
+    benchmark.pedantic(bench.run, setup=_setup, rounds=bench.rounds)
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from pantsagon.adapters.policy import pack_validator
+from pantsagon.tools.generate_fixtures import generate_pack, generate_repo, service_names
+
+__all__ = ["configure", "generate_pack", "generate_repo", "repo_root", "service_names"]
+
+
+def repo_root() -> Path:
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "packs" / "_index.json").is_file():
+            return parent
+    raise RuntimeError("Could not locate repo root")
+
+
+def configure() -> Path:
+    root = repo_root()
+    os.environ["PANTS_BUILDROOT"] = str(root)
+    pack_validator.SCHEMA_PATH = pack_validator.schema_path(root)
+    return root
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Generator
+
+SetupFn = Callable[[Path, int], Any]
+RunFn = Callable[[Any], Any]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    setup: SetupFn
+    run: RunFn
+    params: tuple[int, ...]
+    rounds: int = 3
+    requires: tuple[str, ...] = ()
+
+    def case_id(self, param: int) -> str:
+        return f"{self.name}[{param}]"
+
+
+REGISTRY: list[Benchmark] = []
+
+
+def benchmark(
+    name: str,
+    *,
+    params: tuple[int, ...],
+    setup: SetupFn,
+    rounds: int = 3,
+    requires: tuple[str, ...] = (),
+) -> Callable[[RunFn], RunFn]:
+    def _register(run: RunFn) -> RunFn:
+        REGISTRY.append(
+            Benchmark(
+                name=name,
+                setup=setup,
+                run=run,
+                params=params,
+                rounds=rounds,
+                requires=requires,
+            )
+        )
+        return run
+
+    return _register
+
+
+@dataclass
+class CaseResult:
+    name: str
+    param: int
+    timings: list[float] = field(default_factory=list[float])
+
+    @property
+    def case_id(self) -> str:
+        return f"{self.name}[{self.param}]"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.case_id,
+            "name": self.name,
+            "param": self.param,
+            "rounds": len(self.timings),
+            "min": min(self.timings),
+            "median": statistics.median(self.timings),
+            "mean": statistics.fmean(self.timings),
+            "max": max(self.timings),
+        }
+
+
+@contextlib.contextmanager
+def _silenced() -> Generator[None]:
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            yield
+
+
+def missing_requirements(bench: Benchmark) -> list[str]:
+    return [name for name in bench.requires if importlib.util.find_spec(name) is None]
+
+
+def run_case(bench: Benchmark, param: int, workdir: Path, rounds: int | None = None) -> CaseResult:
+    result = CaseResult(name=bench.name, param=param)
+    for round_index in range(rounds or bench.rounds):
+        round_dir = workdir / f"{bench.name}-{param}-{round_index}"
+        round_dir.mkdir(parents=True)
+        with _silenced():
+            state = bench.setup(round_dir, param)
+            start = time.perf_counter()
+            bench.run(state)
+            result.timings.append(time.perf_counter() - start)
+    return result
+
+
+def environment() -> dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def results_payload(results: list[CaseResult]) -> dict[str, Any]:
+    return {
+        "benchmark_schema_version": 1,
+        "environment": environment(),
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def load_results(path: Path) -> dict[str, dict[str, Any]]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {str(item["id"]): item for item in data.get("results", [])}
+
+
+def compare(
+    current: list[dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for item in current:
+        base = baseline.get(str(item["id"]))
+        if base is None:
+            rows.append({"id": item["id"], "current": item["median"], "status": "new"})
+            continue
+        ratio = item["median"] / base["median"] if base["median"] else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        rows.append(
+            {
+                "id": item["id"],
+                "baseline": base["median"],
+                "current": item["median"],
+                "ratio": ratio,
+                "status": status,
+            }
+        )
+    return rows
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks import suite  # noqa: F401  # pyright: ignore[reportUnusedImport]  (registers benchmarks)
+from benchmarks.fixtures import configure
+from benchmarks.harness import (
+    REGISTRY,
+    CaseResult,
+    compare,
+    load_results,
+    missing_requirements,
+    results_payload,
+    run_case,
+)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run Pantsagon performance benchmarks")
+    parser.add_argument(
+        "-k", "--filter", default="", help="Only run benchmarks whose id contains this"
+    )
+    parser.add_argument("--rounds", type=int, help="Override the number of rounds per case")
+    parser.add_argument(
+        "--quick", action="store_true", help="Only run the smallest size of each benchmark"
+    )
+    parser.add_argument("--output", type=Path, help="Write JSON results to this path")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="Compare medians against this results file (default: benchmarks/baseline.json)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative slowdown of the median that counts as a regression (default: 0.25)",
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to --baseline")
+    parser.add_argument(
+        "--no-compare", action="store_true", help="Only measure; do not compare with a baseline"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    configure()
+
+    results: list[CaseResult] = []
+    with tempfile.TemporaryDirectory(prefix="pantsagon-bench-") as tempdir:
+        workdir = Path(tempdir)
+        for bench in REGISTRY:
+            params = bench.params[:1] if args.quick else bench.params
+            for param in params:
+                case_id = bench.case_id(param)
+                if args.filter not in case_id:
+                    continue
+                missing = missing_requirements(bench)
+                if missing:
+                    print(f"skip {case_id}: missing {', '.join(missing)}")
+                    continue
+                result = run_case(bench, param, workdir, rounds=args.rounds)
+                summary = result.to_dict()
+                print(f"{case_id:<32} median {summary['median']:.4f}s  min {summary['min']:.4f}s")
+                results.append(result)
+
+    payload = results_payload(results)
+    if args.output:
+        args.output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if args.no_compare:
+        return 0
+    if not args.baseline.exists():
+        print(
+            f"No baseline at {args.baseline}. Record one with --save-baseline, "
+            "or pass --no-compare to only measure.",
+            file=sys.stderr,
+        )
+        return 2
+    rows = compare(payload["results"], load_results(args.baseline), args.threshold)
+    regressions = [row for row in rows if row["status"] == "regression"]
+    for row in rows:
+        if "ratio" in row:
+            print(f"{row['id']:<32} {row['ratio']:.2f}x baseline  {row['status']}")
+        else:
+            print(f"{row['id']:<32} no baseline")
+    if regressions:
+        print(f"Regressions: {len(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
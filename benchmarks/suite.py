@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+from pantsagon.adapters.pack_catalog.bundled import BundledPackCatalog
+from pantsagon.adapters.pack_store.digest import DigestEngine, tree_digest
+from pantsagon.adapters.policy.pack_validator import PackPolicyEngine
+from pantsagon.adapters.renderer.copier_renderer import CopierRenderer
+from pantsagon.adapters.workspace.filesystem import FilesystemWorkspace
+from pantsagon.application.add_service import add_service
+from pantsagon.application.init_repo import init_repo
+from pantsagon.application.validate_repo import validate_repo
+
+from benchmarks.fixtures import generate_pack, generate_repo, repo_root, service_names
+from benchmarks.harness import benchmark
+
+
+def _assert_ok(result: Any) -> None:
+    errors = [d for d in result.diagnostics if d.severity.value == "error"]
+    if errors:
+        raise RuntimeError(f"benchmark run produced errors: {errors}")
+
+
+def _setup_init(workdir: Path, services: int) -> dict[str, Any]:
+    return {"repo": workdir / "repo", "services": service_names(services)}
+
+
+@benchmark("init_repo", params=(1, 10, 100), setup=_setup_init, requires=("copier",))
+def bench_init_repo(state: dict[str, Any]) -> None:
+    repo: Path = state["repo"]
+    repo.mkdir()
+    result = init_repo(
+        repo,
+        ["python"],
+        state["services"],
+        ["openapi", "docker"],
+        renderer="copier",
+        renderer_port=CopierRenderer(),
+        pack_catalog=BundledPackCatalog(repo_root() / "packs"),
+        policy_engine=PackPolicyEngine(),
+        workspace=FilesystemWorkspace(repo),
+    )
+    _assert_ok(result)
+
+
+def _setup_repo(workdir: Path, services: int) -> Path:
+    return generate_repo(workdir / "repo", services=services)
+
+
+@benchmark("add_service", params=(10, 100, 1000), setup=_setup_repo, requires=("copier",))
+def bench_add_service(repo: Path) -> None:
+    result = add_service(
+        repo,
+        name="bench-new",
+        lang="python",
+        renderer_port=CopierRenderer(),
+        policy_engine=PackPolicyEngine(),
+        workspace=FilesystemWorkspace(repo),
+    )
+    _assert_ok(result)
+
+
+@benchmark("validate_repo", params=(100, 1000, 5000), setup=_setup_repo)
+def bench_validate_repo(repo: Path) -> None:
+    _assert_ok(validate_repo(repo, policy_engine=PackPolicyEngine()))
+
+
+def _setup_pack(workdir: Path, templates: int) -> Path:
+    return generate_pack(workdir / "pack", templates=templates, depth=4)
+
+
+@benchmark("validate_pack", params=(100, 1000, 5000), setup=_setup_pack)
+def bench_validate_pack(pack: Path) -> None:
+    _assert_ok(PackPolicyEngine().validate_pack(pack))
+
+
+def _setup_digest(workdir: Path, templates: int) -> tuple[DigestEngine, Path]:
+    pack = generate_pack(workdir / "pack", templates=templates, depth=4)
+    return DigestEngine(workdir / "stat-cache.json"), pack
+
+
+@benchmark("pack_digest_cold", params=(1000, 5000), setup=_setup_digest)
+def bench_pack_digest_cold(state: tuple[DigestEngine, Path]) -> None:
+    engine, pack = state
+    engine.digest(pack)
+
+
+@benchmark("pack_digest_naive", params=(1000, 5000), setup=_setup_digest)
+def bench_pack_digest_naive(state: tuple[DigestEngine, Path]) -> None:
+    tree_digest(state[1])
+
+
+def _setup_digest_warm(workdir: Path, templates: int) -> tuple[DigestEngine, Path]:
+    engine, pack = _setup_digest(workdir, templates)
+    for path in pack.rglob("*"):
+        if path.is_file():
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 60_000_000_000))
+    engine.digest(pack)
+    return DigestEngine(engine.cache_path), pack
+
+
+@benchmark("pack_digest_warm", params=(1000, 5000), setup=_setup_digest_warm)
+def bench_pack_digest_warm(state: tuple[DigestEngine, Path]) -> None:
+    engine, pack = state
+    engine.digest(pack)
+
+
+def _setup_stage(workdir: Path, files: int) -> tuple[FilesystemWorkspace, Path]:
+    repo = workdir / "repo"
+    repo.mkdir()
+    workspace = FilesystemWorkspace(repo)
+    stage = workspace.begin_transaction()
+    payload = b"x = 1\n" * 64
+    for index in range(files):
+        rel = Path("services") / f"svc-{index // 100:04d}" / f"module_{index % 100:03d}.py"
+        (stage / rel).parent.mkdir(parents=True, exist_ok=True)
+        (stage / rel).write_bytes(payload)
+        # A quarter of the files already exist so commit also exercises backups.
+        if index % 4 == 0:
+            (repo / rel).parent.mkdir(parents=True, exist_ok=True)
+            (repo / rel).write_bytes(b"old\n")
+    return workspace, stage
+
+
+@benchmark("workspace_commit", params=(1000, 10000), setup=_setup_stage)
+def bench_workspace_commit(state: tuple[FilesystemWorkspace, Path]) -> None:
+    workspace, stage = state
+    workspace.commit(stage)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+
+@dataclass
+class IOMetrics:
+    """File I/O counters shared by the workspace and renderer adapters.
+
+    Adapters only collect them when given an instance, which the CLI does under ``--profile``.
+    """
+
+    files_created: int = 0
+    files_overwritten: int = 0
+    bytes_written: int = 0
+    bytes_backed_up: int = 0
+    dirs_created: int = 0
+    files_unchanged: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "_lock"}
+
+
+def io_metrics_artifact(**sources: IOMetrics | None) -> dict[str, Any]:
+    snapshots = {name: metrics.snapshot() for name, metrics in sources.items() if metrics}
+    total: dict[str, int] = {}
+    for snapshot in snapshots.values():
+        for key, value in snapshot.items():
+            total[key] = total.get(key, 0) + value
+    return {"kind": "io_metrics", "total": total, **snapshots}
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, cast
+
+import yaml
+
+from pantsagon.adapters.errors import PackReadError
+from pantsagon.adapters.pack_store.digest import IGNORED_NAMES, tree_digest
+from pantsagon.ports.pack_archive import PackArchiveInfo
+
+INDEX_NAME = ".pantsagon-index.json"
+INDEX_FORMAT = 1
+_COMMENT_PREFIX = b"pantsagon-index "
+_EOCD_SIGNATURE = b"PK\x05\x06"
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+_LOCAL_HEADER = struct.Struct("<4s22xHH")
+# Fixed timestamp so the same pack tree always produces the same archive bytes.
+_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def _member(name: str, mode: int) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=_EPOCH)
+    info.compress_type = zipfile.ZIP_STORED
+    info.create_system = 3
+    info.external_attr = (stat.S_IFREG | mode) << 16
+    return info
+
+
+def _pack_tree(pack_path: Path) -> tuple[list[str], list[tuple[str, Path]]]:
+    dirs: list[str] = []
+    files: list[tuple[str, Path]] = []
+    for dirpath, dirnames, filenames in os.walk(pack_path):
+        dirnames[:] = sorted(name for name in dirnames if name not in IGNORED_NAMES)
+        for name in [*dirnames, *filenames]:
+            if name in IGNORED_NAMES:
+                continue
+            path = Path(dirpath) / name
+            if path.is_symlink():
+                raise PackReadError(
+                    "Pack archives cannot contain symlinks", details={"path": str(path)}
+                )
+            rel = path.relative_to(pack_path).as_posix()
+            if name in filenames:
+                files.append((rel, path))
+            else:
+                dirs.append(rel)
+    return sorted(dirs), sorted(files)
+
+
+def build_archive(pack_path: Path, output: Path) -> PackArchiveInfo:
+    """Write ``pack_path`` as an uncompressed zip whose last member indexes the others.
+
+    Members are stored, not deflated, so a reader can hand out slices of a memory map.
+    The archive comment records where the index lives and its size, so opening an
+    archive does not parse the zip central directory.
+    """
+    raw: object = yaml.safe_load((pack_path / "pack.yaml").read_text()) or {}
+    manifest = cast(dict[str, Any], raw) if isinstance(raw, dict) else {}
+    entries: dict[str, dict[str, Any]] = {}
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=".incoming-", dir=output.parent)
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(tmp_name, "w", compression=zipfile.ZIP_STORED) as archive:
+            dirs, files = _pack_tree(pack_path)
+            for name, path in files:
+                data = path.read_bytes()
+                mode = 0o755 if path.stat().st_mode & 0o111 else 0o644
+                archive.writestr(_member(name, mode), data)
+                entries[name] = {
+                    "header_offset": archive.getinfo(name).header_offset,
+                    "size": len(data),
+                    "mode": mode,
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                }
+            index = {
+                "format": INDEX_FORMAT,
+                "pack": {"id": manifest.get("id"), "version": manifest.get("version")},
+                "digest": tree_digest(pack_path),
+                "dirs": dirs,
+                "files": entries,
+            }
+            payload = json.dumps(index, sort_keys=True).encode()
+            archive.writestr(_member(INDEX_NAME, 0o644), payload)
+            offset = archive.getinfo(INDEX_NAME).header_offset
+            archive.comment = _COMMENT_PREFIX + f"{offset} {len(payload)}".encode()
+        os.replace(tmp_name, output)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return PackArchiveInfo(
+        path=output,
+        pack_id=str(manifest.get("id") or ""),
+        version=str(manifest.get("version") or ""),
+        digest=str(index["digest"]),
+        files=len(entries),
+        size_bytes=output.stat().st_size,
+    )
+
+
+class PackArchive:
+    """A pack archive opened read-only through ``mmap``; members are never copied to disk."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as handle:
+            try:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise PackReadError("Pack archive is empty", details={"path": str(path)}, cause=e)
+        try:
+            self.index = self._read_index()
+        except Exception:
+            self._map.close()
+            raise
+        self.files = cast(dict[str, dict[str, Any]], self.index.get("files") or {})
+
+    def __enter__(self) -> PackArchive:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    @property
+    def digest(self) -> str:
+        return str(self.index.get("digest") or "")
+
+    def _error(self, message: str) -> PackReadError:
+        return PackReadError(message, details={"path": str(self.path)})
+
+    def _data_offset(self, header_offset: int) -> int:
+        try:
+            signature, name_len, extra_len = _LOCAL_HEADER.unpack_from(self._map, header_offset)
+        except struct.error:
+            raise self._error("Pack archive index points outside the archive")
+        if signature != _LOCAL_SIGNATURE:
+            raise self._error("Pack archive index does not match its members")
+        return header_offset + _LOCAL_HEADER.size + name_len + extra_len
+
+    def _read_index(self) -> dict[str, Any]:
+        eocd = self._map.rfind(_EOCD_SIGNATURE, max(0, len(self._map) - (22 + 0xFFFF)))
+        if eocd < 0:
+            raise self._error("Not a pack archive")
+        comment = self._map[eocd + 22 : len(self._map)]
+        if not comment.startswith(_COMMENT_PREFIX):
+            raise self._error("Pack archive has no index")
+        try:
+            offset, size = (int(part) for part in comment[len(_COMMENT_PREFIX) :].split())
+        except ValueError:
+            raise self._error("Pack archive has a malformed index pointer")
+        start = self._data_offset(offset)
+        raw: object = json.loads(self._map[start : start + size])
+        if not isinstance(raw, dict) or raw.get("format") != INDEX_FORMAT:
+            raise self._error("Unsupported pack archive index")
+        return cast(dict[str, Any], raw)
+
+    def read_bytes(self, name: str) -> memoryview:
+        entry = self.files.get(name)
+        if entry is None:
+            raise PackReadError("Pack archive has no such file", details={"name": name})
+        start = self._data_offset(int(entry["header_offset"]))
+        return memoryview(self._map)[start : start + int(entry["size"])]
+
+    def read_text(self, name: str) -> str:
+        view = self.read_bytes(name)
+        try:
+            return str(view, "utf-8")
+        finally:
+            view.release()
+
+    def manifest(self) -> dict[str, Any]:
+        raw: object = yaml.safe_load(self.read_text("pack.yaml")) or {}
+        if isinstance(raw, dict):
+            return cast(dict[str, Any], raw)
+        return {}
+
+    def extract(self, dest: Path) -> None:
+        """Write every member under ``dest``, checking each against its indexed hash."""
+        dest.mkdir(parents=True, exist_ok=True)
+        root = dest.resolve()
+
+        def member_path(name: str) -> Path:
+            target = dest / name
+            if not target.resolve().is_relative_to(root):
+                raise PackReadError("Pack archive member escapes the pack", details={"name": name})
+            return target
+
+        for name in self.index.get("dirs") or []:
+            member_path(str(name)).mkdir(parents=True, exist_ok=True)
+        for name, entry in self.files.items():
+            target = member_path(name)
+            view = self.read_bytes(name)
+            try:
+                if hashlib.sha256(view).hexdigest() != entry["sha256"]:
+                    raise PackReadError("Pack archive member is corrupt", details={"name": name})
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with open(target, "wb") as handle:
+                    handle.write(view)
+            finally:
+                view.release()
+            os.chmod(target, int(entry["mode"]))
+
+
+class ZipPackArchiver:
+    def build(self, pack_path: Path, output: Path) -> PackArchiveInfo:
+        return build_archive(pack_path, output)
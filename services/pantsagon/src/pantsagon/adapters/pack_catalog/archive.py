@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, cast
+
+import yaml
+
+from pantsagon.adapters.errors import PackFetchError
+from pantsagon.adapters.pack_archive.zip_archive import PackArchive
+from pantsagon.adapters.pack_store.content_store import ContentAddressedPackStore
+from pantsagon.domain.pack import PackRef
+
+
+class ArchivePackCatalog:
+    """Serves packs from single-file archives.
+
+    Manifests are read straight from the memory-mapped archive. The renderer needs a
+    directory, so each archive digest is unpacked once into the pack store and reused.
+    """
+
+    def __init__(self, store: ContentAddressedPackStore | None = None) -> None:
+        self.store = store if store is not None else ContentAddressedPackStore()
+
+    def get_pack_path(self, pack: PackRef) -> Path:
+        if not pack.location:
+            raise PackFetchError("Pack archive has no location", details={"pack": pack.id})
+        with PackArchive(Path(pack.location)) as archive:
+            return self.store.materialize(archive.digest, archive.extract)
+
+    def load_manifest(self, pack_path: Path) -> dict[str, Any]:
+        if pack_path.is_file():
+            with PackArchive(pack_path) as archive:
+                return archive.manifest()
+        raw: object = yaml.safe_load((pack_path / "pack.yaml").read_text()) or {}
+        if isinstance(raw, dict):
+            return cast(dict[str, Any], raw)
+        return {}
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import io
+import os
+import re
+import shutil
+import subprocess
+import tarfile
+import tempfile
+from pathlib import Path
+from typing import Any, cast
+
+import yaml
+
+from pantsagon.adapters.cache_dir import default_cache_dir
+from pantsagon.adapters.errors import PackFetchError
+from pantsagon.domain.pack import PackRef
+
+_COMMIT_RE = re.compile(r"^[0-9a-f]{40}$")
+
+
+def default_export_root() -> Path:
+    return default_cache_dir() / "git"
+
+
+class GitPackCatalog:
+    """Resolves packs from local git repositories into a cache keyed by commit id."""
+
+    def __init__(self, cache_root: Path | None = None, git: str = "git") -> None:
+        self.cache_root = cache_root if cache_root is not None else default_export_root()
+        self.git = git
+
+    def _run(self, repo: Path, *args: str) -> bytes:
+        try:
+            completed = subprocess.run(
+                [self.git, "-C", str(repo), *args],
+                check=True,
+                capture_output=True,
+            )
+        except FileNotFoundError as e:
+            raise PackFetchError("git executable not found", details={"git": self.git}, cause=e)
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode("utf-8", "replace").strip()
+            raise PackFetchError(
+                f"git {args[0]} failed: {stderr}", details={"repo": str(repo)}, cause=e
+            )
+        return completed.stdout
+
+    def resolve_commit(self, location: Path, ref: str) -> str:
+        if _COMMIT_RE.match(ref) and (self.cache_root / ref).is_dir():
+            return ref
+        output = self._run(location, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+        return output.decode("ascii").strip()
+
+    def _export(self, location: Path, commit: str) -> Path:
+        target = self.cache_root / commit
+        if target.is_dir():
+            return target
+        archive = self._run(location, "archive", "--format=tar", commit)
+        self.cache_root.mkdir(parents=True, exist_ok=True)
+        scratch = Path(tempfile.mkdtemp(prefix=".incoming-", dir=self.cache_root))
+        try:
+            with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+                tar.extractall(scratch / "tree", filter="data")
+            try:
+                os.rename(scratch / "tree", target)
+            except OSError:
+                # Another process exported the same commit first; exports are immutable.
+                if not target.is_dir():
+                    raise
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        return target
+
+    def get_pack_path(self, pack: PackRef) -> Path:
+        if not pack.location:
+            raise PackFetchError("Git pack has no location", details={"pack": pack.id})
+        location = Path(pack.location)
+        commit = pack.commit or self.resolve_commit(location, pack.git_ref or "HEAD")
+        tree = self._export(location, commit)
+        return tree / pack.subdir if pack.subdir else tree
+
+    def load_manifest(self, pack_path: Path) -> dict[str, Any]:
+        raw: object = yaml.safe_load((pack_path / "pack.yaml").read_text()) or {}
+        if isinstance(raw, dict):
+            return cast(dict[str, Any], raw)
+        return {}
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+from pantsagon.adapters.cache_dir import default_cache_dir
+from pantsagon.adapters.pack_store.digest import IGNORED_NAMES, DigestEngine
+
+_DIGEST_RE = re.compile(r"^sha256:([0-9a-f]{64})$")
+
+
+def default_store_root() -> Path:
+    return default_cache_dir() / "packs"
+
+
+class ContentAddressedPackStore:
+    def __init__(self, root: Path | None = None, engine: DigestEngine | None = None) -> None:
+        self.root = root if root is not None else default_store_root()
+        self.engine = engine if engine is not None else DigestEngine(self.root / "stat-cache.json")
+
+    def _object_path(self, digest: str) -> Path | None:
+        match = _DIGEST_RE.match(digest)
+        if match is None:
+            return None
+        hexdigest = match.group(1)
+        return self.root / "sha256" / hexdigest[:2] / hexdigest
+
+    def digest(self, pack_path: Path) -> str:
+        return self.engine.digest(pack_path)
+
+    def get(self, digest: str) -> Path | None:
+        target = self._object_path(digest)
+        if target is None or not target.is_dir():
+            return None
+        return target
+
+    def materialize(self, digest: str, populate: Callable[[Path], object]) -> Path:
+        """Return the object for ``digest``, calling ``populate(dest)`` to create it if absent.
+
+        Whatever ``populate`` returns is ignored.
+        """
+        target = self._object_path(digest)
+        if target is None:
+            raise ValueError(f"Unsupported digest: {digest}")
+        if target.is_dir():
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+        scratch = Path(tempfile.mkdtemp(prefix=".incoming-", dir=target.parent))
+        try:
+            populate(scratch / "pack")
+            try:
+                os.rename(scratch / "pack", target)
+            except OSError:
+                # Another process stored the same digest first; objects are immutable.
+                if not target.is_dir():
+                    raise
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        return target
+
+    def put(self, pack_path: Path) -> str:
+        digest = self.digest(pack_path)
+        if self._object_path(digest) is None:
+            return digest
+        self.materialize(
+            digest,
+            lambda dest: shutil.copytree(
+                pack_path,
+                dest,
+                symlinks=True,
+                ignore=shutil.ignore_patterns(*IGNORED_NAMES),
+            ),
+        )
+        return digest
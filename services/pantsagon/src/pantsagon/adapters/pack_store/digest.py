@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Union, cast
+
+IGNORED_NAMES = frozenset({".git", "__pycache__", ".DS_Store"})
+CACHE_VERSION = 1
+# Files modified this recently may still change within the same mtime tick, so
+# their hashes are not cached (the "racily clean" case in git's index).
+_RACY_WINDOW_NS = 2_000_000_000
+_PARALLEL_THRESHOLD = 16
+
+_Payload = Union[list["_Entry"], str, bytes]
+_Entry = tuple[bytes, str, _Payload]
+_StatKey = tuple[int, int, int]
+
+
+def _file_hash(path: str) -> bytes:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.digest()
+
+
+def _combine(entries: list[_Entry], file_hashes: dict[str, bytes]) -> bytes:
+    hasher = hashlib.sha256(b"tree\0")
+    for kind, name, payload in entries:
+        if isinstance(payload, list):
+            child = _combine(payload, file_hashes)
+        elif isinstance(payload, str):
+            child = file_hashes[payload]
+        else:
+            child = payload
+        hasher.update(kind + b" " + name.encode() + b"\0" + child)
+    return hasher.digest()
+
+
+def _scan(path: str, files: dict[str, _StatKey]) -> list[_Entry]:
+    with os.scandir(path) as it:
+        entries = sorted(
+            (entry for entry in it if entry.name not in IGNORED_NAMES),
+            key=lambda entry: entry.name,
+        )
+    tree: list[_Entry] = []
+    for entry in entries:
+        if entry.is_symlink():
+            target = hashlib.sha256(os.readlink(entry.path).encode()).digest()
+            tree.append((b"link", entry.name, target))
+        elif entry.is_dir():
+            tree.append((b"tree", entry.name, _scan(entry.path, files)))
+        else:
+            stat = entry.stat()
+            kind = b"exec" if stat.st_mode & 0o111 else b"blob"
+            files[entry.path] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+            tree.append((kind, entry.name, entry.path))
+    return tree
+
+
+def tree_digest(path: Path) -> str:
+    """Merkle digest of a pack tree: names, kinds and file contents, nothing else."""
+    files: dict[str, _StatKey] = {}
+    tree = _scan(str(path), files)
+    return f"sha256:{_combine(tree, {p: _file_hash(p) for p in files}).hex()}"
+
+
+class DigestEngine:
+    """Computes ``tree_digest`` values, rehashing only files whose stat changed.
+
+    The optional JSON cache maps ``path -> (size, mtime_ns, inode, hash)``, so an
+    unchanged pack is fingerprinted with one ``scandir`` walk and ``stat`` calls.
+    """
+
+    def __init__(self, cache_path: Path | None = None, jobs: int | None = None) -> None:
+        self.cache_path = cache_path
+        self.jobs = jobs or min(8, os.cpu_count() or 1)
+        self.hashed = 0
+        self.reused = 0
+        self._cache: dict[str, tuple[int, int, int, str]] | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, tuple[int, int, int, str]]:
+        if self._cache is not None:
+            return self._cache
+        cache: dict[str, tuple[int, int, int, str]] = {}
+        if self.cache_path is not None:
+            try:
+                raw: object = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw = {}
+            data = cast(dict[str, Any], raw) if isinstance(raw, dict) else {}
+            entries: object = data.get("entries") if data.get("version") == CACHE_VERSION else None
+            if isinstance(entries, dict):
+                for path, item in cast(dict[str, object], entries).items():
+                    if isinstance(item, list) and len(cast(list[Any], item)) == 4:
+                        size, mtime_ns, inode, digest = cast(list[Any], item)
+                        cache[path] = (int(size), int(mtime_ns), int(inode), str(digest))
+        self._cache = cache
+        return cache
+
+    def _save(self, cache: dict[str, tuple[int, int, int, str]]) -> None:
+        if self.cache_path is None:
+            return
+        tmp = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+        payload = {"version": CACHE_VERSION, "entries": {k: list(v) for k, v in cache.items()}}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            # The cache only saves rehashing; a read-only or full cache dir is not an error.
+            pass
+
+    def _hash_all(self, paths: list[str]) -> list[bytes]:
+        if len(paths) < _PARALLEL_THRESHOLD or self.jobs <= 1:
+            return [_file_hash(path) for path in paths]
+        # hashlib releases the GIL on large buffers, so threads overlap reads and hashing.
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            return list(pool.map(_file_hash, paths, chunksize=8))
+
+    def digest(self, path: Path) -> str:
+        root = os.path.abspath(path)
+        files: dict[str, _StatKey] = {}
+        tree = _scan(root, files)
+        with self._lock:
+            cache = self._load()
+            file_hashes: dict[str, bytes] = {}
+            misses: list[str] = []
+            for file_path, key in files.items():
+                cached = cache.get(file_path)
+                if cached is not None and cached[:3] == key:
+                    file_hashes[file_path] = bytes.fromhex(cached[3])
+                else:
+                    misses.append(file_path)
+            self.reused += len(file_hashes)
+            self.hashed += len(misses)
+
+            racy_after = time.time_ns() - _RACY_WINDOW_NS
+            for file_path, file_hash in zip(misses, self._hash_all(misses)):
+                file_hashes[file_path] = file_hash
+                size, mtime_ns, inode = files[file_path]
+                if mtime_ns < racy_after:
+                    cache[file_path] = (size, mtime_ns, inode, file_hash.hex())
+                else:
+                    cache.pop(file_path, None)
+
+            prefix = root.rstrip(os.sep) + os.sep
+            stale = [p for p in cache if p.startswith(prefix) and p not in files]
+            for stale_path in stale:
+                del cache[stale_path]
+            if misses or stale:
+                self._save(cache)
+        return f"sha256:{_combine(tree, file_hashes).hex()}"
@@ -1,13 +1,28 @@
 from __future__ import annotations
 
+import contextlib
+import copy
+import functools
+import hashlib
 import json
+import os
+import sys
+import threading
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, Callable, Iterator, cast
 
 import jsonschema
 import yaml
 
-from pantsagon.domain.diagnostics import Diagnostic, Severity, ValueLocation
+from pantsagon.adapters.cache_dir import default_cache_dir
+from pantsagon.adapters.pack_store.digest import DigestEngine
+from pantsagon.domain.diagnostics import (
+    Diagnostic,
+    FileLocation,
+    Location,
+    Severity,
+    ValueLocation,
+)
 from pantsagon.domain.naming import (
     validate_feature_name,
     validate_pack_id as validate_pack_id_format,
@@ -16,15 +31,21 @@ from pantsagon.domain.naming import (
 from pantsagon.domain.result import Result
 from pantsagon.ports.policy_engine import PolicyEnginePort
 
+if sys.platform != "win32":
+    import fcntl
+
 Manifest = dict[str, Any]
+# Bump when validation rules change, so memoized results from older rules are ignored.
+MEMO_VERSION = 1
+_MEMO_LIMIT = 1024
 
 
-def _schema_path(root: Path | None = None) -> Path:
+def schema_path(root: Path | None = None) -> Path:
     base = root or Path.cwd()
     return base / "shared/contracts/schemas/pack.schema.v1.json"
 
 
-SCHEMA_PATH = _schema_path()
+SCHEMA_PATH = schema_path()
 
 
 def load_manifest(pack_dir: Path) -> Manifest:
@@ -40,23 +61,32 @@ def load_copier_vars(pack_dir: Path) -> dict[str, Any]:
     return {k: v for k, v in data.items() if not k.startswith("_")}
 
 
-def validate_manifest_schema(manifest: Manifest) -> list[Diagnostic]:
-    schema_raw = json.loads(SCHEMA_PATH.read_text())
+@functools.lru_cache(maxsize=8)
+def _compiled_schema(schema_path: Path) -> Any:
+    schema_raw = json.loads(schema_path.read_text())
     schema: dict[str, Any] = (
         cast(dict[str, Any], schema_raw) if isinstance(schema_raw, dict) else {}
     )
-    try:
-        jsonschema.validate(manifest, schema)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+def validate_manifest_schema(manifest: Manifest) -> list[Diagnostic]:
+    # Same semantics as jsonschema.validate, but the schema is parsed and
+    # checked once per path instead of on every manifest.
+    validator = _compiled_schema(SCHEMA_PATH)
+    error = jsonschema.exceptions.best_match(validator.iter_errors(manifest))
+    if error is None:
         return []
-    except jsonschema.ValidationError as e:
-        return [
-            Diagnostic(
-                code="PACK_SCHEMA_INVALID",
-                rule="pack.schema",
-                severity=Severity.ERROR,
-                message=str(e),
-            )
-        ]
+    return [
+        Diagnostic(
+            code="PACK_SCHEMA_INVALID",
+            rule="pack.schema",
+            severity=Severity.ERROR,
+            message=str(error),
+        )
+    ]
 
 
 def _copier_default(value: Any) -> Any | None:
@@ -135,11 +165,188 @@ def crosscheck_variables(manifest: Manifest, copier_vars: dict[str, Any]) -> lis
     return diagnostics
 
 
+def default_memo_path() -> Path:
+    return default_cache_dir() / "pack-validation.json"
+
+
+@functools.lru_cache(maxsize=8)
+def _schema_digest(schema_path: Path) -> str:
+    try:
+        return hashlib.sha256(schema_path.read_bytes()).hexdigest()
+    except OSError:
+        return "missing"
+
+
+def _dump_location(location: Location | None) -> dict[str, Any] | None:
+    if isinstance(location, ValueLocation):
+        return {"kind": "value", "field": location.field, "value": location.value}
+    if isinstance(location, FileLocation):
+        return {"kind": "file", "path": location.path, "line": location.line, "col": location.col}
+    return None
+
+
+def _load_location(raw: dict[str, Any] | None) -> Location | None:
+    if raw is None:
+        return None
+    if raw["kind"] == "value":
+        return ValueLocation(raw["field"], raw["value"])
+    return FileLocation(raw["path"], raw.get("line"), raw.get("col"))
+
+
+def _dump_result(result: Result[Manifest]) -> dict[str, Any]:
+    return {
+        "manifest": result.value,
+        "diagnostics": [
+            {
+                "code": d.code,
+                "rule": d.rule,
+                "severity": d.severity.value,
+                "message": d.message,
+                "location": _dump_location(d.location),
+                "hint": d.hint,
+                "details": d.details,
+                "is_execution": d.is_execution,
+                "upgradeable": d.upgradeable,
+            }
+            for d in result.diagnostics
+        ],
+    }
+
+
+def _load_result(raw: dict[str, Any]) -> Result[Manifest]:
+    return Result(
+        value=raw["manifest"],
+        diagnostics=[
+            Diagnostic(
+                code=d["code"],
+                rule=d["rule"],
+                severity=Severity(d["severity"]),
+                message=d["message"],
+                location=_load_location(d.get("location")),
+                hint=d.get("hint"),
+                details=d.get("details"),
+                is_execution=bool(d.get("is_execution")),
+                upgradeable=bool(d.get("upgradeable")),
+            )
+            for d in raw["diagnostics"]
+        ],
+    )
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive ``flock`` on ``path``, creating it if needed; a no-op on Windows."""
+    if sys.platform == "win32":
+        yield
+        return
+    with open(path, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
 class PackPolicyEngine(PolicyEnginePort):
+    """Validates packs, memoizing each result by the pack's content digest.
+
+    ``digest`` fingerprints a pack tree; pass a pack store's ``digest`` to share its
+    stat cache. Results are kept in memory, and in the JSON file ``memo_path`` when
+    one is given, so a pack used by many repos is checked once. The key also covers
+    the schema file and ``MEMO_VERSION``. With neither argument nothing is memoized
+    and no pack is digested.
+    """
+
+    def __init__(
+        self,
+        memo_path: Path | None = None,
+        digest: Callable[[Path], str] | None = None,
+    ) -> None:
+        self.memo_path = memo_path
+        if digest is None and memo_path is not None:
+            digest = DigestEngine().digest
+        self._digest = digest
+        self._memo: dict[str, Result[Manifest]] | None = None
+        self._stored: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
     def validate_repo(self, repo_path: Path) -> Result[None]:
         return Result()
 
+    def _load_memo(self) -> dict[str, Result[Manifest]]:
+        if self._memo is not None:
+            return self._memo
+        memo: dict[str, Result[Manifest]] = {}
+        for key, item in self._read_stored().items():
+            try:
+                memo[key] = _load_result(item)
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._stored[key] = item
+        self._memo = memo
+        return memo
+
+    def _read_stored(self) -> dict[str, Any]:
+        if self.memo_path is None:
+            return {}
+        try:
+            raw = json.loads(self.memo_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(raw, dict) or raw.get("version") != MEMO_VERSION:
+            return {}
+        entries = raw.get("entries")
+        return dict(entries) if isinstance(entries, dict) else {}
+
+    def _save_memo(self, key: str, result: Result[Manifest]) -> None:
+        if self.memo_path is None:
+            return
+        item = _dump_result(result)
+        try:
+            json.dumps(item)
+        except (TypeError, ValueError):
+            # YAML can yield values JSON cannot hold (dates); keep those in memory only.
+            return
+        lock_path = self.memo_path.with_name(f".{self.memo_path.name}.lock")
+        try:
+            self.memo_path.parent.mkdir(parents=True, exist_ok=True)
+            # Other processes may have saved entries since this one read the file.
+            with _file_lock(lock_path):
+                stored = {**self._stored, **self._read_stored()}
+                stored.pop(key, None)
+                stored[key] = item
+                while len(stored) > _MEMO_LIMIT:
+                    del stored[next(iter(stored))]
+                payload = {"version": MEMO_VERSION, "entries": stored}
+                tmp = self.memo_path.with_name(f".{self.memo_path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(payload), encoding="utf-8")
+                os.replace(tmp, self.memo_path)
+        except OSError:
+            return
+        self._stored = stored
+
     def validate_pack(self, pack_path: Path) -> Result[Manifest]:
+        if self._digest is None:
+            return self._validate_pack(pack_path)
+        try:
+            key = f"{MEMO_VERSION}:{_schema_digest(SCHEMA_PATH)}:{self._digest(pack_path)}"
+        except OSError:
+            return self._validate_pack(pack_path)
+        with self._lock:
+            cached = self._load_memo().get(key)
+            if cached is not None:
+                self.hits += 1
+        if cached is None:
+            cached = self._validate_pack(pack_path)
+            with self._lock:
+                self.misses += 1
+                self._load_memo()[key] = cached
+                self._save_memo(key, cached)
+        return Result(value=copy.deepcopy(cached.value), diagnostics=list(cached.diagnostics))
+
+    def _validate_pack(self, pack_path: Path) -> Result[Manifest]:
         manifest = load_manifest(pack_path)
         copier_vars = load_copier_vars(pack_path)
         diagnostics: list[Diagnostic] = []
@@ -1,9 +1,152 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from pathlib import Path
+from typing import Any, cast
+
+import yaml
+
 from pantsagon.adapters.errors import RendererExecutionError
+from pantsagon.adapters.io_metrics import IOMetrics
 from pantsagon.ports.renderer import RenderOutcome, RenderRequest
 
+_Scan = tuple[dict[str, tuple[int, int]], set[str]]
+# Copier's own exclusions, applied only when the template has no _subdirectory.
+_DEFAULT_EXCLUDE = (
+    "copier.yaml",
+    "copier.yml",
+    "~*",
+    "*.py[co]",
+    "__pycache__",
+    ".git",
+    ".DS_Store",
+    ".svn",
+)
+_GLOB_SPECIAL = re.compile(r"([\\\[\]*?!#])")
+
+
+def _scan(root: Path) -> _Scan:
+    files: dict[str, tuple[int, int]] = {}
+    dirs: set[str] = set()
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.add(entry.path)
+                    stack.append(entry.path)
+                else:
+                    stat = entry.stat(follow_symlinks=False)
+                    files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return files, dirs
+
+
+def _scan_only(root: Path, paths: list[Path]) -> _Scan:
+    """Like ``_scan``, limited to ``paths`` and their parent directories."""
+    files: dict[str, tuple[int, int]] = {}
+    dirs: set[str] = set()
+    for rel in paths:
+        path = root / rel
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            pass
+        else:
+            files[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        for parent in rel.parents:
+            if parent != Path() and (root / parent).is_dir():
+                dirs.add(str(root / parent))
+    return files, dirs
+
+
+def _record(metrics: IOMetrics, before: _Scan, after: _Scan) -> None:
+    old_files, old_dirs = before
+    new_files, new_dirs = after
+    created = overwritten = unchanged = written = 0
+    for path, (mtime_ns, size) in new_files.items():
+        previous = old_files.get(path)
+        if previous is None:
+            created += 1
+            written += size
+        elif previous != (mtime_ns, size):
+            overwritten += 1
+            written += size
+        else:
+            unchanged += 1
+    metrics.add(
+        files_created=created,
+        files_overwritten=overwritten,
+        bytes_written=written,
+        dirs_created=len(new_dirs - old_dirs),
+        files_unchanged=unchanged,
+    )
+
+
+def _only_patterns(paths: list[Path]) -> list[str]:
+    """gitignore-style excludes that limit a render to exactly ``paths``."""
+    escaped = (_GLOB_SPECIAL.sub(r"\\\1", path.as_posix()) for path in paths)
+    return ["*", *(f"!/{path}" for path in escaped)]
+
+
+def _copier_config(pack_path: Path) -> dict[str, Any]:
+    for name in ("copier.yml", "copier.yaml"):
+        config = pack_path / name
+        if config.is_file():
+            raw: object = yaml.safe_load(config.read_text()) or {}
+            if isinstance(raw, dict):
+                return cast(dict[str, Any], raw)
+    return {}
+
+
+def _jinja_env(pack_path: Path, config: dict[str, Any]) -> Any:
+    """A sandboxed environment configured the way Copier configures its own."""
+    from jinja2 import FileSystemLoader
+    from jinja2.sandbox import SandboxedEnvironment
+
+    envops = dict(config.get("_envops") or {}) if isinstance(config.get("_envops"), dict) else {}
+    envops.setdefault("keep_trailing_newline", True)
+    extensions = [
+        "jinja2_ansible_filters.AnsibleCoreFiltersExtension",
+        *(str(item) for item in config.get("_jinja_extensions") or []),
+    ]
+    return SandboxedEnvironment(
+        loader=FileSystemLoader(str(pack_path)), extensions=extensions, **envops
+    )
+
+
+def _render_context(env: Any, config: dict[str, Any], answers: dict[str, Any]) -> dict[str, Any]:
+    """Question defaults from copier.yml, overlaid with ``answers``."""
+    context: dict[str, Any] = {}
+    for key, spec in config.items():
+        if key.startswith("_") or key in answers:
+            continue
+        default = spec.get("default") if isinstance(spec, dict) else spec
+        if isinstance(default, str):
+            default = env.from_string(default).render(**context, **answers)
+        context[key] = default
+    context.update(answers)
+    return context
+
 
 class CopierRenderer:
+    def __init__(self, metrics: IOMetrics | None = None) -> None:
+        self.metrics = metrics
+
     def render(self, request: RenderRequest) -> RenderOutcome:
+        # A stage can be shared by several renders; with ``only`` just the requested
+        # outputs are measured.
+        def scan() -> _Scan:
+            if request.only is not None:
+                return _scan_only(request.staging_dir, request.only)
+            return _scan(request.staging_dir)
+
+        before = scan() if self.metrics is not None else None
         try:
             from copier import run_copy
 
@@ -14,9 +157,75 @@ class CopierRenderer:
                 defaults=True,
                 unsafe=request.allow_hooks,
                 overwrite=True,
+                exclude=_only_patterns(request.only) if request.only is not None else (),
             )
         except Exception as e:  # Copier raises various exceptions
             raise RendererExecutionError(
                 "Copier failed", details={"pack": request.pack.id}, cause=e
             )
+        if self.metrics is not None and before is not None:
+            _record(self.metrics, before, scan())
         return RenderOutcome(rendered_paths=[request.staging_dir], warnings=[])
+
+    def template_map(self, pack_path: Path, answers: dict[str, Any]) -> dict[Path, Path]:
+        """Map each output path Copier would write to its source, without rendering content.
+
+        Mirrors Copier's path handling: ``_subdirectory``, ``_templates_suffix``, templated
+        path segments, and skipping paths with a segment that renders empty.
+        """
+        config = _copier_config(pack_path)
+        subdirectory = Path(str(config.get("_subdirectory") or ""))
+        suffix = str(config.get("_templates_suffix", ".jinja"))
+        env = _jinja_env(pack_path, config)
+        context = _render_context(env, config, answers)
+        excludes = [str(item) for item in config.get("_exclude") or []]
+        if subdirectory == Path():
+            excludes.extend(_DEFAULT_EXCLUDE)
+        copy_root = pack_path / subdirectory
+        rendered_parts: dict[str, str] = {}
+        outputs: dict[Path, Path] = {}
+        for dirpath, dirnames, filenames in os.walk(copy_root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                source = Path(dirpath, name).relative_to(copy_root)
+                is_template = bool(suffix) and name.endswith(suffix)
+                if not is_template and suffix and (copy_root / f"{source}{suffix}").exists():
+                    continue
+                target = source.with_name(name[: -len(suffix)]) if is_template else source
+                parts: list[str] = []
+                for part in target.parts:
+                    if part not in rendered_parts:
+                        rendered_parts[part] = env.from_string(part).render(**context)
+                    parts.append(rendered_parts[part])
+                if not all(parts):
+                    continue
+                if any(fnmatch.fnmatch(part, pattern) for part in parts for pattern in excludes):
+                    continue
+                outputs[Path(*parts)] = subdirectory / source
+        return outputs
+
+    def render_files(
+        self, pack_path: Path, answers: dict[str, Any], templates: dict[Path, Path]
+    ) -> dict[Path, bytes]:
+        """Render ``templates`` (output path -> source, as from ``template_map``) in memory.
+
+        Uses Copier's Jinja settings and question defaults without running Copier, so
+        nothing is written and the working directory is left alone.
+        """
+        config = _copier_config(pack_path)
+        suffix = str(config.get("_templates_suffix", ".jinja"))
+        rendered: dict[Path, bytes] = {}
+        try:
+            env = _jinja_env(pack_path, config)
+            context = _render_context(env, config, answers)
+            for rel, template in templates.items():
+                if suffix and template.name.endswith(suffix):
+                    text = env.get_template(template.as_posix()).render(**context)
+                    rendered[rel] = text.encode()
+                else:
+                    rendered[rel] = (pack_path / template).read_bytes()
+        except Exception as e:
+            raise RendererExecutionError(
+                "Template rendering failed", details={"pack": str(pack_path)}, cause=e
+            )
+        return rendered
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+
+@dataclass
+class Span:
+    name: str
+    attrs: dict[str, Any]
+    start: float
+    thread_id: int
+    thread_name: str = ""
+    end: float | None = None
+    children: list[Span] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else self.start) - self.start
+
+
+class SpanRecorder:
+    """In-memory ``TracerPort`` that records nested spans per thread."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.origin = clock()
+        self.roots: list[Span] = []
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[None]:
+        stack = self._stack()
+        thread = threading.current_thread()
+        current = Span(
+            name=name,
+            attrs=attrs,
+            start=self._clock(),
+            thread_id=thread.ident or 0,
+            thread_name=thread.name,
+        )
+        if stack:
+            stack[-1].children.append(current)
+        else:
+            with self._lock:
+                self.roots.append(current)
+        stack.append(current)
+        try:
+            yield
+        finally:
+            current.end = self._clock()
+            stack.pop()
+
+    def _to_dict(self, span: Span) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "name": span.name,
+            "start_ms": round((span.start - self.origin) * 1000, 3),
+            "duration_ms": round(span.duration * 1000, 3),
+        }
+        if span.attrs:
+            data["attrs"] = {key: str(value) for key, value in span.attrs.items()}
+        if span.children:
+            data["children"] = [self._to_dict(child) for child in span.children]
+        return data
+
+    def timing_tree(self) -> list[dict[str, Any]]:
+        return [self._to_dict(span) for span in self.roots]
+
+    def artifact(self) -> dict[str, Any]:
+        return {"kind": "timing", "unit": "ms", "spans": self.timing_tree()}
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Return the spans in Chrome trace-event format (Perfetto, speedscope)."""
+        pid = os.getpid()
+        lanes: dict[int, int] = {}
+        events: list[dict[str, Any]] = []
+
+        def _walk(span: Span) -> None:
+            if span.thread_id not in lanes:
+                lanes[span.thread_id] = len(lanes) + 1
+                events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": pid,
+                        "tid": lanes[span.thread_id],
+                        "args": {"name": span.thread_name or f"thread-{len(lanes)}"},
+                    }
+                )
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.name.split("_")[0],
+                    "ph": "X",
+                    "ts": round((span.start - self.origin) * 1_000_000, 3),
+                    "dur": round(span.duration * 1_000_000, 3),
+                    "pid": pid,
+                    "tid": lanes[span.thread_id],
+                    "args": {key: str(value) for key, value in span.attrs.items()},
+                }
+            )
+            for child in span.children:
+                _walk(child)
+
+        for root in sorted(self.roots, key=lambda item: item.start):
+            _walk(root)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+
+    def format_tree(self) -> str:
+        lines: list[str] = []
+
+        def _walk(span: Span, depth: int) -> None:
+            attrs = " ".join(f"{key}={value}" for key, value in span.attrs.items())
+            label = f"{span.name} [{attrs}]" if attrs else span.name
+            lines.append(f"{'  ' * depth}{label:<{48 - 2 * depth}} {span.duration * 1000:10.1f} ms")
+            for child in span.children:
+                _walk(child, depth + 1)
+
+        for root in self.roots:
+            _walk(root, 0)
+        return "\n".join(lines)
@@ -1,16 +1,26 @@
 from pathlib import Path
+import os
 import shutil
 import tempfile
 
 from pantsagon.adapters.errors import WorkspaceCommitError
+from pantsagon.adapters.io_metrics import IOMetrics
+from pantsagon.application.tracing import span
+from pantsagon.ports.tracer import TracerPort
 
 
 class FilesystemWorkspace:
-    def __init__(self, root: Path) -> None:
+    def __init__(
+        self,
+        root: Path,
+        tracer: TracerPort | None = None,
+        metrics: IOMetrics | None = None,
+    ) -> None:
         self.root = root
+        self.tracer = tracer
+        self.metrics = metrics
 
     def _copy_file(self, src: Path, dest: Path) -> None:
-        dest.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(src, dest)
 
     def begin_transaction(self) -> Path:
@@ -22,40 +32,62 @@ class FilesystemWorkspace:
         overwritten_files: dict[Path, Path] = {}
         backup_root = Path(tempfile.mkdtemp(prefix="pantsagon-backup-", dir=self.root.parent))
         try:
-            for path in stage.rglob("*"):
-                rel = path.relative_to(stage)
-                dest = self.root / rel
-                if path.is_dir():
-                    if not dest.exists():
-                        dest.mkdir(parents=True, exist_ok=True)
-                        created_dirs.append(dest)
-                else:
-                    if not dest.parent.exists():
-                        dest.parent.mkdir(parents=True, exist_ok=True)
-                        created_dirs.append(dest.parent)
+            for dirpath, _dirnames, filenames in os.walk(stage):
+                src_dir = Path(dirpath)
+                rel_dir = src_dir.relative_to(stage)
+                dest_dir = self.root / rel_dir
+                # Each destination directory is ensured once, not once per file.
+                if not dest_dir.exists():
+                    dest_dir.mkdir(parents=True, exist_ok=True)
+                    created_dirs.append(dest_dir)
+                    if self.metrics is not None:
+                        self.metrics.add(dirs_created=1)
+                for filename in filenames:
+                    src = src_dir / filename
+                    rel = rel_dir / filename
+                    dest = dest_dir / filename
                     if dest.exists():
                         backup_path = backup_root / rel
                         backup_path.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(dest, backup_path)
+                        with span(self.tracer, "backup_file", path=rel.as_posix()):
+                            shutil.copy2(dest, backup_path)
                         overwritten_files[dest] = backup_path
+                        if self.metrics is not None:
+                            self.metrics.add(
+                                files_overwritten=1, bytes_backed_up=backup_path.stat().st_size
+                            )
                     else:
                         created_files.append(dest)
-                    self._copy_file(path, dest)
+                        if self.metrics is not None:
+                            self.metrics.add(files_created=1)
+                    with span(self.tracer, "write_file", path=rel.as_posix()):
+                        self._copy_file(src, dest)
+                    if self.metrics is not None:
+                        self.metrics.add(bytes_written=src.stat().st_size)
         except Exception as e:
-            for copied in reversed(created_files):
-                if copied.exists():
-                    copied.unlink()
-            for dest, backup in overwritten_files.items():
-                if backup.exists():
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(backup, dest)
-            for directory in reversed(created_dirs):
-                if directory.exists():
-                    try:
-                        directory.rmdir()
-                    except OSError:
-                        pass
+            with span(self.tracer, "rollback"):
+                self._rollback(created_files, overwritten_files, created_dirs)
             raise WorkspaceCommitError("Workspace commit failed", cause=e)
         finally:
             shutil.rmtree(stage, ignore_errors=True)
             shutil.rmtree(backup_root, ignore_errors=True)
+
+    def _rollback(
+        self,
+        created_files: list[Path],
+        overwritten_files: dict[Path, Path],
+        created_dirs: list[Path],
+    ) -> None:
+        for copied in reversed(created_files):
+            if copied.exists():
+                copied.unlink()
+        for dest, backup in overwritten_files.items():
+            if backup.exists():
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(backup, dest)
+        for directory in reversed(created_dirs):
+            if directory.exists():
+                try:
+                    directory.rmdir()
+                except OSError:
+                    pass
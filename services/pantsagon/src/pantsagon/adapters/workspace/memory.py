@@ -0,0 +1,78 @@
+from pathlib import Path
+import os
+import shutil
+import tempfile
+from typing import Any
+
+from pantsagon.adapters.errors import WorkspaceCommitError
+from pantsagon.adapters.io_metrics import IOMetrics
+
+
+class MemoryWorkspace:
+    """A workspace whose commits land in ``files`` (repo-relative path -> bytes), not on disk.
+
+    Renderers still need a directory, so stages are temporary directories; ``commit``
+    reads a stage into memory and removes it. Later commits overlay earlier ones.
+    ``flush`` writes the buffered files under ``root`` in one pass.
+    """
+
+    def __init__(self, root: Path, metrics: IOMetrics | None = None) -> None:
+        self.root = root
+        self.files: dict[str, bytes] = {}
+        self.metrics = metrics
+
+    def begin_transaction(self) -> Path:
+        return Path(tempfile.mkdtemp(prefix="pantsagon-stage-"))
+
+    def commit(self, stage: Path) -> None:
+        try:
+            for dirpath, _dirnames, filenames in os.walk(stage):
+                for filename in filenames:
+                    src = Path(dirpath, filename)
+                    self.files[src.relative_to(stage).as_posix()] = src.read_bytes()
+        except OSError as e:
+            raise WorkspaceCommitError("Workspace commit failed", cause=e)
+        finally:
+            shutil.rmtree(stage, ignore_errors=True)
+
+    def planned_operations(self) -> list[dict[str, Any]]:
+        """What ``flush`` would do to each buffered file: create, overwrite, or nothing."""
+        operations: list[dict[str, Any]] = []
+        for rel, data in sorted(self.files.items()):
+            try:
+                current = (self.root / rel).read_bytes()
+            except FileNotFoundError:
+                action = "create"
+            else:
+                action = "unchanged" if current == data else "overwrite"
+            operations.append({"path": rel, "action": action, "bytes": len(data)})
+        return operations
+
+    def flush(self) -> None:
+        """Write every buffered file under ``root`` and empty the buffer.
+
+        Files are grouped by directory so each destination directory is created once.
+        """
+        by_dir: dict[Path, list[tuple[str, bytes]]] = {}
+        for rel, data in self.files.items():
+            path = self.root / rel
+            by_dir.setdefault(path.parent, []).append((path.name, data))
+        try:
+            for directory, entries in sorted(by_dir.items()):
+                if not directory.is_dir():
+                    directory.mkdir(parents=True, exist_ok=True)
+                    if self.metrics is not None:
+                        self.metrics.add(dirs_created=1)
+                for name, data in entries:
+                    dest = directory / name
+                    if self.metrics is not None:
+                        existed = dest.exists()
+                        self.metrics.add(
+                            files_overwritten=int(existed),
+                            files_created=int(not existed),
+                            bytes_written=len(data),
+                        )
+                    dest.write_bytes(data)
+        except OSError as e:
+            raise WorkspaceCommitError("Workspace flush failed", cause=e)
+        self.files.clear()
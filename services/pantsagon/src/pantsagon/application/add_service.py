@@ -1,64 +1,68 @@
 from __future__ import annotations
 
 from pathlib import Path
-import os
 import shutil
-import tempfile
-from typing import Any
-
-from pantsagon.application.repo_lock import effective_strict, project_reserved_services, read_lock, write_lock
+from typing import Any, cast
+
+from pantsagon.application.pack_sources import resolve_pack_path
+from pantsagon.application.pack_digest import digest_mismatch, locked_snapshot_used
+from pantsagon.application.render_manifest import record_outputs
+from pantsagon.application.repo_lock import (
+    effective_strict,
+    lock_repository,
+    project_reserved_services,
+)
+from pantsagon.application.repo_transaction import (
+    DEFAULT_LOCK_TIMEOUT,
+    RepoSnapshot,
+    commit_locked,
+    state_digest,
+)
+from pantsagon.application.service_index import (
+    ServiceIndex,
+    fragment_path,
+    fragment_text,
+    read_repo_manifest,
+)
+from pantsagon.application.tracing import span
 from pantsagon.domain.diagnostics import Diagnostic, Severity
 from pantsagon.domain.naming import BUILTIN_RESERVED_SERVICES, validate_service_name
-from pantsagon.domain.pack import PackRef
+from pantsagon.domain.pack import PackRef, PackSource
+from pantsagon.domain.render_manifest import RenderManifest
 from pantsagon.domain.result import Result
 from pantsagon.domain.strictness import apply_strictness
+from pantsagon.ports.pack_catalog import PackCatalogPort
+from pantsagon.ports.pack_store import PackStorePort
 from pantsagon.ports.policy_engine import PolicyEnginePort
 from pantsagon.ports.renderer import RenderRequest, RendererPort
+from pantsagon.ports.tracer import TracerPort
 from pantsagon.ports.workspace import WorkspacePort
 
 
 OPENAPI_PACK_ID = "pantsagon.openapi"
+# Lock-level copies of the last added service's answers; a concurrent add keeps its own.
+_PER_ADD_ANSWERS = frozenset({"resolved.answers.service_name", "resolved.answers.service_pkg"})
 
 
-def _pack_roots() -> list[Path]:
-    roots: list[Path] = []
-    buildroot = os.environ.get("PANTS_BUILDROOT")
-    if buildroot:
-        roots.append(Path(buildroot))
-    cwd = Path.cwd().resolve()
-    roots.extend([cwd, *cwd.parents])
-    roots.extend(Path(__file__).resolve().parents)
-    seen: set[Path] = set()
-    ordered: list[Path] = []
-    for root in roots:
-        if root in seen:
-            continue
-        seen.add(root)
-        ordered.append(root)
-    return ordered
-
-
-def _bundled_pack_path(pack_id: str) -> Path | None:
-    pack_name = pack_id.split(".")[-1]
-    for root in _pack_roots():
-        candidate = root / "packs" / pack_name
-        if candidate.exists():
-            return candidate
-    return None
+def _get_list(value: Any) -> list[Any]:
+    return list(cast(list[Any], value)) if isinstance(value, list) else []
 
 
-def _get_list(value: Any) -> list[Any]:
-    return list(value) if isinstance(value, list) else []
+def _get_table(value: Any) -> dict[str, Any]:
+    return cast(dict[str, Any], value) if isinstance(value, dict) else {}
 
 
-def _build_answers(lock: dict[str, Any], repo_path: Path, name: str) -> dict[str, Any]:
-    resolved = lock.get("resolved") if isinstance(lock.get("resolved"), dict) else {}
-    existing = resolved.get("answers") if isinstance(resolved.get("answers"), dict) else {}
-    answers = dict(existing)
+def _build_answers(
+    lock: dict[str, Any], repo_path: Path, name: str, sharded: bool = False
+) -> dict[str, Any]:
+    resolved = _get_table(lock.get("resolved"))
+    answers = dict(_get_table(resolved.get("answers")))
     service_pkg = name.replace("-", "_")
     service_packages: dict[str, str] = {}
-    if isinstance(existing.get("service_packages"), dict):
-        service_packages = dict(existing.get("service_packages", {}))
+    # Sharded locks keep each service's package in its fragment, not in the answers.
+    if not sharded:
+        previous = _get_table(answers.get("service_packages"))
+        service_packages = {key: str(value) for key, value in previous.items()}
     service_packages[name] = service_pkg
     answers.setdefault("repo_name", repo_path.name)
     answers["service_name"] = name
@@ -67,58 +71,34 @@ def _build_answers(lock: dict[str, Any], repo_path: Path, name: str) -> dict[str
     return answers
 
 
-def _resolve_pack_path(entry: dict[str, Any], repo_path: Path) -> tuple[Path | None, list[Diagnostic]]:
-    diagnostics: list[Diagnostic] = []
-    pack_id = str(entry.get("id") or "")
-    source = str(entry.get("source") or "")
-    if source == "bundled":
-        pack_path = _bundled_pack_path(pack_id)
-        if pack_path is None or not pack_path.exists():
-            diagnostics.append(
-                Diagnostic(
-                    code="PACK_NOT_FOUND",
-                    rule="pack.catalog.fetch",
-                    severity=Severity.ERROR,
-                    message=f"Bundled pack not found: {pack_id}",
-                )
-            )
-            return None, diagnostics
-        return pack_path, diagnostics
-    if source == "local":
-        location = entry.get("location")
-        if not location:
-            diagnostics.append(
-                Diagnostic(
-                    code="PACK_LOCATION_MISSING",
-                    rule="pack.catalog.fetch",
-                    severity=Severity.ERROR,
-                    message=f"Local pack missing location: {pack_id}",
-                )
-            )
-            return None, diagnostics
-        location_path = Path(str(location))
-        pack_path = location_path if location_path.is_absolute() else repo_path / location_path
-        if not pack_path.exists():
-            diagnostics.append(
-                Diagnostic(
-                    code="PACK_NOT_FOUND",
-                    rule="pack.catalog.fetch",
-                    severity=Severity.ERROR,
-                    message=f"Local pack not found: {pack_id}",
-                )
-            )
-            return None, diagnostics
-        return pack_path, diagnostics
-
-    diagnostics.append(
-        Diagnostic(
-            code="LOCK_PACK_INVALID",
-            rule="lock.resolved.packs",
-            severity=Severity.ERROR,
-            message=f"Unsupported pack source: {source}",
-        )
+def _locked_pack_path(
+    entry: dict[str, Any],
+    pack_path: Path,
+    pack_store: PackStorePort,
+    tracer: TracerPort | None,
+) -> tuple[Path, bool, list[Diagnostic]]:
+    """Return the tree to render and whether it matches the digest recorded in the lock."""
+    recorded = entry.get("digest")
+    if not recorded:
+        return pack_path, False, []
+    pack_id = str(entry.get("id"))
+    with span(tracer, "digest_pack", pack=pack_id):
+        current = pack_store.digest(pack_path)
+    if current == recorded:
+        return pack_path, True, []
+    snapshot = pack_store.get(str(recorded))
+    if snapshot is not None:
+        return snapshot, True, [locked_snapshot_used(pack_id, str(recorded), current)]
+    return pack_path, False, [digest_mismatch(pack_id, str(recorded), current)]
+
+
+def _service_exists() -> Diagnostic:
+    return Diagnostic(
+        code="SERVICE_EXISTS",
+        rule="service.name",
+        severity=Severity.ERROR,
+        message="Service already exists",
     )
-    return None, diagnostics
 
 
 def _is_service_path(rel: Path, service_name: str) -> bool:
@@ -133,33 +113,24 @@ def _openapi_readme_path() -> Path:
     return Path("shared") / "contracts" / "openapi" / "README.md"
 
 
-def _copy_service_scoped(
-    temp_root: Path,
+def _service_scoped_outputs(
+    template_map: dict[Path, Path],
     stage_root: Path,
     repo_root: Path,
     service_name: str,
     allow_openapi: bool,
-) -> None:
+) -> list[Path]:
+    """Outputs of a pack that belong to the new service, chosen before rendering."""
     spec_rel = _openapi_spec_path(service_name)
     readme_rel = _openapi_readme_path()
-    for path in temp_root.rglob("*"):
-        if not path.is_file():
-            continue
-        rel = path.relative_to(temp_root)
-        dest = stage_root / rel
+    selected: list[Path] = []
+    for rel in sorted(template_map):
         if _is_service_path(rel, service_name):
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(path, dest)
-            continue
-        if allow_openapi and rel == spec_rel:
-            if not dest.exists() and not (repo_root / rel).exists():
-                dest.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(path, dest)
-            continue
-        if allow_openapi and rel == readme_rel:
-            if not dest.exists() and not (repo_root / rel).exists():
-                dest.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(path, dest)
+            selected.append(rel)
+        elif allow_openapi and rel in (spec_rel, readme_rel):
+            if not (stage_root / rel).exists() and not (repo_root / rel).exists():
+                selected.append(rel)
+    return selected
 
 
 def add_service(
@@ -171,9 +142,17 @@ def add_service(
     renderer_port: RendererPort | None = None,
     policy_engine: PolicyEnginePort | None = None,
     workspace: WorkspacePort | None = None,
+    tracer: TracerPort | None = None,
+    pack_store: PackStorePort | None = None,
+    git_catalog: PackCatalogPort | None = None,
+    archive_catalog: PackCatalogPort | None = None,
+    lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
 ) -> Result[None]:
     diagnostics: list[Diagnostic] = []
-    lock_result = read_lock(repo_path / ".pantsagon.toml")
+    base_digest = state_digest(repo_path)
+    lock_file = lock_repository(repo_path / ".pantsagon.toml")
+    with span(tracer, "read_lock"):
+        lock_result = lock_file.read()
     diagnostics.extend(lock_result.diagnostics)
     lock = lock_result.value
     strict_enabled = effective_strict(strict, lock)
@@ -188,27 +167,12 @@ def add_service(
 
     svc_dir = repo_path / "services" / name
     if svc_dir.exists():
-        diagnostics.append(
-            Diagnostic(
-                code="SERVICE_EXISTS",
-                rule="service.name",
-                severity=Severity.ERROR,
-                message="Service already exists",
-            )
-        )
+        diagnostics.append(_service_exists())
         return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
 
-    selection = lock.get("selection") if isinstance(lock.get("selection"), dict) else {}
-    existing_services = _get_list(selection.get("services"))
-    if name in existing_services:
-        diagnostics.append(
-            Diagnostic(
-                code="SERVICE_EXISTS",
-                rule="service.name",
-                severity=Severity.ERROR,
-                message="Service already exists",
-            )
-        )
+    services = ServiceIndex(repo_path, lock)
+    if name in services:
+        diagnostics.append(_service_exists())
         return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
 
     resolved = lock.get("resolved")
@@ -284,63 +248,135 @@ def add_service(
     workspace_impl = workspace
     allow_hooks = bool(lock.get("settings", {}).get("allow_hooks", False))
 
-    answers = _build_answers(lock, repo_path, name)
+    manifest_result = read_repo_manifest(repo_path, lock)
+    diagnostics.extend(manifest_result.diagnostics)
+    if manifest_result.value is None and manifest_result.diagnostics:
+        return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+    manifest = manifest_result.value or RenderManifest()
+    snapshot = RepoSnapshot.take(base_digest, lock, manifest)
+
+    answers = _build_answers(lock, repo_path, name, services.sharded)
     allow_openapi = OPENAPI_PACK_ID in pack_ids
+    roots = [f"services/{name}"]
+    if allow_openapi:
+        roots.append(_openapi_spec_path(name).as_posix())
 
     stage = workspace_impl.begin_transaction()
     try:
         for entry in pack_entries:
             pack_id = str(entry.get("id"))
             version = str(entry.get("version"))
-            pack_path, pack_diags = _resolve_pack_path(entry, repo_path)
+            pack_path, pack_diags = resolve_pack_path(
+                entry, repo_path, git_catalog, archive_catalog
+            )
             diagnostics.extend(pack_diags)
             if pack_path is None:
                 return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
 
-            validation = engine.validate_pack(pack_path)
-            diagnostics.extend(validation.diagnostics)
-            if any(d.severity == Severity.ERROR for d in validation.diagnostics):
-                return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
-
-            with tempfile.TemporaryDirectory() as tempdir:
-                request = RenderRequest(
-                    pack=PackRef(id=pack_id, version=version, source=str(entry.get("source"))),
-                    pack_path=pack_path,
-                    staging_dir=Path(tempdir),
-                    answers=answers,
-                    allow_hooks=allow_hooks,
+            verified = False
+            if pack_store is not None:
+                pack_path, verified, digest_diags = _locked_pack_path(
+                    entry, pack_path, pack_store, tracer
                 )
-                try:
+                diagnostics.extend(digest_diags)
+
+            if not verified:
+                with span(tracer, "validate_pack", pack=pack_id):
+                    validation = engine.validate_pack(pack_path)
+                diagnostics.extend(validation.diagnostics)
+                if any(d.severity == Severity.ERROR for d in validation.diagnostics):
+                    return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+                if pack_store is not None and not entry.get("digest"):
+                    with span(tracer, "store_pack", pack=pack_id):
+                        entry["digest"] = pack_store.put(pack_path)
+
+            template_map = renderer.template_map(pack_path, answers)
+            outputs = _service_scoped_outputs(
+                template_map, stage, repo_path, name, allow_openapi
+            )
+            if not outputs:
+                continue
+            # Render only the service's files, straight into the stage, so each
+            # generated byte is written once before commit.
+            request = RenderRequest(
+                pack=PackRef(
+                    id=pack_id,
+                    version=version,
+                    source=cast(PackSource, str(entry.get("source"))),
+                ),
+                pack_path=pack_path,
+                staging_dir=stage,
+                answers=answers,
+                allow_hooks=allow_hooks,
+                only=outputs,
+            )
+            try:
+                with span(tracer, "render_pack", pack=pack_id, files=len(outputs)):
                     renderer.render(request)
-                except Exception as exc:
-                    diagnostics.append(
-                        Diagnostic(
-                            code="PACK_RENDER_FAILED",
-                            rule="pack.render",
-                            severity=Severity.ERROR,
-                            message=str(exc),
-                            is_execution=True,
-                        )
+            except Exception as exc:
+                diagnostics.append(
+                    Diagnostic(
+                        code="PACK_RENDER_FAILED",
+                        rule="pack.render",
+                        severity=Severity.ERROR,
+                        message=str(exc),
+                        is_execution=True,
                     )
-                    return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+                )
+                return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
 
-                _copy_service_scoped(
-                    Path(tempdir),
-                    stage,
-                    repo_path,
-                    name,
-                    allow_openapi,
+            with span(tracer, "record_manifest", pack=pack_id):
+                record_outputs(
+                    manifest,
+                    output_root=stage,
+                    pack_id=pack_id,
+                    pack_path=pack_path,
+                    template_map=template_map,
+                    answers=answers,
+                    roots=roots,
+                    only=outputs,
                 )
 
-        selection = dict(selection)
-        selection_services = list(existing_services)
-        selection_services.append(name)
-        selection["services"] = selection_services
-        lock["selection"] = selection
-        resolved["answers"] = answers
-        lock["resolved"] = resolved
-        write_lock(stage / ".pantsagon.toml", lock)
-        workspace_impl.commit(stage)
+        if services.sharded:
+            fragment = stage / fragment_path(name)
+            fragment.parent.mkdir(parents=True, exist_ok=True)
+            fragment.write_text(
+                fragment_text(name, package=answers["service_pkg"], lang=lang), encoding="utf-8"
+            )
+        else:
+            selection = dict(_get_table(lock.get("selection")))
+            selection["services"] = [*_get_list(selection.get("services")), name]
+            lock["selection"] = selection
+            resolved["answers"] = answers
+            lock["resolved"] = resolved
+
+        def recheck(current_lock: dict[str, Any], current: RenderManifest) -> list[Diagnostic]:
+            if name in ServiceIndex(repo_path, current_lock) or svc_dir.exists():
+                return [_service_exists()]
+            readme = _openapi_readme_path()
+            if (stage / readme).is_file() and (repo_path / readme).exists():
+                # Another add created the shared README after this one planned it.
+                (stage / readme).unlink()
+                if readme.as_posix() not in snapshot.manifest.files:
+                    manifest.files.pop(readme.as_posix(), None)
+            return []
+
+        diagnostics.extend(
+            commit_locked(
+                repo_path,
+                workspace_impl,
+                stage,
+                snapshot=snapshot,
+                lock=lock,
+                manifest=manifest,
+                lock_file=lock_file,
+                timeout=lock_timeout,
+                tracer=tracer,
+                recheck=recheck,
+                prefer_ours=_PER_ADD_ANSWERS,
+                added_fragments=[name] if services.sharded else [],
+            )
+        )
         return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
     finally:
         if stage.exists():
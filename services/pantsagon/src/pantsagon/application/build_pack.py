@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from pantsagon.application.tracing import span
+from pantsagon.domain.diagnostics import Diagnostic, Severity
+from pantsagon.domain.result import Result
+from pantsagon.ports.pack_archive import PACK_ARCHIVE_SUFFIX, PackArchiverPort, PackArchiveInfo
+from pantsagon.ports.policy_engine import PolicyEnginePort
+from pantsagon.ports.tracer import TracerPort
+
+
+def build_pack(
+    pack_path: Path,
+    output: Path | None = None,
+    *,
+    policy_engine: PolicyEnginePort,
+    archiver: PackArchiverPort,
+    tracer: TracerPort | None = None,
+) -> Result[PackArchiveInfo]:
+    """Validate a pack directory and write it as a single-file pack archive."""
+    if not (pack_path / "pack.yaml").is_file():
+        return Result(
+            diagnostics=[
+                Diagnostic(
+                    code="PACK_NOT_FOUND",
+                    rule="pack.catalog.fetch",
+                    severity=Severity.ERROR,
+                    message=f"No pack.yaml in {pack_path}",
+                )
+            ]
+        )
+    with span(tracer, "validate_pack", pack=str(pack_path)):
+        validation = policy_engine.validate_pack(pack_path)
+    if any(d.severity == Severity.ERROR for d in validation.diagnostics):
+        return Result(diagnostics=validation.diagnostics)
+    manifest = validation.value or {}
+    if output is None:
+        output = Path(f"{manifest.get('id')}-{manifest.get('version')}{PACK_ARCHIVE_SUFFIX}")
+    try:
+        with span(tracer, "write_archive", path=str(output)):
+            info = archiver.build(pack_path, output)
+    except Exception as exc:
+        return Result(
+            diagnostics=[
+                *validation.diagnostics,
+                Diagnostic(
+                    code="PACK_ARCHIVE_FAILED",
+                    rule="pack.archive",
+                    severity=Severity.ERROR,
+                    message=f"Could not write pack archive: {exc}",
+                    is_execution=True,
+                ),
+            ]
+        )
+    return Result(
+        value=info,
+        diagnostics=validation.diagnostics,
+        artifacts=[
+            {
+                "kind": "pack_archive",
+                "path": str(info.path),
+                "pack": info.pack_id,
+                "version": info.version,
+                "digest": info.digest,
+                "files": info.files,
+                "size_bytes": info.size_bytes,
+            }
+        ],
+    )
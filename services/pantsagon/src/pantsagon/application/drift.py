@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable
+
+from pantsagon.application.pack_sources import resolve_pack_path
+from pantsagon.application.render_manifest import (
+    MANIFEST_PATH,
+    content_digest,
+    pack_file_digests,
+)
+from pantsagon.application.repo_lock import effective_strict, read_lock
+from pantsagon.application.rerender import lock_render_inputs, plan_rerender, stale_renders
+from pantsagon.application.service_index import read_repo_manifest
+from pantsagon.application.tracing import span
+from pantsagon.domain.diagnostics import Diagnostic, FileLocation, Severity
+from pantsagon.domain.render_manifest import RenderManifest
+from pantsagon.domain.result import Result
+from pantsagon.domain.strictness import apply_strictness
+from pantsagon.ports.pack_catalog import PackCatalogPort
+from pantsagon.ports.pack_store import PackStorePort
+from pantsagon.ports.renderer import RendererPort
+from pantsagon.ports.tracer import TracerPort
+
+_STATUS_CODES = {
+    "missing": ("DRIFT_FILE_MISSING", "is missing"),
+    "modified": ("DRIFT_FILE_MODIFIED", "was edited since it was generated"),
+    "outdated": ("DRIFT_FILE_OUTDATED", "differs from what the locked pack generates now"),
+}
+
+
+def _file_digest(path: Path) -> str | None:
+    try:
+        return content_digest(path.read_bytes())
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+
+
+def _hash_files(root: Path, paths: Iterable[str], jobs: int | None) -> dict[str, str | None]:
+    """Digest ``paths`` under ``root`` concurrently; missing files map to ``None``."""
+    rels = list(paths)
+    if jobs == 1 or len(rels) < 2:
+        return {rel: _file_digest(root / rel) for rel in rels}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return dict(zip(rels, pool.map(_file_digest, (root / rel for rel in rels))))
+
+
+def detect_drift(
+    repo_path: Path,
+    strict: bool | None = None,
+    *,
+    renderer_port: RendererPort | None = None,
+    pack_store: PackStorePort | None = None,
+    tracer: TracerPort | None = None,
+    git_catalog: PackCatalogPort | None = None,
+    archive_catalog: PackCatalogPort | None = None,
+    jobs: int | None = None,
+) -> Result[None]:
+    """Report generated files that differ from what the locked packs would render now.
+
+    Working-tree files are hashed in parallel and compared with the manifest. Only
+    templates whose source or answers changed since they were recorded are rendered,
+    in memory; nothing is written.
+    """
+    diagnostics: list[Diagnostic] = []
+    with span(tracer, "read_lock"):
+        lock_result = read_lock(repo_path / ".pantsagon.toml")
+    diagnostics.extend(lock_result.diagnostics)
+    lock = lock_result.value
+    strict_enabled = effective_strict(strict, lock)
+    if lock is None:
+        return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+
+    if renderer_port is None or pack_store is None:
+        diagnostics.append(
+            Diagnostic(
+                code="DRIFT_PORTS_MISSING",
+                rule="drift.ports",
+                severity=Severity.ERROR,
+                message="Drift detection requires renderer and pack store ports.",
+            )
+        )
+        return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+
+    with span(tracer, "read_manifest"):
+        manifest_result = read_repo_manifest(repo_path, lock)
+    diagnostics.extend(manifest_result.diagnostics)
+    if manifest_result.value is None:
+        if not manifest_result.diagnostics:
+            diagnostics.append(
+                Diagnostic(
+                    code="DRIFT_MANIFEST_MISSING",
+                    rule="drift.manifest",
+                    severity=Severity.ERROR,
+                    message=f"No render manifest at {MANIFEST_PATH.as_posix()}",
+                )
+            )
+        return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+    manifest: RenderManifest = manifest_result.value
+
+    with span(tracer, "hash_files", count=len(manifest.files)):
+        local = _hash_files(repo_path, manifest.files, jobs)
+
+    shared_answers, pack_entries = lock_render_inputs(lock)
+    # path -> (pack id, status)
+    drifted: dict[str, tuple[str, str]] = {}
+    templates_rendered = 0
+
+    for entry in pack_entries:
+        pack_id = str(entry["id"])
+        owned = [item for item in manifest.files.values() if item.pack == pack_id]
+        if not owned:
+            continue
+        pack_path, pack_diags = resolve_pack_path(entry, repo_path, git_catalog, archive_catalog)
+        diagnostics.extend(pack_diags)
+        if pack_path is None:
+            continue
+        with span(tracer, "digest_pack", pack=pack_id):
+            pack_changed = pack_store.digest(pack_path) != str(entry.get("digest") or "")
+
+        expected = {item.path: item.content_digest for item in owned}
+        work = stale_renders(manifest, pack_id, shared_answers, pack_changed)
+        pack_files: dict[Path, str] = {}
+        if work:
+            with span(tracer, "digest_files", pack=pack_id):
+                pack_files = pack_file_digests(pack_path)
+        for stale in work:
+            with span(tracer, "plan", pack=pack_id):
+                plan = plan_rerender(renderer_port, pack_id, pack_path, pack_files, manifest, stale)
+            queued = plan.queued
+            if not queued:
+                continue
+            with span(tracer, "render_pack", pack=pack_id, files=len(queued)):
+                try:
+                    rendered = renderer_port.render_files(pack_path, stale.values, queued)
+                except Exception as exc:
+                    diagnostics.append(
+                        Diagnostic(
+                            code="PACK_RENDER_FAILED",
+                            rule="pack.render",
+                            severity=Severity.ERROR,
+                            message=str(exc),
+                            is_execution=True,
+                        )
+                    )
+                    continue
+            templates_rendered += len(queued)
+            new_paths = [rel.as_posix() for rel in rendered if rel.as_posix() not in local]
+            local.update(_hash_files(repo_path, new_paths, jobs))
+            for rel, data in rendered.items():
+                key = rel.as_posix()
+                now = content_digest(data)
+                if now != expected.get(key) and local.get(key) != now:
+                    drifted[key] = (pack_id, "outdated")
+                expected[key] = now
+
+        for key, digest in expected.items():
+            if key in drifted:
+                continue
+            if local.get(key) is None:
+                drifted[key] = (pack_id, "missing")
+            elif local[key] != digest:
+                drifted[key] = (pack_id, "modified")
+
+    for key, (pack_id, status) in sorted(drifted.items()):
+        code, reason = _STATUS_CODES[status]
+        diagnostics.append(
+            Diagnostic(
+                code=code,
+                rule="drift.file",
+                severity=Severity.WARN,
+                message=f"{key} {reason}",
+                location=FileLocation(key),
+                details={"pack": pack_id},
+                upgradeable=True,
+            )
+        )
+    artifact: dict[str, Any] = {
+        "kind": "drift",
+        "files_checked": len(local),
+        "templates_rendered": templates_rendered,
+        "files": [
+            {"path": key, "pack": pack_id, "status": status}
+            for key, (pack_id, status) in sorted(drifted.items())
+        ],
+    }
+    return Result(diagnostics=apply_strictness(diagnostics, strict_enabled), artifacts=[artifact])
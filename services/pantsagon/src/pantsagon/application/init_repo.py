@@ -8,16 +8,21 @@ from typing import Any
 import yaml
 
 from pantsagon.application.pack_index import load_pack_index, resolve_pack_ids
+from pantsagon.application.render_manifest import MANIFEST_PATH, write_manifest
 from pantsagon.application.rendering import render_bundled_packs
-from pantsagon.application.repo_lock import write_lock
+from pantsagon.application.repo_lock import lock_repository, write_lock
+from pantsagon.application.tracing import span
 from pantsagon.domain.diagnostics import Diagnostic, Severity
 from pantsagon.domain.naming import BUILTIN_RESERVED_SERVICES, validate_service_name
 from pantsagon.domain.pack import PackRef
+from pantsagon.domain.render_manifest import RenderManifest
 from pantsagon.domain.result import Result
 from pantsagon.domain.strictness import apply_strictness
 from pantsagon.ports.pack_catalog import PackCatalogPort
+from pantsagon.ports.pack_store import PackStorePort
 from pantsagon.ports.policy_engine import PolicyEnginePort
 from pantsagon.ports.renderer import RendererPort
+from pantsagon.ports.tracer import TracerPort
 from pantsagon.ports.workspace import WorkspacePort
 
 
@@ -96,6 +101,13 @@ def _render_order(packs: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return rest + core if core else ordered
 
 
+def _lock_pack_entry(pack: dict[str, Any]) -> dict[str, Any]:
+    entry = {"id": pack["id"], "version": pack["version"], "source": pack["source"]}
+    if pack.get("digest"):
+        entry["digest"] = pack["digest"]
+    return entry
+
+
 def _write_augmented(path: Path, augmented: str) -> None:
     if augmented == "agents":
         (path / "AGENTS.md").write_text("# AGENTS\n")
@@ -124,6 +136,8 @@ def init_repo(
     allow_hooks: bool = False,
     augmented_coding: str | None = None,
     strict: bool | None = None,
+    tracer: TracerPort | None = None,
+    pack_store: PackStorePort | None = None,
 ) -> Result[None]:
     diagnostics: list[Diagnostic] = []
     strict_enabled = bool(strict)
@@ -132,10 +146,12 @@ def init_repo(
     if any(d.severity == Severity.ERROR for d in diagnostics):
         return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
 
-    repo_root = _repo_root()
-    index_path = repo_root / "packs" / "_index.json"
-    index = load_pack_index(index_path)
-    resolved_ids = resolve_pack_ids(index, languages=languages, features=features)
+    with span(tracer, "locate_root"):
+        repo_root = _repo_root()
+    with span(tracer, "load_index"):
+        index_path = repo_root / "packs" / "_index.json"
+        index = load_pack_index(index_path)
+        resolved_ids = resolve_pack_ids(index, languages=languages, features=features)
     diagnostics.extend(resolved_ids.diagnostics)
     if any(d.severity == Severity.ERROR for d in diagnostics):
         return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
@@ -157,26 +173,33 @@ def init_repo(
             )
             continue
 
-        manifest: dict[str, Any] = {}
+        pack_manifest: dict[str, Any] = {}
         if pack_catalog is not None:
-            manifest = pack_catalog.load_manifest(pack_path)
+            pack_manifest = pack_catalog.load_manifest(pack_path)
         else:
-            manifest = _load_manifest(pack_path)
+            pack_manifest = _load_manifest(pack_path)
 
         if policy_engine is not None:
-            manifest_result = policy_engine.validate_pack(pack_path)
-            diagnostics.extend(manifest_result.diagnostics)
-            if any(d.severity == Severity.ERROR for d in manifest_result.diagnostics):
+            with span(tracer, "validate_pack", pack=pack_id):
+                pack_result = policy_engine.validate_pack(pack_path)
+            diagnostics.extend(pack_result.diagnostics)
+            if any(d.severity == Severity.ERROR for d in pack_result.diagnostics):
                 continue
-            if isinstance(manifest_result.value, dict):
-                manifest = manifest_result.value
+            if isinstance(pack_result.value, dict):
+                pack_manifest = pack_result.value
+
+        digest: str | None = None
+        if pack_store is not None:
+            with span(tracer, "store_pack", pack=pack_id):
+                digest = pack_store.put(pack_path)
 
         resolved_packs.append(
             {
                 "id": pack_id,
-                "version": str(manifest.get("version", "0.0.0")),
+                "version": str(pack_manifest.get("version", "0.0.0")),
                 "source": "bundled",
-                "requires": _extract_requires(manifest),
+                "requires": _extract_requires(pack_manifest),
+                "digest": digest,
             }
         )
 
@@ -210,10 +233,7 @@ def init_repo(
             "augmented_coding": augmented_coding or "none",
         },
         "resolved": {
-            "packs": [
-                {"id": pack["id"], "version": pack["version"], "source": pack["source"]}
-                for pack in ordered_packs
-            ],
+            "packs": [_lock_pack_entry(pack) for pack in ordered_packs],
             "answers": answers,
         },
     }
@@ -233,8 +253,12 @@ def init_repo(
     augmented = augmented_coding or "none"
     if ports_requested and workspace is not None:
         stage = workspace.begin_transaction()
+        manifest = RenderManifest()
         try:
-            write_lock(stage / ".pantsagon.toml", lock)
+            with span(tracer, "write_lock"):
+                lock_repository(repo_path / ".pantsagon.toml").write(
+                    lock, stage / ".pantsagon.toml"
+                )
             render_diags = render_bundled_packs(
                 stage_dir=stage,
                 repo_path=repo_path,
@@ -244,6 +268,8 @@ def init_repo(
                 renderer=renderer_port,
                 policy_engine=policy_engine,
                 allow_hooks=allow_hooks,
+                tracer=tracer,
+                manifest=manifest,
             )
             diagnostics.extend(render_diags)
             if any(d.severity == Severity.ERROR for d in render_diags):
@@ -251,7 +277,9 @@ def init_repo(
 
             _write_augmented(stage, augmented)
             _ensure_minimal_pants_toml(stage / "pants.toml")
-            workspace.commit(stage)
+            write_manifest(stage / MANIFEST_PATH, manifest)
+            with span(tracer, "commit"):
+                workspace.commit(stage)
             return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
         finally:
             if stage.exists():
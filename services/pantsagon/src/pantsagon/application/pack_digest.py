@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from pantsagon.domain.diagnostics import Diagnostic, Severity
+
+
+def digest_mismatch(pack_id: str, recorded: str, current: str) -> Diagnostic:
+    return Diagnostic(
+        code="PACK_DIGEST_MISMATCH",
+        rule="pack.digest",
+        severity=Severity.WARN,
+        message=f"Pack {pack_id} changed since it was locked",
+        hint="Re-validate the pack and update the digest in .pantsagon.toml.",
+        details={"pack": pack_id, "recorded": recorded, "current": current},
+        upgradeable=True,
+    )
+
+
+def locked_snapshot_used(pack_id: str, recorded: str, current: str) -> Diagnostic:
+    return Diagnostic(
+        code="PACK_LOCKED_SNAPSHOT_USED",
+        rule="pack.digest",
+        severity=Severity.WARN,
+        message=(
+            f"Pack {pack_id} is now {current} but the lock records {recorded}; "
+            "rendered the locked snapshot"
+        ),
+        hint="Run `pantsagon upgrade` to render the current pack and update the lock.",
+        details={"pack": pack_id, "recorded": recorded, "current": current},
+        upgradeable=True,
+    )
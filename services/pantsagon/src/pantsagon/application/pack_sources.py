@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+from pantsagon.domain.diagnostics import Diagnostic, Severity
+from pantsagon.domain.pack import PackRef
+from pantsagon.ports.pack_catalog import PackCatalogPort
+
+
+def _pack_roots() -> list[Path]:
+    roots: list[Path] = []
+    buildroot = os.environ.get("PANTS_BUILDROOT")
+    if buildroot:
+        roots.append(Path(buildroot))
+    cwd = Path.cwd().resolve()
+    roots.extend([cwd, *cwd.parents])
+    roots.extend(Path(__file__).resolve().parents)
+    seen: set[Path] = set()
+    ordered: list[Path] = []
+    for root in roots:
+        if root in seen:
+            continue
+        seen.add(root)
+        ordered.append(root)
+    return ordered
+
+
+def bundled_pack_path(pack_id: str) -> Path | None:
+    pack_name = pack_id.split(".")[-1]
+    for root in _pack_roots():
+        candidate = root / "packs" / pack_name
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def resolve_git_pack(
+    entry: dict[str, Any],
+    repo_path: Path,
+    catalog: PackCatalogPort | None,
+) -> tuple[Path | None, list[Diagnostic]]:
+    pack_id = str(entry.get("id") or "")
+    location = entry.get("location")
+    if not location:
+        return None, [
+            Diagnostic(
+                code="PACK_LOCATION_MISSING",
+                rule="pack.catalog.fetch",
+                severity=Severity.ERROR,
+                message=f"Git pack missing location: {pack_id}",
+            )
+        ]
+    if catalog is None:
+        return None, [
+            Diagnostic(
+                code="LOCK_PACK_INVALID",
+                rule="lock.resolved.packs",
+                severity=Severity.ERROR,
+                message=f"Unsupported pack source: git ({pack_id})",
+            )
+        ]
+    location_path = Path(str(location))
+    if not location_path.is_absolute():
+        location_path = repo_path / location_path
+    ref = PackRef(
+        id=pack_id,
+        version=str(entry.get("version") or "0.0.0"),
+        source="git",
+        location=str(location_path),
+        git_ref=str(entry["ref"]) if entry.get("ref") else None,
+        subdir=str(entry["subdir"]) if entry.get("subdir") else None,
+    )
+    try:
+        return catalog.get_pack_path(ref), []
+    except Exception as exc:
+        return None, [
+            Diagnostic(
+                code="PACK_FETCH_FAILED",
+                rule="pack.catalog.fetch",
+                severity=Severity.ERROR,
+                message=f"Could not fetch git pack {pack_id}: {exc}",
+                is_execution=True,
+            )
+        ]
+
+
+def resolve_archive_pack(
+    entry: dict[str, Any],
+    archive_path: Path,
+    catalog: PackCatalogPort | None,
+) -> tuple[Path | None, list[Diagnostic]]:
+    pack_id = str(entry.get("id") or "")
+    if catalog is None:
+        return None, [
+            Diagnostic(
+                code="LOCK_PACK_INVALID",
+                rule="lock.resolved.packs",
+                severity=Severity.ERROR,
+                message=f"Pack archives are not supported here: {pack_id}",
+            )
+        ]
+    ref = PackRef(
+        id=pack_id,
+        version=str(entry.get("version") or "0.0.0"),
+        source="local",
+        location=str(archive_path),
+    )
+    try:
+        return catalog.get_pack_path(ref), []
+    except Exception as exc:
+        return None, [
+            Diagnostic(
+                code="PACK_FETCH_FAILED",
+                rule="pack.catalog.fetch",
+                severity=Severity.ERROR,
+                message=f"Could not open pack archive {pack_id}: {exc}",
+                is_execution=True,
+            )
+        ]
+
+
+def resolve_pack_path(
+    entry: dict[str, Any],
+    repo_path: Path,
+    git_catalog: PackCatalogPort | None = None,
+    archive_catalog: PackCatalogPort | None = None,
+) -> tuple[Path | None, list[Diagnostic]]:
+    diagnostics: list[Diagnostic] = []
+    pack_id = str(entry.get("id") or "")
+    source = str(entry.get("source") or "")
+    if source == "bundled":
+        pack_path = bundled_pack_path(pack_id)
+        if pack_path is None or not pack_path.exists():
+            diagnostics.append(
+                Diagnostic(
+                    code="PACK_NOT_FOUND",
+                    rule="pack.catalog.fetch",
+                    severity=Severity.ERROR,
+                    message=f"Bundled pack not found: {pack_id}",
+                )
+            )
+            return None, diagnostics
+        return pack_path, diagnostics
+    if source == "local":
+        location = entry.get("location")
+        if not location:
+            diagnostics.append(
+                Diagnostic(
+                    code="PACK_LOCATION_MISSING",
+                    rule="pack.catalog.fetch",
+                    severity=Severity.ERROR,
+                    message=f"Local pack missing location: {pack_id}",
+                )
+            )
+            return None, diagnostics
+        location_path = Path(str(location))
+        pack_path = location_path if location_path.is_absolute() else repo_path / location_path
+        if not pack_path.exists():
+            diagnostics.append(
+                Diagnostic(
+                    code="PACK_NOT_FOUND",
+                    rule="pack.catalog.fetch",
+                    severity=Severity.ERROR,
+                    message=f"Local pack not found: {pack_id}",
+                )
+            )
+            return None, diagnostics
+        if pack_path.is_file():
+            return resolve_archive_pack(entry, pack_path, archive_catalog)
+        return pack_path, diagnostics
+    if source == "git":
+        return resolve_git_pack(entry, repo_path, git_catalog)
+
+    diagnostics.append(
+        Diagnostic(
+            code="LOCK_PACK_INVALID",
+            rule="lock.resolved.packs",
+            severity=Severity.ERROR,
+            message=f"Unsupported pack source: {source}",
+        )
+    )
+    return None, diagnostics
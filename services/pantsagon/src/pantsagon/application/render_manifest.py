@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+from pantsagon.domain.diagnostics import Diagnostic, FileLocation, Severity
+from pantsagon.domain.render_manifest import AnswerSet, RenderedFile, RenderManifest
+from pantsagon.domain.result import Result
+
+MANIFEST_PATH = Path(".pantsagon") / "manifest.json"
+MANIFEST_VERSION = 1
+# Answers that add-service sets per service; lock-level values of these never apply
+# to files rendered for another service.
+SERVICE_ANSWER_KEYS = frozenset({"service_name", "service_pkg", "service_packages"})
+# Not read by the renderer: pantsagon's own pack metadata and filesystem noise.
+_NOT_RENDER_INPUTS = frozenset({"pack.yaml"})
+_IGNORED_NAMES = frozenset({".git", "__pycache__", ".DS_Store"})
+
+
+def content_digest(data: bytes) -> str:
+    return f"sha256:{hashlib.sha256(data).hexdigest()}"
+
+
+def answers_digest(answers: dict[str, Any]) -> str:
+    return content_digest(json.dumps(answers, sort_keys=True, default=str).encode())
+
+
+def under_roots(path: str, roots: list[str]) -> bool:
+    return any(not root or path == root or path.startswith(f"{root}/") for root in roots)
+
+
+def pack_file_digests(pack_path: Path) -> dict[Path, str]:
+    """Content digest of every file in the pack, keyed by pack-relative path."""
+    digests: dict[Path, str] = {}
+    for dirpath, dirnames, filenames in os.walk(pack_path):
+        dirnames[:] = [name for name in dirnames if name not in _IGNORED_NAMES]
+        for name in filenames:
+            if name in _IGNORED_NAMES:
+                continue
+            path = Path(dirpath, name)
+            digests[path.relative_to(pack_path)] = content_digest(path.read_bytes())
+    return digests
+
+
+def template_digests(files: dict[Path, str], template_map: dict[Path, Path]) -> dict[Path, str]:
+    """The recorded ``template_digest`` of each template in ``template_map``.
+
+    ``files`` comes from ``pack_file_digests``. A render also reads files that are not
+    rendered themselves, such as copier.yml defaults and ``_envops`` or partials pulled
+    in with ``{% include %}``, so their digests are folded into every template's.
+    """
+    sources = set(template_map.values())
+    inputs = hashlib.sha256()
+    for rel, digest in sorted(files.items()):
+        if rel not in sources and rel.as_posix() not in _NOT_RENDER_INPUTS:
+            inputs.update(f"{rel.as_posix()}\0{digest}\n".encode())
+    shared = inputs.hexdigest()
+    return {
+        template: content_digest(f"{shared}\0{files[template]}".encode()) for template in sources
+    }
+
+
+def read_manifest(path: Path) -> Result[RenderManifest]:
+    """Load a render manifest; a missing file yields an empty result with no diagnostics."""
+    if not path.exists():
+        return Result()
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        manifest = RenderManifest(
+            files={
+                rel: RenderedFile(path=rel, **entry) for rel, entry in raw["files"].items()
+            },
+            answers={
+                digest: AnswerSet(values=dict(item["values"]), roots=list(item["roots"]))
+                for digest, item in raw["answers"].items()
+            },
+        )
+    except Exception as e:
+        return Result(
+            diagnostics=[
+                Diagnostic(
+                    code="MANIFEST_PARSE_FAILED",
+                    rule="manifest.parse",
+                    severity=Severity.ERROR,
+                    message=str(e),
+                    location=FileLocation(str(path)),
+                )
+            ]
+        )
+    return Result(value=manifest)
+
+
+def write_manifest(path: Path, manifest: RenderManifest) -> None:
+    used = {item.answers_digest for item in manifest.files.values()}
+    data = {
+        "manifest_version": MANIFEST_VERSION,
+        "answers": {
+            digest: {"values": item.values, "roots": sorted(item.roots)}
+            for digest, item in sorted(manifest.answers.items())
+            if digest in used
+        },
+        "files": {
+            rel: {
+                "pack": item.pack,
+                "template": item.template,
+                "template_digest": item.template_digest,
+                "answers_digest": item.answers_digest,
+                "content_digest": item.content_digest,
+            }
+            for rel, item in sorted(manifest.files.items())
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def record_outputs(
+    manifest: RenderManifest,
+    *,
+    output_root: Path,
+    pack_id: str,
+    pack_path: Path,
+    template_map: dict[Path, Path],
+    answers: dict[str, Any],
+    roots: Iterable[str],
+    only: Iterable[Path] | None = None,
+) -> None:
+    """Record every planned output that exists under ``output_root``.
+
+    ``template_map`` maps rendered paths to template paths, both relative; ``only``
+    limits recording to the outputs that were actually kept.
+    """
+    digest = answers_digest(answers)
+    answer_set = manifest.answers.setdefault(digest, AnswerSet(values=dict(answers), roots=[]))
+    answer_set.roots = sorted(set(answer_set.roots) | set(roots))
+    kept = set(only) if only is not None else None
+    digests = template_digests(pack_file_digests(pack_path), template_map)
+    for rel, template in template_map.items():
+        if kept is not None and rel not in kept:
+            continue
+        output = output_root / rel
+        if not output.is_file():
+            continue
+        manifest.files[rel.as_posix()] = RenderedFile(
+            path=rel.as_posix(),
+            pack=pack_id,
+            template=template.as_posix(),
+            template_digest=digests[template],
+            answers_digest=digest,
+            content_digest=content_digest(output.read_bytes()),
+        )
+
+
+def missing_files(root: Path, paths: Iterable[str]) -> list[str]:
+    """Return the ``paths`` (posix, relative to ``root``) that are not regular files.
+
+    Paths are grouped by directory and each directory is listed once with
+    ``os.scandir``, so checking a manifest costs one read per directory rather than
+    one ``stat`` per file.
+    """
+    by_dir: dict[str, list[str]] = {}
+    for rel in paths:
+        parent, _, name = rel.rpartition("/")
+        by_dir.setdefault(parent, []).append(name)
+    missing: list[str] = []
+    for parent, names in by_dir.items():
+        try:
+            with os.scandir(root / parent) as entries:
+                present = {entry.name for entry in entries if entry.is_file()}
+        except (FileNotFoundError, NotADirectoryError):
+            present = set()
+        missing.extend(
+            f"{parent}/{name}" if parent else name for name in names if name not in present
+        )
+    return sorted(missing)
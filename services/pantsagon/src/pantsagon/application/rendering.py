@@ -3,11 +3,15 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Iterable
 
+from pantsagon.application.render_manifest import record_outputs
+from pantsagon.application.tracing import span
 from pantsagon.domain.diagnostics import Diagnostic, Severity
 from pantsagon.domain.pack import PackRef
+from pantsagon.domain.render_manifest import RenderManifest
 from pantsagon.ports.pack_catalog import PackCatalogPort
 from pantsagon.ports.policy_engine import PolicyEnginePort
 from pantsagon.ports.renderer import RenderRequest, RendererPort
+from pantsagon.ports.tracer import TracerPort
 
 
 def render_bundled_packs(
@@ -20,13 +24,16 @@ def render_bundled_packs(
     renderer: RendererPort,
     policy_engine: PolicyEnginePort,
     allow_hooks: bool = False,
+    tracer: TracerPort | None = None,
+    manifest: RenderManifest | None = None,
 ) -> list[Diagnostic]:
     diagnostics: list[Diagnostic] = []
 
     for pack_id in pack_ids:
         ref = PackRef(id=pack_id, version="0.0.0", source="bundled")
         pack_path = catalog.get_pack_path(ref)
-        validation = policy_engine.validate_pack(pack_path)
+        with span(tracer, "validate_pack", pack=pack_id):
+            validation = policy_engine.validate_pack(pack_path)
         diagnostics.extend(validation.diagnostics)
         if any(d.severity == Severity.ERROR for d in validation.diagnostics):
             return diagnostics
@@ -34,13 +41,25 @@ def render_bundled_packs(
         if isinstance(validation.value, dict):
             version = str(validation.value.get("version", "0.0.0"))
         ref = PackRef(id=pack_id, version=version, source="bundled")
-        renderer.render(
-            RenderRequest(
-                pack=ref,
-                pack_path=pack_path,
-                staging_dir=stage_dir,
-                answers=answers,
-                allow_hooks=allow_hooks,
+        with span(tracer, "render_pack", pack=pack_id):
+            renderer.render(
+                RenderRequest(
+                    pack=ref,
+                    pack_path=pack_path,
+                    staging_dir=stage_dir,
+                    answers=answers,
+                    allow_hooks=allow_hooks,
+                )
             )
-        )
+        if manifest is not None:
+            with span(tracer, "record_manifest", pack=pack_id):
+                record_outputs(
+                    manifest,
+                    output_root=stage_dir,
+                    pack_id=pack_id,
+                    pack_path=pack_path,
+                    template_map=renderer.template_map(pack_path, answers),
+                    answers=answers,
+                    roots=[""],
+                )
     return diagnostics
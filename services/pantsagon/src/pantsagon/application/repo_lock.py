@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import copy
+import os
+import threading
+import time
 import tomllib
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -10,33 +15,121 @@ from pantsagon.domain.result import Result
 LockDict = dict[str, Any]
 
 
-def read_lock(path: Path) -> Result[LockDict]:
-    if not path.exists():
-        return Result(
-            diagnostics=[
-                Diagnostic(
-                    code="LOCK_MISSING",
-                    rule="lock.exists",
-                    severity=Severity.ERROR,
-                    message=".pantsagon.toml not found",
-                )
-            ]
-        )
-    try:
-        data = tomllib.loads(path.read_text(encoding="utf-8"))
-    except Exception as e:
-        return Result(
-            diagnostics=[
-                Diagnostic(
-                    code="LOCK_PARSE_FAILED",
-                    rule="lock.parse",
-                    severity=Severity.ERROR,
-                    message=str(e),
-                    location=FileLocation(str(path)),
+# Files modified this recently may be rewritten again within the filesystem's
+# timestamp granularity, so a matching stat alone is not trusted for them.
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def _lock_missing() -> Result[LockDict]:
+    return Result(
+        diagnostics=[
+            Diagnostic(
+                code="LOCK_MISSING",
+                rule="lock.exists",
+                severity=Severity.ERROR,
+                message=".pantsagon.toml not found",
+            )
+        ]
+    )
+
+
+class LockRepository:
+    """One repo's lock file, with the parse cached by file stat.
+
+    ``read`` hands out copies, so callers may mutate what they get back. ``write``
+    replaces the file atomically and primes the cache with what it wrote.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._mutex = threading.Lock()
+        self._stamp: tuple[int, int, int] | None = None
+        self._racy = False
+        self._text: str | None = None
+        self._data: LockDict | None = None
+
+    def _remember(self, text: str, data: LockDict, stat: os.stat_result) -> None:
+        self._stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        self._racy = time.time_ns() - stat.st_mtime_ns < _RACY_WINDOW_NS
+        self._text = text
+        self._data = data
+
+    def _forget(self) -> None:
+        self._stamp = self._text = self._data = None
+
+    def _current(self) -> bool:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size, stat.st_ino) != self._stamp:
+            return False
+        if self._racy:
+            if self.path.read_text(encoding="utf-8") != self._text:
+                return False
+            self._racy = time.time_ns() - stat.st_mtime_ns < _RACY_WINDOW_NS
+        return True
+
+    def read(self) -> Result[LockDict]:
+        with self._mutex:
+            if self._data is not None and self._current():
+                return Result(value=copy.deepcopy(self._data))
+            try:
+                stat = self.path.stat()
+                text = self.path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                self._forget()
+                return _lock_missing()
+            try:
+                data = tomllib.loads(text)
+            except Exception as e:
+                self._forget()
+                return Result(
+                    diagnostics=[
+                        Diagnostic(
+                            code="LOCK_PARSE_FAILED",
+                            rule="lock.parse",
+                            severity=Severity.ERROR,
+                            message=str(e),
+                            location=FileLocation(str(self.path)),
+                        )
+                    ]
                 )
-            ]
-        )
-    return Result(value=data)
+            self._remember(text, data, stat)
+            return Result(value=copy.deepcopy(data))
+
+    def write(self, lock: LockDict, dest: Path | None = None) -> None:
+        """Write ``lock`` to ``dest`` (default: the lock file itself)."""
+        target = dest if dest is not None else self.path
+        text = _dumps(lock)
+        _write_atomic(target, text)
+        if target == self.path:
+            with self._mutex:
+                self._remember(text, copy.deepcopy(lock), target.stat())
+
+
+# Most recently used lock files; one process validating many repos keeps only these.
+_REPOSITORY_LIMIT = 64
+_repositories: OrderedDict[Path, LockRepository] = OrderedDict()
+_repositories_mutex = threading.Lock()
+
+
+def lock_repository(path: Path) -> LockRepository:
+    """The shared repository for ``path``, so repeated reads in one process hit the cache."""
+    key = path.absolute()
+    with _repositories_mutex:
+        repository = _repositories.get(key)
+        if repository is None:
+            repository = _repositories[key] = LockRepository(key)
+            while len(_repositories) > _REPOSITORY_LIMIT:
+                _repositories.popitem(last=False)
+        else:
+            _repositories.move_to_end(key)
+        return repository
+
+
+def read_lock(path: Path) -> Result[LockDict]:
+    return lock_repository(path).read()
 
 
 def _toml_escape(value: str) -> str:
@@ -93,17 +186,30 @@ def _fallback_dumps(lock: LockDict) -> str:
     return "\n".join(lines).rstrip() + "\n"
 
 
-def write_lock(path: Path, lock: LockDict) -> None:
+def _dumps(lock: LockDict) -> str:
     try:
         import tomli_w
 
-        content = tomli_w.dumps(lock)
+        return tomli_w.dumps(lock)
     except ModuleNotFoundError:
-        content = _fallback_dumps(lock)
-    path.write_text(content, encoding="utf-8")
+        return _fallback_dumps(lock)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Replace ``path`` with ``text`` so readers see the old file or the new one, never part."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def write_lock(path: Path, lock: LockDict) -> None:
+    lock_repository(path).write(lock)
 
 
-def effective_strict(cli_strict: bool | None, lock: dict | None) -> bool:
+def effective_strict(cli_strict: bool | None, lock: LockDict | None) -> bool:
     if cli_strict is not None:
         return cli_strict
     if lock is None:
@@ -111,7 +217,7 @@ def effective_strict(cli_strict: bool | None, lock: dict | None) -> bool:
     return bool(lock.get("settings", {}).get("strict", False))
 
 
-def project_reserved_services(lock: dict | None) -> set[str]:
+def project_reserved_services(lock: LockDict | None) -> set[str]:
     if not lock:
         return set()
     naming = lock.get("settings", {}).get("naming", {})
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import contextlib
+import copy
+import hashlib
+import os
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+if sys.platform != "win32":
+    import fcntl
+
+from pantsagon.application.render_manifest import MANIFEST_PATH, write_manifest
+from pantsagon.application.repo_lock import LockDict, LockRepository
+from pantsagon.application.service_index import (
+    SERVICES_DIR,
+    ServiceIndex,
+    manifest_parts,
+    read_repo_manifest,
+)
+from pantsagon.application.tracing import span
+from pantsagon.domain.diagnostics import Diagnostic, Severity
+from pantsagon.domain.merge import merge_data
+from pantsagon.domain.render_manifest import AnswerSet, RenderManifest
+from pantsagon.ports.tracer import TracerPort
+from pantsagon.ports.workspace import WorkspacePort
+
+DEFAULT_LOCK_TIMEOUT = 30.0
+LOCK_PATH = Path(".pantsagon.toml")
+_MAX_POLL = 0.25
+
+
+class RepoBusy(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def repo_mutex(repo_path: Path, timeout: float = DEFAULT_LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold an exclusive advisory ``flock`` on the repo directory.
+
+    The directory itself is locked, so no lock file is left in the checkout. Waits
+    up to ``timeout`` seconds, polling with backoff, then raises ``RepoBusy``. On
+    Windows, which has no ``fcntl``, this does nothing.
+    """
+    if sys.platform == "win32":
+        yield
+        return
+    fd = os.open(repo_path, os.O_RDONLY)
+    try:
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RepoBusy(str(repo_path)) from None
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, _MAX_POLL)
+        yield
+    finally:
+        os.close(fd)
+
+
+def state_digest(repo_path: Path) -> str:
+    """Digest of the lock file and render manifest; a missing file counts as empty.
+
+    Service fragments and manifest shards count by name, size and mtime, so adding
+    one is seen without reading every shard.
+    """
+    digest = hashlib.sha256()
+    for rel in (LOCK_PATH, MANIFEST_PATH):
+        try:
+            data = (repo_path / rel).read_bytes()
+        except FileNotFoundError:
+            data = b""
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    try:
+        with os.scandir(repo_path / SERVICES_DIR) as entries:
+            stamps = sorted(
+                f"{entry.name}\0{stat.st_size}\0{stat.st_mtime_ns}"
+                for entry in entries
+                for stat in [entry.stat()]
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        stamps = []
+    for stamp in stamps:
+        digest.update(stamp.encode() + b"\n")
+    return f"sha256:{digest.hexdigest()}"
+
+
+def _copy_manifest(manifest: RenderManifest) -> RenderManifest:
+    return RenderManifest(
+        files=dict(manifest.files),
+        answers={
+            key: AnswerSet(values=copy.deepcopy(item.values), roots=list(item.roots))
+            for key, item in manifest.answers.items()
+        },
+    )
+
+
+@dataclass
+class RepoSnapshot:
+    """The lock and manifest a change was computed from.
+
+    ``digest`` is taken before the files are read, so a write that lands in between
+    is seen as a change at commit time rather than missed.
+    """
+
+    digest: str
+    lock: LockDict
+    manifest: RenderManifest
+
+    @classmethod
+    def take(cls, digest: str, lock: LockDict, manifest: RenderManifest) -> RepoSnapshot:
+        return cls(digest=digest, lock=copy.deepcopy(lock), manifest=_copy_manifest(manifest))
+
+
+def _timeout(repo_path: Path, timeout: float) -> Diagnostic:
+    return Diagnostic(
+        code="REPO_LOCK_TIMEOUT",
+        rule="repo.lock",
+        severity=Severity.ERROR,
+        message=f"Another pantsagon command held {repo_path} for more than {timeout:g}s",
+        hint="Retry when it finishes, or raise --lock-timeout.",
+        details={"timeout": timeout},
+        is_execution=True,
+    )
+
+
+def _conflict(conflicts: list[str]) -> Diagnostic:
+    return Diagnostic(
+        code="REPO_LOCK_CONFLICT",
+        rule="repo.lock",
+        severity=Severity.ERROR,
+        message="The repo lock or manifest changed concurrently in a conflicting way",
+        hint="Run the command again.",
+        details={"conflicts": conflicts},
+        is_execution=True,
+    )
+
+
+def commit_locked(
+    repo_path: Path,
+    workspace: WorkspacePort,
+    stage: Path,
+    *,
+    snapshot: RepoSnapshot,
+    lock: LockDict,
+    manifest: RenderManifest,
+    lock_file: LockRepository,
+    timeout: float = DEFAULT_LOCK_TIMEOUT,
+    tracer: TracerPort | None = None,
+    recheck: Callable[[LockDict, RenderManifest], list[Diagnostic]] | None = None,
+    prefer_ours: frozenset[str] = frozenset(),
+    added_fragments: Iterable[str] = (),
+) -> list[Diagnostic]:
+    """Write ``lock`` and ``manifest`` into ``stage`` and commit it under the repo mutex.
+
+    If the lock or manifest changed since ``snapshot``, this change is merged onto
+    the current files (see ``merge_data``) instead of overwriting them; the rendered
+    files in the stage are kept, so nothing is rendered again. ``recheck`` can reject
+    or adjust the change against the current lock and manifest first. Returns the
+    diagnostics that stopped the commit, if any.
+
+    Only the lock and the manifest parts whose content changed are written. In the
+    sharded layout the manifest is split per fragment service (see
+    ``manifest_parts``); ``added_fragments`` names services whose fragment is in
+    ``stage``, not yet in the repo.
+    """
+    on_disk_lock, on_disk = snapshot.lock, snapshot.manifest
+    try:
+        with span(tracer, "wait_repo_lock"), repo_mutex(repo_path, timeout):
+            if state_digest(repo_path) != snapshot.digest:
+                with span(tracer, "merge_concurrent"):
+                    lock_result = lock_file.read()
+                    if lock_result.value is None:
+                        return lock_result.diagnostics
+                    manifest_result = read_repo_manifest(repo_path, lock_result.value)
+                    if manifest_result.diagnostics:
+                        return manifest_result.diagnostics
+                    current = manifest_result.value or RenderManifest()
+                    on_disk_lock, on_disk = lock_result.value, current
+                    if recheck is not None:
+                        diagnostics = recheck(lock_result.value, current)
+                        if any(d.severity == Severity.ERROR for d in diagnostics):
+                            return diagnostics
+                    merged_lock = merge_data(
+                        snapshot.lock, lock, lock_result.value, prefer_ours=prefer_ours
+                    )
+                    merged_files = merge_data(
+                        snapshot.manifest.files, manifest.files, current.files
+                    )
+                    merged_answers = merge_data(
+                        snapshot.manifest.answers, manifest.answers, current.answers
+                    )
+                    conflicts = [
+                        *merged_lock.conflicts,
+                        *(f"manifest.files.{path}" for path in merged_files.conflicts),
+                        *(f"manifest.answers.{path}" for path in merged_answers.conflicts),
+                    ]
+                    if conflicts:
+                        return [_conflict(conflicts)]
+                    lock = merged_lock.value
+                    manifest = RenderManifest(
+                        files=merged_files.value, answers=merged_answers.value
+                    )
+            services = ServiceIndex(repo_path, lock)
+            shards = [*services.fragments(), *added_fragments] if services.sharded else []
+            with span(tracer, "write_lock"):
+                if lock != on_disk_lock:
+                    lock_file.write(lock, stage / LOCK_PATH)
+                before = manifest_parts(on_disk, shards)
+                for rel, part in manifest_parts(manifest, shards).items():
+                    if part != before.get(rel):
+                        write_manifest(stage / rel, part)
+            with span(tracer, "commit"):
+                workspace.commit(stage)
+    except RepoBusy:
+        return [_timeout(repo_path, timeout)]
+    return []
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+from pantsagon.application.render_manifest import (
+    SERVICE_ANSWER_KEYS,
+    answers_digest,
+    template_digests,
+    under_roots,
+)
+from pantsagon.domain.render_manifest import AnswerSet, RenderedFile, RenderManifest
+from pantsagon.ports.renderer import RendererPort
+
+
+def _table(value: Any) -> dict[str, Any]:
+    return cast(dict[str, Any], value) if isinstance(value, dict) else {}
+
+
+def lock_render_inputs(lock: dict[str, Any]) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """The lock's answers shared by every render, and its usable pack entries."""
+    resolved = _table(lock.get("resolved"))
+    lock_answers = _table(resolved.get("answers"))
+    shared = {k: v for k, v in lock_answers.items() if k not in SERVICE_ANSWER_KEYS}
+    packs = resolved.get("packs")
+    entries = [
+        _table(entry)
+        for entry in (cast(list[Any], packs) if isinstance(packs, list) else [])
+        if isinstance(entry, dict)
+    ]
+    return shared, [entry for entry in entries if entry.get("id") and entry.get("source")]
+
+
+@dataclass
+class StaleRender:
+    """An answer set whose outputs may differ from what was recorded."""
+
+    old_digest: str
+    answer_set: AnswerSet
+    values: dict[str, Any]
+    new_digest: str
+
+    @property
+    def answers_changed(self) -> bool:
+        return self.new_digest != self.old_digest
+
+
+def stale_renders(
+    manifest: RenderManifest, pack_id: str, shared_answers: dict[str, Any], pack_changed: bool
+) -> list[StaleRender]:
+    """The answer sets ``pack_id`` rendered that a changed pack or answers could affect."""
+    stale: list[StaleRender] = []
+    used = {item.answers_digest for item in manifest.files.values() if item.pack == pack_id}
+    for old_digest in sorted(used):
+        answer_set = manifest.answers.get(old_digest)
+        if answer_set is None:
+            continue
+        values = {**answer_set.values, **shared_answers}
+        new_digest = answers_digest(values)
+        if pack_changed or new_digest != old_digest:
+            stale.append(StaleRender(old_digest, answer_set, values, new_digest))
+    return stale
+
+
+@dataclass
+class RerenderPlan:
+    """What one stale answer set renders now, and which outputs must be rendered again."""
+
+    outputs: dict[Path, Path]
+    owned: dict[str, RenderedFile]
+    queued: dict[Path, Path]
+    template_digests: dict[Path, str]
+    skipped: int
+
+
+def plan_rerender(
+    renderer: RendererPort,
+    pack_id: str,
+    pack_path: Path,
+    pack_files: dict[Path, str],
+    manifest: RenderManifest,
+    stale: StaleRender,
+) -> RerenderPlan:
+    """Queue the outputs of ``stale`` whose template, other pack inputs or answers changed.
+
+    ``pack_files`` comes from ``pack_file_digests``. Outputs owned by another answer set
+    are left alone, and new outputs are only claimed under the answer set's roots.
+    """
+    owned = {item.path: item for item in manifest.files_for(pack_id, stale.old_digest)}
+    outputs = renderer.template_map(pack_path, stale.values)
+    digests = template_digests(pack_files, outputs)
+    queued: dict[Path, Path] = {}
+    skipped = 0
+    for rel, template in outputs.items():
+        key = rel.as_posix()
+        existing = owned.get(key)
+        if existing is None and (
+            key in manifest.files or not under_roots(key, stale.answer_set.roots)
+        ):
+            continue
+        if (
+            existing is not None
+            and not stale.answers_changed
+            and existing.template == template.as_posix()
+            and existing.template_digest == digests[template]
+        ):
+            skipped += 1
+            continue
+        queued[rel] = template
+    return RerenderPlan(
+        outputs=outputs, owned=owned, queued=queued, template_digests=digests, skipped=skipped
+    )
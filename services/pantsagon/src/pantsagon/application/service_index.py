@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import tomllib
+from pathlib import Path
+from typing import Any, Iterable
+
+from pantsagon.application.render_manifest import MANIFEST_PATH, read_manifest
+from pantsagon.domain.diagnostics import Diagnostic, FileLocation, Severity
+from pantsagon.domain.render_manifest import RenderManifest
+from pantsagon.domain.result import Result
+
+SERVICES_DIR = Path(".pantsagon") / "services"
+LOCK_LAYOUTS = ("flat", "sharded")
+
+
+def lock_layout(lock: dict[str, Any] | None) -> str:
+    settings = lock.get("settings") if isinstance(lock, dict) else None
+    if not isinstance(settings, dict):
+        return "flat"
+    return str(settings.get("lock_layout") or "flat")
+
+
+def fragment_path(name: str) -> Path:
+    """Repo-relative path of the lock fragment for service ``name``."""
+    return SERVICES_DIR / f"{name}.toml"
+
+
+def manifest_shard_path(name: str) -> Path:
+    """Repo-relative path of the render manifest entries for fragment service ``name``."""
+    return SERVICES_DIR / f"{name}.manifest.json"
+
+
+def fragment_text(name: str, *, package: str, lang: str) -> str:
+    return "".join(
+        f"{key} = {json.dumps(value)}\n"
+        for key, value in (("name", name), ("package", package), ("lang", lang))
+    )
+
+
+def _invalid(path: Path, message: str) -> Diagnostic:
+    return Diagnostic(
+        code="LOCK_SERVICE_INVALID",
+        rule="lock.services",
+        severity=Severity.ERROR,
+        message=message,
+        location=FileLocation(str(path)),
+    )
+
+
+class ServiceIndex:
+    """The services a repo's lock records.
+
+    In the flat layout these are ``selection.services`` in ``.pantsagon.toml``. In the
+    sharded layout (``settings.lock_layout = "sharded"``) each service added since has
+    its own fragment, ``.pantsagon/services/<name>.toml``; the fragment directory is
+    the index, so looking up or adding one service touches one file and services
+    added on parallel branches never edit the same lines. Flat entries stay valid
+    after switching layouts. The render manifest entries of a fragment service live
+    next to it in ``<name>.manifest.json`` (see ``manifest_parts``).
+    """
+
+    def __init__(self, repo_path: Path, lock: dict[str, Any]) -> None:
+        self.repo_path = repo_path
+        self.sharded = lock_layout(lock) == "sharded"
+        selection = lock.get("selection") if isinstance(lock.get("selection"), dict) else {}
+        services = selection.get("services")
+        self._flat = [str(name) for name in services] if isinstance(services, list) else []
+        self._flat_set = set(self._flat)
+
+    def __contains__(self, name: str) -> bool:
+        if name in self._flat_set:
+            return True
+        return self.sharded and (self.repo_path / fragment_path(name)).is_file()
+
+    def names(self) -> list[str]:
+        """Flat entries in lock order, then fragment services by name."""
+        names = list(self._flat)
+        if self.sharded:
+            try:
+                fragments = sorted(
+                    path.stem for path in (self.repo_path / SERVICES_DIR).glob("*.toml")
+                )
+            except OSError:
+                fragments = []
+            names.extend(name for name in fragments if name not in self._flat_set)
+        return names
+
+    def fragments(self) -> list[str]:
+        """Services recorded only by a fragment, by name."""
+        return self.names()[len(self._flat) :]
+
+    def read(self, name: str) -> Result[dict[str, Any]]:
+        """The fragment for ``name``, checked to be a table naming that service."""
+        path = self.repo_path / fragment_path(name)
+        try:
+            data = tomllib.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return Result()
+        except (OSError, UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+            return Result(diagnostics=[_invalid(path, f"Service fragment unreadable: {e}")])
+        if data.get("name") != name:
+            message = f"Service fragment does not name {name}"
+        elif not isinstance(data.get("package"), str) or not data["package"]:
+            message = f"Service fragment for {name} has no package"
+        else:
+            return Result(value=data)
+        return Result(diagnostics=[_invalid(path, message)])
+
+
+def read_repo_manifest(repo_path: Path, lock: dict[str, Any]) -> Result[RenderManifest]:
+    """The repo's render manifest, with every fragment service's shard merged in.
+
+    Like ``read_manifest``, a repo with no manifest at all yields an empty result.
+    """
+    result = read_manifest(repo_path / MANIFEST_PATH)
+    services = ServiceIndex(repo_path, lock)
+    if result.diagnostics or not services.sharded:
+        return result
+    manifest = result.value
+    for name in services.fragments():
+        shard = read_manifest(repo_path / manifest_shard_path(name))
+        if shard.diagnostics:
+            return shard
+        if shard.value is None:
+            continue
+        if manifest is None:
+            manifest = RenderManifest()
+        manifest.files.update(shard.value.files)
+        manifest.answers.update(shard.value.answers)
+    return Result(value=manifest)
+
+
+def manifest_parts(manifest: RenderManifest, shards: Iterable[str]) -> dict[Path, RenderManifest]:
+    """``manifest`` split into the shared manifest and one shard per name in ``shards``.
+
+    A shard owns the answer sets rooted at its service directory, which add-service
+    records for each service, and the files rendered with them; everything else stays
+    in the shared manifest. Keys are repo-relative paths.
+    """
+    parts: dict[Path, RenderManifest] = {MANIFEST_PATH: RenderManifest()}
+    owners: dict[str, Path] = {}
+    for name in shards:
+        parts[manifest_shard_path(name)] = RenderManifest()
+        owners[f"services/{name}"] = manifest_shard_path(name)
+    owner_of: dict[str, Path] = {}
+    for digest, answer_set in manifest.answers.items():
+        owner = next((owners[r] for r in answer_set.roots if r in owners), MANIFEST_PATH)
+        owner_of[digest] = owner
+        parts[owner].answers[digest] = answer_set
+    for rel, item in manifest.files.items():
+        parts[owner_of.get(item.answers_digest, MANIFEST_PATH)].files[rel] = item
+    return parts
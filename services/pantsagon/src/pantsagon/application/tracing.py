@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import contextlib
+from contextlib import AbstractContextManager
+from typing import Any
+
+from pantsagon.ports.tracer import TracerPort
+
+
+def span(tracer: TracerPort | None, name: str, **attrs: Any) -> AbstractContextManager[None]:
+    if tracer is None:
+        return contextlib.nullcontext()
+    return tracer.span(name, **attrs)
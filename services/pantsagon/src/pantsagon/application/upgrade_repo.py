@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Any, cast
+
+from pantsagon.application.pack_sources import resolve_pack_path
+from pantsagon.application.render_manifest import (
+    MANIFEST_PATH,
+    content_digest,
+    pack_file_digests,
+)
+from pantsagon.application.repo_lock import effective_strict, lock_repository
+from pantsagon.application.rerender import lock_render_inputs, plan_rerender, stale_renders
+from pantsagon.application.repo_transaction import (
+    DEFAULT_LOCK_TIMEOUT,
+    RepoSnapshot,
+    commit_locked,
+    state_digest,
+)
+from pantsagon.application.service_index import read_repo_manifest
+from pantsagon.application.tracing import span
+from pantsagon.domain.diagnostics import Diagnostic, FileLocation, Severity
+from pantsagon.domain.merge import merge3
+from pantsagon.domain.pack import PackRef, PackSource
+from pantsagon.domain.render_manifest import AnswerSet, RenderedFile, RenderManifest
+from pantsagon.domain.result import Result
+from pantsagon.domain.strictness import apply_strictness
+from pantsagon.ports.pack_catalog import PackCatalogPort
+from pantsagon.ports.pack_store import PackStorePort
+from pantsagon.ports.policy_engine import PolicyEnginePort
+from pantsagon.ports.renderer import RenderRequest, RendererPort
+from pantsagon.ports.tracer import TracerPort
+from pantsagon.ports.workspace import WorkspacePort
+
+
+class _RenderFailed(Exception):
+    pass
+
+
+def _render_only(
+    renderer: RendererPort,
+    ref: PackRef,
+    pack_path: Path,
+    answers: dict[str, Any],
+    paths: list[Path],
+    allow_hooks: bool,
+) -> dict[Path, bytes]:
+    with tempfile.TemporaryDirectory() as tempdir:
+        try:
+            renderer.render(
+                RenderRequest(
+                    pack=ref,
+                    pack_path=pack_path,
+                    staging_dir=Path(tempdir),
+                    answers=answers,
+                    allow_hooks=allow_hooks,
+                    only=paths,
+                )
+            )
+        except Exception as exc:
+            raise _RenderFailed(str(exc)) from exc
+        return {
+            rel: (Path(tempdir) / rel).read_bytes()
+            for rel in paths
+            if (Path(tempdir) / rel).is_file()
+        }
+
+
+def _merge(base: bytes, local: bytes, new: bytes, label: str) -> tuple[bytes, int] | None:
+    try:
+        texts = [data.decode("utf-8") for data in (base, local, new)]
+    except UnicodeDecodeError:
+        return None
+    merged = merge3(*texts, ours_label="local", theirs_label=label)
+    return merged.text.encode("utf-8"), merged.conflicts
+
+
+def upgrade_repo(
+    repo_path: Path,
+    strict: bool | None = None,
+    *,
+    renderer_port: RendererPort | None = None,
+    policy_engine: PolicyEnginePort | None = None,
+    workspace: WorkspacePort | None = None,
+    pack_store: PackStorePort | None = None,
+    tracer: TracerPort | None = None,
+    git_catalog: PackCatalogPort | None = None,
+    archive_catalog: PackCatalogPort | None = None,
+    lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+) -> Result[None]:
+    """Re-render only the generated files whose template or answers changed.
+
+    Files without local edits are replaced; edited files are three-way merged against
+    the output of the previously locked pack snapshot.
+    """
+    diagnostics: list[Diagnostic] = []
+    base_digest = state_digest(repo_path)
+    lock_file = lock_repository(repo_path / ".pantsagon.toml")
+    with span(tracer, "read_lock"):
+        lock_result = lock_file.read()
+    diagnostics.extend(lock_result.diagnostics)
+    lock = lock_result.value
+    strict_enabled = effective_strict(strict, lock)
+    if lock is None:
+        return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+
+    if renderer_port is None or policy_engine is None or workspace is None or pack_store is None:
+        diagnostics.append(
+            Diagnostic(
+                code="UPGRADE_PORTS_MISSING",
+                rule="upgrade.ports",
+                severity=Severity.ERROR,
+                message=(
+                    "Upgrade requires renderer, policy engine, workspace, and pack store ports."
+                ),
+            )
+        )
+        return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+
+    with span(tracer, "read_manifest"):
+        manifest_result = read_repo_manifest(repo_path, lock)
+    diagnostics.extend(manifest_result.diagnostics)
+    if manifest_result.value is None:
+        if not manifest_result.diagnostics:
+            diagnostics.append(
+                Diagnostic(
+                    code="UPGRADE_MANIFEST_MISSING",
+                    rule="upgrade.manifest",
+                    severity=Severity.ERROR,
+                    message=f"No render manifest at {MANIFEST_PATH.as_posix()}",
+                )
+            )
+        return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+    manifest: RenderManifest = manifest_result.value
+    snapshot = RepoSnapshot.take(base_digest, lock, manifest)
+
+    shared_answers, pack_entries = lock_render_inputs(lock)
+    allow_hooks = bool(lock.get("settings", {}).get("allow_hooks", False))
+    stats: Counter[str] = Counter()
+    staged: dict[Path, bytes] = {}
+
+    try:
+        for entry in pack_entries:
+            pack_id = str(entry["id"])
+            pack_path, pack_diags = resolve_pack_path(
+                entry, repo_path, git_catalog, archive_catalog
+            )
+            diagnostics.extend(pack_diags)
+            if pack_path is None:
+                return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+
+            recorded = str(entry.get("digest") or "")
+            with span(tracer, "digest_pack", pack=pack_id):
+                current = pack_store.digest(pack_path)
+            pack_changed = current != recorded
+
+            work = stale_renders(manifest, pack_id, shared_answers, pack_changed)
+            if not work:
+                stats["packs_unchanged"] += 1
+                continue
+
+            version = str(entry.get("version") or "0.0.0")
+            ref = PackRef(
+                id=pack_id,
+                version=version,
+                source=cast(PackSource, str(entry.get("source"))),
+            )
+            if pack_changed:
+                stats["packs_changed"] += 1
+                with span(tracer, "validate_pack", pack=pack_id):
+                    validation = policy_engine.validate_pack(pack_path)
+                diagnostics.extend(validation.diagnostics)
+                if any(d.severity == Severity.ERROR for d in validation.diagnostics):
+                    return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+                if isinstance(validation.value, dict):
+                    version = str(validation.value.get("version", entry.get("version")))
+            base_path = pack_store.get(recorded) if recorded else None
+            # A conflicted file keeps its manifest entry, and the lock keeps the old pack,
+            # so the next upgrade merges it again against the same base.
+            conflicted = False
+
+            with span(tracer, "digest_files", pack=pack_id):
+                pack_files = pack_file_digests(pack_path)
+
+            for stale in work:
+                answer_set, values = stale.answer_set, stale.values
+                with span(tracer, "plan", pack=pack_id):
+                    plan = plan_rerender(
+                        renderer_port, pack_id, pack_path, pack_files, manifest, stale
+                    )
+                owned = plan.owned
+                queued = list(plan.queued)
+                stats["templates_skipped"] += plan.skipped
+
+                planned = {rel.as_posix() for rel in plan.outputs}
+                for key in sorted(set(owned) - planned):
+                    del manifest.files[key]
+                    diagnostics.append(
+                        Diagnostic(
+                            code="UPGRADE_FILE_ORPHANED",
+                            rule="upgrade.orphan",
+                            severity=Severity.INFO,
+                            message=f"{pack_id} no longer generates {key}; the file was kept",
+                            location=FileLocation(key),
+                        )
+                    )
+                if not queued:
+                    continue
+
+                with span(tracer, "render_pack", pack=pack_id, files=len(queued)):
+                    rendered = _render_only(
+                        renderer_port, ref, pack_path, values, queued, allow_hooks
+                    )
+                stats["templates_rendered"] += len(queued)
+
+                edited: list[Path] = []
+                for rel in queued:
+                    existing = owned.get(rel.as_posix())
+                    local_path = repo_path / rel
+                    if existing is not None and local_path.is_file():
+                        if content_digest(local_path.read_bytes()) != existing.content_digest:
+                            edited.append(rel)
+                base: dict[Path, bytes] = {}
+                if edited and base_path is not None:
+                    with span(tracer, "render_base", pack=pack_id, files=len(edited)):
+                        base = _render_only(
+                            renderer_port, ref, base_path, answer_set.values, edited, allow_hooks
+                        )
+
+                manifest.answers[stale.new_digest] = AnswerSet(
+                    values=values, roots=answer_set.roots
+                )
+                for rel in queued:
+                    new = rendered.get(rel)
+                    if new is None:
+                        continue
+                    key = rel.as_posix()
+                    local_path = repo_path / rel
+                    local = local_path.read_bytes() if local_path.is_file() else None
+                    if local is None or local == new or rel not in edited and key in owned:
+                        if local != new:
+                            staged[rel] = new
+                            stats["files_written"] += 1
+                    else:
+                        base_bytes = base.get(rel) if key in owned else b""
+                        merged = None
+                        if base_bytes is not None:
+                            merged = _merge(base_bytes, local, new, pack_id)
+                        if merged is None:
+                            diagnostics.append(
+                                Diagnostic(
+                                    code="UPGRADE_BASE_MISSING",
+                                    rule="upgrade.merge",
+                                    severity=Severity.WARN,
+                                    message=f"Kept local {key}; its edits could not be merged",
+                                    location=FileLocation(key),
+                                )
+                            )
+                            continue
+                        text, conflicts = merged
+                        if conflicts:
+                            stats["conflicts"] += conflicts
+                            conflicted = True
+                            diagnostics.append(
+                                Diagnostic(
+                                    code="UPGRADE_MERGE_CONFLICT",
+                                    rule="upgrade.merge",
+                                    severity=Severity.ERROR,
+                                    message=(
+                                        f"{conflicts} conflict(s) merging {key}; "
+                                        "the file was left unchanged"
+                                    ),
+                                    location=FileLocation(key),
+                                    hint=(
+                                        "Undo or move the overlapping local edits, "
+                                        "then run upgrade again."
+                                    ),
+                                    details={"pack": pack_id},
+                                )
+                            )
+                            continue
+                        staged[rel] = text
+                        stats["files_merged"] += 1
+                    manifest.files[key] = RenderedFile(
+                        path=key,
+                        pack=pack_id,
+                        template=plan.queued[rel].as_posix(),
+                        template_digest=plan.template_digests[plan.queued[rel]],
+                        answers_digest=stale.new_digest,
+                        content_digest=content_digest(new),
+                    )
+
+            if pack_changed and not conflicted:
+                entry["version"] = version
+                with span(tracer, "store_pack", pack=pack_id):
+                    entry["digest"] = pack_store.put(pack_path)
+    except _RenderFailed as exc:
+        diagnostics.append(
+            Diagnostic(
+                code="PACK_RENDER_FAILED",
+                rule="pack.render",
+                severity=Severity.ERROR,
+                message=str(exc),
+                is_execution=True,
+            )
+        )
+        return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+
+    artifact = {
+        "kind": "upgrade",
+        **{
+            name: stats[name]
+            for name in (
+                "packs_changed",
+                "packs_unchanged",
+                "templates_rendered",
+                "templates_skipped",
+                "files_written",
+                "files_merged",
+                "conflicts",
+            )
+        },
+    }
+    if stats["packs_changed"] or stats["templates_rendered"]:
+        stage = workspace.begin_transaction()
+        try:
+            for rel, data in staged.items():
+                (stage / rel).parent.mkdir(parents=True, exist_ok=True)
+                (stage / rel).write_bytes(data)
+            diagnostics.extend(
+                commit_locked(
+                    repo_path,
+                    workspace,
+                    stage,
+                    snapshot=snapshot,
+                    lock=lock,
+                    manifest=manifest,
+                    lock_file=lock_file,
+                    timeout=lock_timeout,
+                    tracer=tracer,
+                )
+            )
+        finally:
+            if stage.exists():
+                shutil.rmtree(stage, ignore_errors=True)
+    return Result(diagnostics=apply_strictness(diagnostics, strict_enabled), artifacts=[artifact])
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
 import os
-from typing import Any
+import threading
+from typing import Any, Callable, TypeVar
 
 import yaml
 
-from pantsagon.application.pack_index import load_pack_index, resolve_pack_ids
+from pantsagon.application.pack_index import PackIndex, load_pack_index, resolve_pack_ids
+from pantsagon.application.pack_sources import resolve_archive_pack, resolve_git_pack
+from pantsagon.application.pack_digest import digest_mismatch
+from pantsagon.application.render_manifest import missing_files
 from pantsagon.application.repo_lock import effective_strict, project_reserved_services, read_lock
+from pantsagon.application.service_index import (
+    LOCK_LAYOUTS,
+    ServiceIndex,
+    lock_layout,
+    read_repo_manifest,
+)
+from pantsagon.application.tracing import span
 from pantsagon.domain.diagnostics import Diagnostic, FileLocation, Severity, ValueLocation
 from pantsagon.domain.naming import (
     BUILTIN_RESERVED_SERVICES,
@@ -15,9 +28,13 @@ from pantsagon.domain.naming import (
     validate_pack_id,
     validate_service_name,
 )
+from pantsagon.domain.render_manifest import RenderManifest
 from pantsagon.domain.result import Result
 from pantsagon.domain.strictness import apply_strictness
+from pantsagon.ports.pack_catalog import PackCatalogPort
+from pantsagon.ports.pack_store import PackStorePort
 from pantsagon.ports.policy_engine import PolicyEnginePort
+from pantsagon.ports.tracer import TracerPort
 
 
 def _repo_root() -> Path:
@@ -42,6 +59,48 @@ def _bundled_pack_path(pack_id: str) -> Path:
     return _bundled_packs_root() / pack_id.split(".")[-1]
 
 
+T = TypeVar("T")
+
+
+class ValidationCache:
+    """Parsed pack manifests and pack indexes shared by ``validate_repo`` calls.
+
+    Entries are keyed by path and file stat, so an edited file is parsed again.
+    Cached values are shared between callers and must not be mutated.
+
+    Safe to share between threads: each path has its own lock, so concurrent
+    callers wait for one load of a file instead of parsing it twice, while
+    different files load in parallel.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._path_locks: dict[Path, threading.Lock] = {}
+        self._entries: dict[Path, tuple[tuple[int, int, int], Any]] = {}
+
+    def _get(self, path: Path, load: Callable[[], T]) -> T:
+        try:
+            stat = path.stat()
+        except OSError:
+            return load()
+        stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        with self._lock:
+            path_lock = self._path_locks.setdefault(path, threading.Lock())
+        with path_lock:
+            hit = self._entries.get(path)
+            if hit is not None and hit[0] == stamp:
+                return hit[1]
+            value = load()
+            self._entries[path] = (stamp, value)
+        return value
+
+    def pack_manifest(self, pack_path: Path) -> dict[str, Any]:
+        return self._get(pack_path / "pack.yaml", lambda: _load_manifest(pack_path))
+
+    def pack_index(self, path: Path) -> PackIndex:
+        return self._get(path, lambda: load_pack_index(path))
+
+
 def _get_list(value: Any) -> list[Any]:
     return list(value) if isinstance(value, list) else []
 
@@ -71,9 +130,15 @@ def validate_repo(
     repo_path: Path,
     strict: bool | None = None,
     policy_engine: PolicyEnginePort | None = None,
+    tracer: TracerPort | None = None,
+    pack_store: PackStorePort | None = None,
+    git_catalog: PackCatalogPort | None = None,
+    archive_catalog: PackCatalogPort | None = None,
+    cache: ValidationCache | None = None,
 ) -> Result[None]:
     diagnostics: list[Diagnostic] = []
-    lock_result = read_lock(repo_path / ".pantsagon.toml")
+    with span(tracer, "read_lock"):
+        lock_result = read_lock(repo_path / ".pantsagon.toml")
     diagnostics.extend(lock_result.diagnostics)
     strict_enabled = effective_strict(strict, lock_result.value)
     if lock_result.value is None:
@@ -202,6 +267,16 @@ def validate_repo(
                     )
                 )
                 continue
+            if pack_path.is_file():
+                pack_path, archive_diags = resolve_archive_pack(entry, pack_path, archive_catalog)
+                diagnostics.extend(archive_diags)
+                if pack_path is None:
+                    continue
+        elif source == "git":
+            pack_path, git_diags = resolve_git_pack(entry, repo_path, git_catalog)
+            diagnostics.extend(git_diags)
+            if pack_path is None:
+                continue
         else:
             diagnostics.append(
                 Diagnostic(
@@ -213,16 +288,26 @@ def validate_repo(
             )
             continue
 
-        manifest: dict[str, Any] = {}
+        recorded = entry.get("digest")
+        if pack_store is not None and recorded:
+            with span(tracer, "digest_pack", pack=pack_id):
+                current = pack_store.digest(pack_path)
+            if current != recorded:
+                diagnostics.append(digest_mismatch(pack_id, str(recorded), current))
+
+        # Unchanged packs are still checked: their warnings belong in every report, and
+        # schema or rule changes apply to them too. The engine memoizes by digest.
+        pack_manifest: dict[str, Any] = {}
         if policy_engine is not None:
-            manifest_result = policy_engine.validate_pack(pack_path)
-            diagnostics.extend(manifest_result.diagnostics)
-            if isinstance(manifest_result.value, dict):
-                manifest = manifest_result.value
-        if not manifest:
-            manifest = _load_manifest(pack_path)
-
-        compatibility = manifest.get("compatibility")
+            with span(tracer, "validate_pack", pack=pack_id):
+                pack_result = policy_engine.validate_pack(pack_path)
+            diagnostics.extend(pack_result.diagnostics)
+            if isinstance(pack_result.value, dict):
+                pack_manifest = pack_result.value
+        if not pack_manifest:
+            pack_manifest = cache.pack_manifest(pack_path) if cache else _load_manifest(pack_path)
+
+        compatibility = pack_manifest.get("compatibility")
         if compatibility is not None and not isinstance(compatibility, dict):
             diagnostics.append(
                 Diagnostic(
@@ -244,7 +329,7 @@ def validate_repo(
                     )
                 )
 
-        provides = manifest.get("provides")
+        provides = pack_manifest.get("provides")
         if isinstance(provides, dict):
             raw_features = provides.get("features")
             for feature in _get_list(raw_features):
@@ -254,7 +339,7 @@ def validate_repo(
                     diagnostics.append(shadow)
 
         requires = []
-        requires_block = manifest.get("requires")
+        requires_block = pack_manifest.get("requires")
         if isinstance(requires_block, dict):
             raw_requires = requires_block.get("packs")
             requires = [str(item) for item in raw_requires] if isinstance(raw_requires, list) else []
@@ -270,36 +355,76 @@ def validate_repo(
                 )
 
     selection = lock.get("selection") if isinstance(lock.get("selection"), dict) else {}
-    services = _get_list(selection.get("services")) if isinstance(selection, dict) else []
+    layout = lock_layout(lock)
+    if layout not in LOCK_LAYOUTS:
+        diagnostics.append(
+            Diagnostic(
+                code="LOCK_LAYOUT_UNKNOWN",
+                rule="lock.settings",
+                severity=Severity.ERROR,
+                message=f"Unknown lock layout {layout!r}",
+                hint=f"Use one of: {', '.join(LOCK_LAYOUTS)}",
+                location=ValueLocation("settings.lock_layout", layout),
+            )
+        )
+    service_index = ServiceIndex(repo_path, lock)
+    services = service_index.names()
+    flat_services = set(_get_list(selection.get("services")))
     reserved = project_reserved_services(lock)
-    for svc in services:
-        svc_name = str(svc)
-        diagnostics.extend(validate_service_name(svc_name, BUILTIN_RESERVED_SERVICES, reserved))
-        svc_root = repo_path / "services" / svc_name
-        if not svc_root.exists():
-            diagnostics.append(
-                Diagnostic(
-                    code="REPO_SERVICE_MISSING",
-                    rule="repo.service.exists",
-                    severity=Severity.ERROR,
-                    message=f"Service directory missing: {svc_name}",
-                    location=FileLocation(str(svc_root)),
+    with span(tracer, "read_manifest"):
+        manifest_result = read_repo_manifest(repo_path, lock)
+    diagnostics.extend(manifest_result.diagnostics)
+    manifest: RenderManifest | None = manifest_result.value
+    recorded_services: set[str] = set()
+    if manifest is not None:
+        for rel in manifest.files:
+            parts = rel.split("/", 2)
+            if len(parts) == 3 and parts[0] == "services":
+                recorded_services.add(parts[1])
+        with span(tracer, "check_manifest_files", count=len(manifest.files)):
+            for rel in missing_files(repo_path, manifest.files):
+                item = manifest.files[rel]
+                diagnostics.append(
+                    Diagnostic(
+                        code="REPO_FILE_MISSING",
+                        rule="repo.manifest.files",
+                        severity=Severity.ERROR,
+                        message=f"Generated file missing: {rel}",
+                        location=FileLocation(str(repo_path / rel)),
+                        details={"pack": item.pack, "template": item.template},
+                    )
                 )
-            )
-            continue
-        if "pantsagon.python" in pack_ids:
-            for layer in ("domain", "ports", "application", "adapters", "entrypoints"):
-                layer_path = svc_root / layer
-                if not layer_path.exists():
-                    diagnostics.append(
-                        Diagnostic(
-                            code="REPO_LAYER_MISSING",
-                            rule="repo.layer.exists",
-                            severity=Severity.ERROR,
-                            message=f"Missing layer directory {layer} for service {svc_name}",
-                            location=FileLocation(str(layer_path)),
-                        )
+    with span(tracer, "check_services", count=len(services)):
+        for svc in services:
+            svc_name = str(svc)
+            diagnostics.extend(validate_service_name(svc_name, BUILTIN_RESERVED_SERVICES, reserved))
+            if svc_name not in flat_services:
+                diagnostics.extend(service_index.read(svc_name).diagnostics)
+            svc_root = repo_path / "services" / svc_name
+            if not svc_root.exists():
+                diagnostics.append(
+                    Diagnostic(
+                        code="REPO_SERVICE_MISSING",
+                        rule="repo.service.exists",
+                        severity=Severity.ERROR,
+                        message=f"Service directory missing: {svc_name}",
+                        location=FileLocation(str(svc_root)),
                     )
+                )
+                continue
+            if "pantsagon.python" in pack_ids and svc_name not in recorded_services:
+                for layer in ("domain", "ports", "application", "adapters", "entrypoints"):
+                    layer_path = svc_root / layer
+                    if not layer_path.exists():
+                        diagnostics.append(
+                            Diagnostic(
+                                code="REPO_LAYER_MISSING",
+                                rule="repo.layer.exists",
+                                severity=Severity.ERROR,
+                                message=f"Missing layer directory {layer} for service {svc_name}",
+                                location=FileLocation(str(layer_path)),
+                            )
+                        )
 
     if isinstance(selection, dict):
         languages = [str(item) for item in _get_list(selection.get("languages"))]
@@ -311,7 +436,7 @@ def validate_repo(
                 diagnostics.append(shadow)
         index_path = _bundled_packs_root() / "_index.json"
         if index_path.exists():
-            index = load_pack_index(index_path)
+            index = cache.pack_index(index_path) if cache else load_pack_index(index_path)
             selection_result = resolve_pack_ids(index, languages=languages, features=features)
             diagnostics.extend(selection_result.diagnostics)
             expected = set(selection_result.value or [])
@@ -330,3 +455,79 @@ def validate_repo(
                     )
 
     return Result(diagnostics=apply_strictness(diagnostics, strict_enabled))
+
+
+def _validate_one(repo_path: Path, call: Callable[[Path], Result[None]]) -> Result[None]:
+    try:
+        return call(repo_path)
+    except Exception as e:
+        return Result(
+            diagnostics=[
+                Diagnostic(
+                    code="REPO_VALIDATE_FAILED",
+                    rule="repo.validate",
+                    severity=Severity.ERROR,
+                    message=f"Validating {repo_path} failed: {e}",
+                    location=FileLocation(str(repo_path)),
+                    is_execution=True,
+                )
+            ]
+        )
+
+
+def validate_repos(
+    repo_paths: list[Path],
+    strict: bool | None = None,
+    *,
+    policy_engine: PolicyEnginePort | None = None,
+    tracer: TracerPort | None = None,
+    pack_store: PackStorePort | None = None,
+    git_catalog: PackCatalogPort | None = None,
+    archive_catalog: PackCatalogPort | None = None,
+    jobs: int | None = None,
+) -> Result[None]:
+    """Validate several repos in one process, ``jobs`` at a time.
+
+    The ports and a ``ValidationCache`` are shared, so bundled pack manifests, the
+    pack index and pack digests are loaded once for the whole batch. Each
+    diagnostic's ``details`` gains the repo it came from, and every repo gets a
+    ``repo_validation`` artifact with its own exit code.
+    """
+    cache = ValidationCache()
+
+    def call(repo_path: Path) -> Result[None]:
+        with span(tracer, "validate_repo", repo=str(repo_path)):
+            return validate_repo(
+                repo_path,
+                strict=strict,
+                policy_engine=policy_engine,
+                tracer=tracer,
+                pack_store=pack_store,
+                git_catalog=git_catalog,
+                archive_catalog=archive_catalog,
+                cache=cache,
+            )
+
+    if jobs == 1 or len(repo_paths) < 2:
+        results = [_validate_one(path, call) for path in repo_paths]
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(lambda path: _validate_one(path, call), repo_paths))
+
+    diagnostics: list[Diagnostic] = []
+    artifacts: list[dict[str, Any]] = []
+    for repo_path, result in zip(repo_paths, results):
+        repo = str(repo_path)
+        diagnostics.extend(
+            replace(d, details={**(d.details or {}), "repo": repo}) for d in result.diagnostics
+        )
+        artifacts.append(
+            {
+                "kind": "repo_validation",
+                "repo": repo,
+                "exit_code": result.exit_code,
+                "errors": sum(d.severity == Severity.ERROR for d in result.diagnostics),
+                "warnings": sum(d.severity == Severity.WARN for d in result.diagnostics),
+            }
+        )
+    return Result(diagnostics=diagnostics, artifacts=artifacts)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Any, cast
+
+# (base_start, base_end, ours_start, ours_end, theirs_start, theirs_end)
+_Region = tuple[int, int, int, int, int, int]
+
+
+_MISSING: Any = object()
+
+
+@dataclass(frozen=True)
+class MergeResult:
+    lines: list[str]
+    conflicts: int
+
+    @property
+    def text(self) -> str:
+        return "".join(self.lines)
+
+
+def _sync_regions(base: list[str], ours: list[str], theirs: list[str]) -> list[_Region]:
+    """Base ranges that are unchanged on both sides, with their positions in each side."""
+    ours_blocks = SequenceMatcher(None, base, ours, autojunk=False).get_matching_blocks()
+    theirs_blocks = SequenceMatcher(None, base, theirs, autojunk=False).get_matching_blocks()
+    regions: list[_Region] = []
+    i = j = 0
+    while i < len(ours_blocks) and j < len(theirs_blocks):
+        a_base, a_side, a_len = ours_blocks[i]
+        b_base, b_side, b_len = theirs_blocks[j]
+        start = max(a_base, b_base)
+        end = min(a_base + a_len, b_base + b_len)
+        if start < end:
+            a_start = a_side + (start - a_base)
+            b_start = b_side + (start - b_base)
+            length = end - start
+            regions.append((start, end, a_start, a_start + length, b_start, b_start + length))
+        if a_base + a_len < b_base + b_len:
+            i += 1
+        else:
+            j += 1
+    regions.append((len(base), len(base), len(ours), len(ours), len(theirs), len(theirs)))
+    return regions
+
+
+def _terminated(lines: list[str]) -> list[str]:
+    if lines and not lines[-1].endswith("\n"):
+        return [*lines[:-1], lines[-1] + "\n"]
+    return lines
+
+
+def merge3(
+    base: str,
+    ours: str,
+    theirs: str,
+    *,
+    ours_label: str = "local",
+    theirs_label: str = "generated",
+) -> MergeResult:
+    """Line-based three-way merge; overlapping edits become git-style conflict blocks."""
+    base_lines = base.splitlines(keepends=True)
+    ours_lines = ours.splitlines(keepends=True)
+    theirs_lines = theirs.splitlines(keepends=True)
+    merged: list[str] = []
+    conflicts = 0
+    z = a = b = 0
+    for z_start, z_end, a_start, a_end, b_start, b_end in _sync_regions(
+        base_lines, ours_lines, theirs_lines
+    ):
+        base_chunk = base_lines[z:z_start]
+        ours_chunk = ours_lines[a:a_start]
+        theirs_chunk = theirs_lines[b:b_start]
+        if ours_chunk == theirs_chunk or theirs_chunk == base_chunk:
+            merged.extend(ours_chunk)
+        elif ours_chunk == base_chunk:
+            merged.extend(theirs_chunk)
+        else:
+            conflicts += 1
+            merged.append(f"<<<<<<< {ours_label}\n")
+            merged.extend(_terminated(ours_chunk))
+            merged.append("=======\n")
+            merged.extend(_terminated(theirs_chunk))
+            merged.append(f">>>>>>> {theirs_label}\n")
+        merged.extend(base_lines[z_start:z_end])
+        z, a, b = z_end, a_end, b_end
+    return MergeResult(lines=merged, conflicts=conflicts)
+
+
+@dataclass(frozen=True)
+class DataMergeResult:
+    value: Any
+    # dotted paths where both sides changed the same value differently
+    conflicts: list[str]
+
+
+def _merge_value(
+    base: Any, ours: Any, theirs: Any, path: str, prefer_ours: frozenset[str], conflicts: list[str]
+) -> Any:
+    if ours == theirs or theirs == base:
+        return ours
+    if ours == base:
+        return theirs
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        ours_map = cast(dict[str, Any], ours)
+        theirs_map = cast(dict[str, Any], theirs)
+        base_map = cast(dict[str, Any], base) if isinstance(base, dict) else {}
+        merged: dict[str, Any] = {}
+        for key in [*theirs_map, *(key for key in ours_map if key not in theirs_map)]:
+            value = _merge_value(
+                base_map.get(key, _MISSING),
+                ours_map.get(key, _MISSING),
+                theirs_map.get(key, _MISSING),
+                f"{path}.{key}" if path else str(key),
+                prefer_ours,
+                conflicts,
+            )
+            if value is not _MISSING:
+                merged[key] = value
+        return merged
+    if isinstance(base, list) and isinstance(ours, list) and isinstance(theirs, list):
+        base_list = cast(list[Any], base)
+        ours_list = cast(list[Any], ours)
+        theirs_list = cast(list[Any], theirs)
+        if ours_list[: len(base_list)] == base_list and theirs_list[: len(base_list)] == base_list:
+            added = [item for item in ours_list[len(base_list) :] if item not in theirs_list]
+            return theirs_list + added
+        if len(base_list) == len(ours_list) == len(theirs_list):
+            return [
+                _merge_value(b, o, t, f"{path}[{i}]", prefer_ours, conflicts)
+                for i, (b, o, t) in enumerate(zip(base_list, ours_list, theirs_list))
+            ]
+    if path not in prefer_ours:
+        conflicts.append(path)
+    return cast(Any, ours)
+
+
+def merge_data(
+    base: Any, ours: Any, theirs: Any, *, prefer_ours: frozenset[str] = frozenset()
+) -> DataMergeResult:
+    """Three-way merge of parsed TOML/JSON-like data.
+
+    Tables merge key by key and lists that both sides only appended to are
+    concatenated, so independent edits combine. A value both sides changed differently
+    is a conflict unless its dotted path is in ``prefer_ours``; ours is kept either way.
+    """
+    conflicts: list[str] = []
+    value = _merge_value(base, ours, theirs, "", prefer_ours, conflicts)
+    return DataMergeResult(value=value, conflicts=conflicts)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class RenderedFile:
+    """One generated file and the inputs it was rendered from."""
+
+    path: str
+    pack: str
+    template: str
+    template_digest: str
+    answers_digest: str
+    content_digest: str
+
+
+@dataclass
+class AnswerSet:
+    """Answers used for a render, and the repo paths that render owns."""
+
+    values: dict[str, Any]
+    roots: list[str]
+
+
+@dataclass
+class RenderManifest:
+    files: dict[str, RenderedFile] = field(default_factory=dict)
+    answers: dict[str, AnswerSet] = field(default_factory=dict)
+
+    def files_for(self, pack: str, answers_digest: str) -> list[RenderedFile]:
+        return [
+            item
+            for item in self.files.values()
+            if item.pack == pack and item.answers_digest == answers_digest
+        ]
@@ -1,19 +1,35 @@
 from pathlib import Path
 import contextlib
 import os
+from typing import Any, Callable
 
 import typer
 
+from pantsagon.adapters.io_metrics import IOMetrics, io_metrics_artifact
+from pantsagon.adapters.pack_archive.zip_archive import ZipPackArchiver
+from pantsagon.adapters.pack_catalog.archive import ArchivePackCatalog
 from pantsagon.adapters.pack_catalog.bundled import BundledPackCatalog
-from pantsagon.adapters.policy.pack_validator import PackPolicyEngine
+from pantsagon.adapters.pack_catalog.git import GitPackCatalog
+from pantsagon.adapters.pack_store.content_store import ContentAddressedPackStore
+from pantsagon.adapters.policy.pack_validator import PackPolicyEngine, default_memo_path
 from pantsagon.adapters.renderer.copier_renderer import CopierRenderer
+from pantsagon.adapters.tracing.span_recorder import SpanRecorder
 from pantsagon.adapters.workspace.filesystem import FilesystemWorkspace
+from pantsagon.adapters.workspace.memory import MemoryWorkspace
 from pantsagon.application.add_service import add_service as add_service_use_case
+from pantsagon.application.build_pack import build_pack
+from pantsagon.application.drift import detect_drift
 from pantsagon.application.init_repo import init_repo
+from pantsagon.application.repo_transaction import DEFAULT_LOCK_TIMEOUT
 from pantsagon.application.result_serialization import serialize_result
-from pantsagon.application.validate_repo import validate_repo
+from pantsagon.application.upgrade_repo import upgrade_repo
+from pantsagon.application.validate_repo import validate_repo, validate_repos
+from pantsagon.domain.result import Result
+from pantsagon.entrypoints.profiling import ProfileOptions, format_memory, profiled
 
 app = typer.Typer(add_completion=False)
+pack_app = typer.Typer(add_completion=False, help="Work with template packs")
+app.add_typer(pack_app, name="pack")
 
 
 def _packs_root() -> Path:
@@ -37,14 +53,108 @@ def _packs_root() -> Path:
     raise RuntimeError("Could not locate bundled packs directory")
 
 
+@app.callback()
+def _main(
+    ctx: typer.Context,
+    cprofile: Path | None = typer.Option(None, "--cprofile", hidden=True),
+    memprofile: bool = typer.Option(False, "--memprofile", hidden=True),
+) -> None:
+    ctx.obj = ProfileOptions(cprofile=cprofile, memprofile=memprofile)
+
+
 @app.command(hidden=True)
 def _noop() -> None:  # pyright: ignore[reportUnusedFunction]
     """Placeholder to keep Typer in group mode when only one command exists."""
     return None
 
 
+def _policy_engine(pack_store: ContentAddressedPackStore, no_cache: bool) -> PackPolicyEngine:
+    memo_path = None if no_cache else default_memo_path()
+    return PackPolicyEngine(memo_path=memo_path, digest=pack_store.digest)
+
+
+def _recorder(profile: bool, trace_file: Path | None) -> SpanRecorder | None:
+    return SpanRecorder() if profile or trace_file is not None else None
+
+
+def _io_metrics(profile: bool) -> IOMetrics | None:
+    return IOMetrics() if profile else None
+
+
+def _run_use_case(
+    command: str,
+    args: list[str],
+    *,
+    json: bool,
+    ctx: typer.Context,
+    recorder: SpanRecorder | None,
+    profile: bool,
+    trace_file: Path | None,
+    call: Callable[[], Result[Any]],
+    io_metrics: dict[str, IOMetrics | None] | None = None,
+    dry_run: MemoryWorkspace | None = None,
+) -> Result[Any]:
+    with contextlib.ExitStack() as stack:
+        if json:
+            devnull = stack.enter_context(open(os.devnull, "w", encoding="utf-8"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+            stack.enter_context(contextlib.redirect_stderr(devnull))
+        profile_artifacts = stack.enter_context(profiled(ctx.obj))
+        if recorder is not None:
+            stack.enter_context(recorder.span(command))
+        result = call()
+    result.artifacts.extend(profile_artifacts)
+    operations = dry_run.planned_operations() if dry_run is not None else None
+    if operations is not None:
+        result.artifacts.append({"kind": "dry_run", "operations": operations})
+    if io_metrics and any(io_metrics.values()):
+        result.artifacts.append(io_metrics_artifact(**io_metrics))
+    if recorder is not None and profile:
+        result.artifacts.append(recorder.artifact())
+    if recorder is not None and trace_file is not None:
+        recorder.write_chrome_trace(trace_file)
+        result.artifacts.append({"kind": "trace", "format": "chrome", "path": str(trace_file)})
+    if json:
+        data = serialize_result(result, command=command, args=args)
+        import json as _json
+
+        typer.echo(_json.dumps(data))
+    else:
+        for op in operations or []:
+            if op["action"] != "unchanged":
+                typer.echo(f"{op['action']}: {op['path']}")
+        if recorder is not None and profile:
+            typer.echo(recorder.format_tree(), err=True)
+        for artifact in profile_artifacts:
+            if artifact["kind"] == "memory":
+                typer.echo(format_memory(artifact), err=True)
+    return result
+
+
+PROFILE_OPTION = typer.Option(False, "--profile", help="Include a timing tree in the result")
+TRACE_FILE_OPTION = typer.Option(
+    None, "--trace-file", help="Write a Chrome trace-event file (Perfetto, speedscope)"
+)
+DRY_RUN_OPTION = typer.Option(
+    False, "--dry-run", help="Report planned file operations without writing the repo"
+)
+NO_CACHE_OPTION = typer.Option(
+    False,
+    "--no-cache",
+    envvar="PANTSAGON_NO_CACHE",
+    help="Keep pack validation results in memory only; do not read or write the cache file",
+)
+LOCK_TIMEOUT_OPTION = typer.Option(
+    DEFAULT_LOCK_TIMEOUT,
+    "--lock-timeout",
+    envvar="PANTSAGON_LOCK_TIMEOUT",
+    help="Seconds to wait for another pantsagon command writing the same repo",
+)
+
+
 @app.command()
 def init(
+    ctx: typer.Context,
     repo: Path = typer.Argument(...),
     lang: str = typer.Option(...),
     services: str = "",
@@ -52,36 +162,35 @@ def init(
     augmented_coding: str = typer.Option("none", "--augmented-coding"),
     strict: bool | None = typer.Option(None, "--strict"),
     json: bool = typer.Option(False, "--json"),
+    profile: bool = PROFILE_OPTION,
+    trace_file: Path | None = TRACE_FILE_OPTION,
+    no_cache: bool = NO_CACHE_OPTION,
+    dry_run: bool = DRY_RUN_OPTION,
 ):
     features = feature or []
     svc_list = [s for s in services.split(",") if s]
+    recorder = _recorder(profile, trace_file)
     packs_root = _packs_root()
     catalog = BundledPackCatalog(packs_root)
-    renderer_port = CopierRenderer()
-    policy_engine = PackPolicyEngine()
-    workspace = FilesystemWorkspace(repo)
-    if json:
-        with open(os.devnull, "w", encoding="utf-8") as devnull:
-            with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
-                result = init_repo(
-                    repo,
-                    [lang],
-                    svc_list,
-                    features,
-                    renderer="copier",
-                    renderer_port=renderer_port,
-                    pack_catalog=catalog,
-                    policy_engine=policy_engine,
-                    workspace=workspace,
-                    augmented_coding=augmented_coding,
-                    strict=strict,
-                )
-        data = serialize_result(result, command="init", args=[str(repo)])
-        import json as _json
-
-        typer.echo(_json.dumps(data))
-    else:
-        result = init_repo(
+    renderer_port = CopierRenderer(metrics=_io_metrics(profile))
+    pack_store = ContentAddressedPackStore()
+    policy_engine = _policy_engine(pack_store, no_cache)
+    workspace: FilesystemWorkspace | MemoryWorkspace = (
+        MemoryWorkspace(repo, metrics=_io_metrics(profile))
+        if dry_run
+        else FilesystemWorkspace(
+            repo, tracer=recorder if trace_file else None, metrics=_io_metrics(profile)
+        )
+    )
+    result = _run_use_case(
+        "init",
+        [str(repo)],
+        json=json,
+        ctx=ctx,
+        recorder=recorder,
+        profile=profile,
+        trace_file=trace_file,
+        call=lambda: init_repo(
             repo,
             [lang],
             svc_list,
@@ -93,50 +202,124 @@ def init(
             workspace=workspace,
             augmented_coding=augmented_coding,
             strict=strict,
-        )
+            tracer=recorder,
+            pack_store=pack_store,
+        ),
+        io_metrics={"renderer": renderer_port.metrics, "workspace": workspace.metrics},
+        dry_run=workspace if isinstance(workspace, MemoryWorkspace) else None,
+    )
     raise typer.Exit(result.exit_code)
 
 
 @app.command()
-def validate(json: bool = False, strict: bool | None = typer.Option(None, "--strict")):
-    policy_engine = PackPolicyEngine()
-    result = validate_repo(Path("."), strict=strict, policy_engine=policy_engine)
-    if json:
-        data = serialize_result(result, command="validate", args=[])
-        import json as _json
-
-        typer.echo(_json.dumps(data))
+def validate(
+    ctx: typer.Context,
+    paths: list[Path] | None = typer.Argument(
+        None, metavar="[PATH]...", help="Repos to validate; requires --repos"
+    ),
+    json: bool = False,
+    strict: bool | None = typer.Option(None, "--strict"),
+    repos: bool = typer.Option(
+        False, "--repos", help="Validate each PATH as a repo, all in one process"
+    ),
+    jobs: int | None = typer.Option(
+        None, "--jobs", help="With --repos, validate N repos at a time (default: automatic)"
+    ),
+    profile: bool = PROFILE_OPTION,
+    trace_file: Path | None = TRACE_FILE_OPTION,
+    no_cache: bool = NO_CACHE_OPTION,
+):
+    if bool(paths) != repos:
+        raise typer.BadParameter("--repos takes one or more repo paths, and paths need --repos")
+    recorder = _recorder(profile, trace_file)
+    pack_store = ContentAddressedPackStore()
+    policy_engine = _policy_engine(pack_store, no_cache)
+    git_catalog = GitPackCatalog()
+    archive_catalog = ArchivePackCatalog(pack_store)
+    if paths:
+        repo_paths = list(paths)
+        result = _run_use_case(
+            "validate",
+            ["--repos", *(str(path) for path in repo_paths)],
+            json=json,
+            ctx=ctx,
+            recorder=recorder,
+            profile=profile,
+            trace_file=trace_file,
+            call=lambda: validate_repos(
+                repo_paths,
+                strict=strict,
+                policy_engine=policy_engine,
+                tracer=recorder,
+                pack_store=pack_store,
+                git_catalog=git_catalog,
+                archive_catalog=archive_catalog,
+                jobs=jobs,
+            ),
+        )
+        if not json:
+            for artifact in result.artifacts:
+                if artifact["kind"] == "repo_validation":
+                    status = "ok" if artifact["exit_code"] == 0 else "failed"
+                    typer.echo(
+                        f"{status}: {artifact['repo']} "
+                        f"({artifact['errors']} errors, {artifact['warnings']} warnings)"
+                    )
+        raise typer.Exit(result.exit_code)
+    result = _run_use_case(
+        "validate",
+        [],
+        json=json,
+        ctx=ctx,
+        recorder=recorder,
+        profile=profile,
+        trace_file=trace_file,
+        call=lambda: validate_repo(
+            Path("."),
+            strict=strict,
+            policy_engine=policy_engine,
+            tracer=recorder,
+            pack_store=pack_store,
+            git_catalog=git_catalog,
+            archive_catalog=archive_catalog,
+        ),
+    )
     raise typer.Exit(result.exit_code)
 
 
 @app.command()
 def add_service(
+    ctx: typer.Context,
     name: str,
     lang: str = typer.Option("python"),
     strict: bool | None = typer.Option(None, "--strict"),
     json: bool = typer.Option(False, "--json"),
+    profile: bool = PROFILE_OPTION,
+    trace_file: Path | None = TRACE_FILE_OPTION,
+    no_cache: bool = NO_CACHE_OPTION,
+    dry_run: bool = DRY_RUN_OPTION,
+    lock_timeout: float = LOCK_TIMEOUT_OPTION,
 ):
-    renderer_port = CopierRenderer()
-    policy_engine = PackPolicyEngine()
-    workspace = FilesystemWorkspace(Path("."))
-    if json:
-        with open(os.devnull, "w", encoding="utf-8") as devnull:
-            with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
-                result = add_service_use_case(
-                    Path("."),
-                    name=name,
-                    lang=lang,
-                    strict=strict,
-                    renderer_port=renderer_port,
-                    policy_engine=policy_engine,
-                    workspace=workspace,
-                )
-        data = serialize_result(result, command="add-service", args=[name])
-        import json as _json
-
-        typer.echo(_json.dumps(data))
-    else:
-        result = add_service_use_case(
+    recorder = _recorder(profile, trace_file)
+    renderer_port = CopierRenderer(metrics=_io_metrics(profile))
+    pack_store = ContentAddressedPackStore()
+    policy_engine = _policy_engine(pack_store, no_cache)
+    workspace: FilesystemWorkspace | MemoryWorkspace = (
+        MemoryWorkspace(Path("."), metrics=_io_metrics(profile))
+        if dry_run
+        else FilesystemWorkspace(
+            Path("."), tracer=recorder if trace_file else None, metrics=_io_metrics(profile)
+        )
+    )
+    result = _run_use_case(
+        "add-service",
+        [name],
+        json=json,
+        ctx=ctx,
+        recorder=recorder,
+        profile=profile,
+        trace_file=trace_file,
+        call=lambda: add_service_use_case(
             Path("."),
             name=name,
             lang=lang,
@@ -144,5 +327,135 @@ def add_service(
             renderer_port=renderer_port,
             policy_engine=policy_engine,
             workspace=workspace,
+            tracer=recorder,
+            pack_store=pack_store,
+            git_catalog=GitPackCatalog(),
+            archive_catalog=ArchivePackCatalog(pack_store),
+            lock_timeout=lock_timeout,
+        ),
+        io_metrics={"renderer": renderer_port.metrics, "workspace": workspace.metrics},
+        dry_run=workspace if isinstance(workspace, MemoryWorkspace) else None,
+    )
+    raise typer.Exit(result.exit_code)
+
+
+@app.command()
+def upgrade(
+    ctx: typer.Context,
+    strict: bool | None = typer.Option(None, "--strict"),
+    json: bool = typer.Option(False, "--json"),
+    profile: bool = PROFILE_OPTION,
+    trace_file: Path | None = TRACE_FILE_OPTION,
+    no_cache: bool = NO_CACHE_OPTION,
+    dry_run: bool = DRY_RUN_OPTION,
+    lock_timeout: float = LOCK_TIMEOUT_OPTION,
+):
+    recorder = _recorder(profile, trace_file)
+    renderer_port = CopierRenderer(metrics=_io_metrics(profile))
+    pack_store = ContentAddressedPackStore()
+    workspace: FilesystemWorkspace | MemoryWorkspace = (
+        MemoryWorkspace(Path("."), metrics=_io_metrics(profile))
+        if dry_run
+        else FilesystemWorkspace(
+            Path("."), tracer=recorder if trace_file else None, metrics=_io_metrics(profile)
         )
+    )
+    result = _run_use_case(
+        "upgrade",
+        [],
+        json=json,
+        ctx=ctx,
+        recorder=recorder,
+        profile=profile,
+        trace_file=trace_file,
+        call=lambda: upgrade_repo(
+            Path("."),
+            strict=strict,
+            renderer_port=renderer_port,
+            policy_engine=_policy_engine(pack_store, no_cache),
+            workspace=workspace,
+            pack_store=pack_store,
+            tracer=recorder,
+            git_catalog=GitPackCatalog(),
+            archive_catalog=ArchivePackCatalog(pack_store),
+            lock_timeout=lock_timeout,
+        ),
+        io_metrics={"renderer": renderer_port.metrics, "workspace": workspace.metrics},
+        dry_run=workspace if isinstance(workspace, MemoryWorkspace) else None,
+    )
+    raise typer.Exit(result.exit_code)
+
+
+@app.command()
+def drift(
+    ctx: typer.Context,
+    strict: bool | None = typer.Option(None, "--strict"),
+    json: bool = typer.Option(False, "--json"),
+    jobs: int | None = typer.Option(
+        None, "--jobs", help="Hash working-tree files with N threads (default: automatic)"
+    ),
+    profile: bool = PROFILE_OPTION,
+    trace_file: Path | None = TRACE_FILE_OPTION,
+):
+    recorder = _recorder(profile, trace_file)
+    pack_store = ContentAddressedPackStore()
+    result = _run_use_case(
+        "drift",
+        [],
+        json=json,
+        ctx=ctx,
+        recorder=recorder,
+        profile=profile,
+        trace_file=trace_file,
+        call=lambda: detect_drift(
+            Path("."),
+            strict=strict,
+            renderer_port=CopierRenderer(),
+            pack_store=pack_store,
+            tracer=recorder,
+            git_catalog=GitPackCatalog(),
+            archive_catalog=ArchivePackCatalog(pack_store),
+            jobs=jobs,
+        ),
+    )
+    if not json:
+        for diag in result.diagnostics:
+            typer.echo(f"{diag.severity.value}: {diag.code}: {diag.message}", err=True)
+    raise typer.Exit(result.exit_code)
+
+
+@pack_app.command("build")
+def pack_build(
+    ctx: typer.Context,
+    pack: Path = typer.Argument(..., help="Pack directory containing pack.yaml"),
+    output: Path | None = typer.Option(
+        None, "--output", "-o", help="Archive path (default: <id>-<version>.pantsagon-pack)"
+    ),
+    json: bool = typer.Option(False, "--json"),
+    profile: bool = PROFILE_OPTION,
+    trace_file: Path | None = TRACE_FILE_OPTION,
+):
+    recorder = _recorder(profile, trace_file)
+    result = _run_use_case(
+        "pack build",
+        [str(pack)],
+        json=json,
+        ctx=ctx,
+        recorder=recorder,
+        profile=profile,
+        trace_file=trace_file,
+        call=lambda: build_pack(
+            pack,
+            output,
+            policy_engine=PackPolicyEngine(),
+            archiver=ZipPackArchiver(),
+            tracer=recorder,
+        ),
+    )
+    if not json:
+        for diag in result.diagnostics:
+            typer.echo(f"{diag.severity.value}: {diag.code}: {diag.message}", err=True)
+        if result.value is not None:
+            info = result.value
+            typer.echo(f"Wrote {info.path} ({info.files} files, {info.digest})")
     raise typer.Exit(result.exit_code)
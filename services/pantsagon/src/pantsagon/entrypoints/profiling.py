@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+
+@dataclass(frozen=True)
+class ProfileOptions:
+    cprofile: Path | None = None
+    memprofile: bool = False
+    top: int = 10
+
+
+def _memory_artifact(snapshot: tracemalloc.Snapshot, peak: int, top: int) -> dict[str, Any]:
+    sites = []
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        sites.append(
+            {
+                "file": frame.filename,
+                "line": frame.lineno,
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+        )
+    return {"kind": "memory", "peak_bytes": peak, "top": sites}
+
+
+@contextlib.contextmanager
+def profiled(options: ProfileOptions | None) -> Iterator[list[dict[str, Any]]]:
+    """Run the body under cProfile and/or tracemalloc; artifacts are filled in on exit."""
+    artifacts: list[dict[str, Any]] = []
+    if options is None or (options.cprofile is None and not options.memprofile):
+        yield artifacts
+        return
+
+    profiler = cProfile.Profile() if options.cprofile is not None else None
+    started_tracemalloc = False
+    if options.memprofile and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started_tracemalloc = True
+    if options.memprofile:
+        tracemalloc.reset_peak()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield artifacts
+    finally:
+        if profiler is not None and options.cprofile is not None:
+            profiler.disable()
+            options.cprofile.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(options.cprofile))
+            artifacts.append(
+                {"kind": "cprofile", "format": "pstats", "path": str(options.cprofile)}
+            )
+        if options.memprofile:
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)]
+            )
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracemalloc:
+                tracemalloc.stop()
+            artifacts.append(_memory_artifact(snapshot, peak, options.top))
+
+
+def format_memory(artifact: dict[str, Any]) -> str:
+    lines = [f"peak memory: {artifact['peak_bytes'] / 1024:.1f} KiB"]
+    for site in artifact["top"]:
+        lines.append(
+            f"  {site['size_bytes'] / 1024:10.1f} KiB  {site['count']:6d}  "
+            f"{site['file']}:{site['line']}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+PACK_ARCHIVE_SUFFIX = ".pantsagon-pack"
+
+
+@dataclass
+class PackArchiveInfo:
+    path: Path
+    pack_id: str
+    version: str
+    digest: str
+    files: int
+    size_bytes: int
+
+
+class PackArchiverPort(Protocol):
+    def build(self, pack_path: Path, output: Path) -> PackArchiveInfo: ...
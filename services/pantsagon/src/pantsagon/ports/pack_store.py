@@ -0,0 +1,10 @@
+from pathlib import Path
+from typing import Protocol
+
+
+class PackStorePort(Protocol):
+    def digest(self, pack_path: Path) -> str: ...
+
+    def put(self, pack_path: Path) -> str: ...
+
+    def get(self, digest: str) -> Path | None: ...
@@ -12,6 +12,7 @@ class RenderRequest:
     staging_dir: Path
     answers: dict[str, Any]
     allow_hooks: bool
+    only: list[Path] | None = None
 
 
 @dataclass
@@ -22,3 +23,9 @@ class RenderOutcome:
 
 class RendererPort(Protocol):
     def render(self, request: RenderRequest) -> RenderOutcome: ...
+
+    def template_map(self, pack_path: Path, answers: dict[str, Any]) -> dict[Path, Path]: ...
+
+    def render_files(
+        self, pack_path: Path, answers: dict[str, Any], templates: dict[Path, Path]
+    ) -> dict[Path, bytes]: ...
@@ -0,0 +1,6 @@
+from contextlib import AbstractContextManager
+from typing import Any, Protocol
+
+
+class TracerPort(Protocol):
+    def span(self, name: str, **attrs: Any) -> AbstractContextManager[None]: ...
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import argparse
+import random
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from pantsagon.application.repo_lock import write_lock
+
+LAYERS = ("domain", "ports", "application", "adapters", "entrypoints")
+BUNDLED_PACKS = ("pantsagon.core", "pantsagon.python", "pantsagon.openapi", "pantsagon.docker")
+_WORDS = (
+    "account",
+    "audit",
+    "billing",
+    "catalog",
+    "event",
+    "gateway",
+    "invoice",
+    "ledger",
+    "order",
+    "payment",
+    "profile",
+    "report",
+    "search",
+    "session",
+    "shipment",
+    "user",
+)
+
+
+def service_names(count: int) -> list[str]:
+    return [f"svc-{index:05d}" for index in range(count)]
+
+
+def synthetic_pack_id(index: int) -> str:
+    return f"synthetic.pack-{index:04d}"
+
+
+def _dir_names(rng: random.Random, fanout: int) -> list[str]:
+    words = rng.sample(_WORDS, k=min(fanout, len(_WORDS)))
+    return [f"{word}{index}" for index, word in enumerate(words)] + [
+        f"dir{index}" for index in range(len(words), fanout)
+    ]
+
+
+def _template_dirs(rng: random.Random, depth: int, fanout: int) -> list[Path]:
+    dirs = [Path()]
+    frontier = [Path()]
+    for _ in range(depth):
+        frontier = [parent / name for parent in frontier for name in _dir_names(rng, fanout)]
+        dirs.extend(frontier)
+    return dirs
+
+
+def _template_body(rng: random.Random, variables: list[str], lines: int) -> str:
+    body = []
+    for line in range(lines):
+        word = rng.choice(_WORDS)
+        var = variables[line % len(variables)] if variables else None
+        if var:
+            body.append(f"{word}_{line} = \"{{{{ {var} }}}}\"")
+        else:
+            body.append(f"{word}_{line} = {rng.randrange(1 << 16)}")
+    return "\n".join(body) + "\n"
+
+
+def generate_pack(
+    path: Path,
+    *,
+    pack_id: str = "synthetic.pack",
+    templates: int = 100,
+    depth: int = 3,
+    fanout: int = 4,
+    variables: int = 2,
+    lines: int = 20,
+    seed: int = 0,
+) -> Path:
+    """Write a schema-valid pack with ``templates`` files spread over a tree of ``depth`` levels."""
+    rng = random.Random(f"{seed}:{pack_id}")
+    names = [f"var_{index}" for index in range(variables)]
+    manifest: dict[str, Any] = {
+        "schema_version": 1,
+        "id": pack_id,
+        "version": "1.0.0",
+        "description": f"Synthetic pack with {templates} templates",
+        "compatibility": {"pants": ">=2.30.0"},
+        "variables": [{"name": name, "type": "string"} for name in names],
+    }
+    copier: dict[str, Any] = {
+        "_min_copier_version": "9.0.0",
+        "_subdirectory": "templates",
+        "_templates_suffix": ".jinja",
+    }
+    for name in names:
+        copier[name] = {"type": "str", "default": name}
+
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "pack.yaml").write_text(yaml.safe_dump(manifest, sort_keys=False), encoding="utf-8")
+    (path / "copier.yml").write_text(yaml.safe_dump(copier, sort_keys=False), encoding="utf-8")
+    dirs = _template_dirs(rng, depth, fanout)
+    for index in range(templates):
+        target = path / "templates" / rng.choice(dirs) / f"file_{index:05d}.py.jinja"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(_template_body(rng, names, lines), encoding="utf-8")
+    return path
+
+
+def synthetic_lock(
+    repo_name: str,
+    services: list[str],
+    local_packs: list[tuple[str, str]] | None = None,
+) -> dict[str, Any]:
+    packs: list[dict[str, Any]] = [
+        {"id": pack_id, "version": "1.0.0", "source": "bundled"} for pack_id in BUNDLED_PACKS
+    ]
+    for pack_id, location in local_packs or []:
+        packs.append({"id": pack_id, "version": "1.0.0", "source": "local", "location": location})
+    return {
+        "tool": {"name": "pantsagon", "version": "1.0.0"},
+        "settings": {
+            "renderer": "copier",
+            "strict": False,
+            "strict_manifest": True,
+            "allow_hooks": False,
+        },
+        "selection": {
+            "languages": ["python"],
+            "features": ["openapi", "docker"],
+            "services": services,
+            "augmented_coding": "none",
+        },
+        "resolved": {
+            "packs": packs,
+            "answers": {
+                "repo_name": repo_name,
+                "service_name": services[0] if services else "service",
+                "service_pkg": services[0].replace("-", "_") if services else "service",
+                "service_packages": {name: name.replace("-", "_") for name in services},
+            },
+        },
+    }
+
+
+def generate_repo(
+    path: Path,
+    *,
+    services: int,
+    packs: int = 0,
+    pack_templates: int = 10,
+    files_per_layer: int = 0,
+    seed: int = 0,
+) -> Path:
+    """Write a repo whose lock and service tree pass ``validate_repo``.
+
+    ``packs`` adds that many synthetic local packs under ``packs/`` and records them in
+    ``[[resolved.packs]]``; ``files_per_layer`` fills each service layer with modules.
+    """
+    rng = random.Random(seed)
+    names = service_names(services)
+    path.mkdir(parents=True, exist_ok=True)
+    local_packs: list[tuple[str, str]] = []
+    for index in range(packs):
+        pack_id = synthetic_pack_id(index)
+        location = f"packs/synthetic-{index:04d}"
+        generate_pack(path / location, pack_id=pack_id, templates=pack_templates, seed=seed)
+        local_packs.append((pack_id, location))
+    write_lock(path / ".pantsagon.toml", synthetic_lock(path.name, names, local_packs))
+    for name in names:
+        for layer in LAYERS:
+            layer_dir = path / "services" / name / layer
+            layer_dir.mkdir(parents=True)
+            for index in range(files_per_layer):
+                module = f"{rng.choice(_WORDS)}_{index}"
+                (layer_dir / f"{module}.py").write_text(
+                    f"{module.upper()} = {rng.randrange(1 << 16)}\n", encoding="utf-8"
+                )
+    return path
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate synthetic Pantsagon fixtures")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for deterministic output")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    repo = commands.add_parser("repo", help="Generate a repo with a lock and service tree")
+    repo.add_argument("path", type=Path)
+    repo.add_argument("--services", type=int, default=100)
+    repo.add_argument("--packs", type=int, default=0, help="Synthetic local packs in the lock")
+    repo.add_argument("--pack-templates", type=int, default=10)
+    repo.add_argument("--files-per-layer", type=int, default=0)
+
+    pack = commands.add_parser("pack", help="Generate a pack with many templates")
+    pack.add_argument("path", type=Path)
+    pack.add_argument("--id", dest="pack_id", default="synthetic.pack")
+    pack.add_argument("--templates", type=int, default=1000)
+    pack.add_argument("--depth", type=int, default=3)
+    pack.add_argument("--fanout", type=int, default=4)
+    pack.add_argument("--variables", type=int, default=2)
+    pack.add_argument("--lines", type=int, default=20, help="Lines per template")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.path.exists() and any(args.path.iterdir()):
+        print(f"Refusing to write into non-empty directory: {args.path}")
+        return 2
+    if args.command == "repo":
+        generate_repo(
+            args.path,
+            services=args.services,
+            packs=args.packs,
+            pack_templates=args.pack_templates,
+            files_per_layer=args.files_per_layer,
+            seed=args.seed,
+        )
+        print(f"Generated repo with {args.services} services and {args.packs} local packs")
+    else:
+        generate_pack(
+            args.path,
+            pack_id=args.pack_id,
+            templates=args.templates,
+            depth=args.depth,
+            fanout=args.fanout,
+            variables=args.variables,
+            lines=args.lines,
+            seed=args.seed,
+        )
+        print(f"Generated pack {args.pack_id} with {args.templates} templates")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
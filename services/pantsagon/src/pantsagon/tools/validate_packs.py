@@ -2,11 +2,19 @@ from __future__ import annotations
 
 import argparse
 import contextlib
+import hashlib
+import importlib.metadata
+import io
 import json
 import os
+import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, cast
+
+import yaml
 
 from pantsagon.adapters.errors import RendererExecutionError
 from pantsagon.adapters.policy import pack_validator
@@ -15,7 +23,7 @@ from pantsagon.adapters.renderer.copier_renderer import CopierRenderer
 from pantsagon.application.pack_validation import validate_pack
 from pantsagon.domain.determinism import is_deterministic
 from pantsagon.domain.diagnostics import Diagnostic, FileLocation, Severity
-from pantsagon.domain.pack import PackRef
+from pantsagon.domain.pack import PackRef, PackSource
 from pantsagon.domain.result import Result
 from pantsagon.ports.renderer import RenderRequest
 
@@ -117,6 +125,108 @@ def _pack_dirs(packs_root: Path) -> list[Path]:
     return sorted(candidates, key=lambda p: p.name)
 
 
+@dataclass(frozen=True)
+class PackTarget:
+    path: Path
+    pack_id: str
+    source: PackSource
+
+
+def _is_pack_dir(path: Path) -> bool:
+    return (path / "pack.yaml").exists() or (path / "copier.yml").exists()
+
+
+def _pack_id_for(pack_dir: Path) -> str:
+    if (pack_dir / "pack.yaml").exists():
+        try:
+            manifest = pack_validator.load_manifest(pack_dir)
+        except (OSError, UnicodeDecodeError, yaml.YAMLError):
+            manifest = {}
+        if manifest.get("id"):
+            return str(manifest["id"])
+    return pack_dir.name
+
+
+def _expand_pattern(pattern: str) -> list[Path]:
+    path = Path(pattern).expanduser()
+    if not any(char in pattern for char in "*?["):
+        return [path] if path.exists() else []
+    anchor = Path(path.anchor) if path.is_absolute() else Path.cwd()
+    relative = path.relative_to(path.anchor).as_posix() if path.is_absolute() else pattern
+    return sorted(match for match in anchor.glob(relative) if match.is_dir())
+
+
+def _duplicate_pack_diagnostic(target: PackTarget, kept: PackTarget, root: Path) -> Diagnostic:
+    return Diagnostic(
+        code="PACK_ID_DUPLICATE",
+        rule="pack.discovery",
+        severity=Severity.WARN,
+        message=f"Duplicate pack id {target.pack_id}; keeping {_relative_path(kept.path, root)}",
+        location=FileLocation(_relative_path(target.path, root)),
+        details={"pack": target.pack_id},
+    )
+
+
+def _unmatched_pattern_diagnostic(pattern: str, reason: str) -> Diagnostic:
+    return Diagnostic(
+        code="PACK_PATTERN_UNMATCHED",
+        rule="pack.discovery",
+        severity=Severity.ERROR,
+        message=f"{pattern}: {reason}",
+        hint="Pass a pack directory, a directory of packs, or a glob matching either.",
+        details={"pattern": pattern},
+    )
+
+
+def _unmatched_reason(pattern: str, matches: list[Path]) -> str:
+    if matches:
+        return "no pack found"
+    path = Path(pattern).expanduser()
+    if any(char in pattern for char in "*?["):
+        return "no directory matches"
+    if not path.exists():
+        return "no such directory"
+    return "not a directory"
+
+
+def discover_packs(
+    patterns: list[str],
+    *,
+    bundled_root: Path | None = None,
+) -> tuple[list[PackTarget], list[Diagnostic]]:
+    root = _repo_root()
+    candidates: list[tuple[Path, PackSource]] = []
+    if bundled_root is not None:
+        candidates.extend((path, "bundled") for path in _pack_dirs(bundled_root))
+    diagnostics: list[Diagnostic] = []
+    for pattern in patterns:
+        matches = _expand_pattern(pattern)
+        found = len(candidates)
+        for match in matches:
+            if _is_pack_dir(match):
+                candidates.append((match, "local"))
+            elif match.is_dir():
+                candidates.extend((path, "local") for path in _pack_dirs(match))
+        if len(candidates) == found:
+            reason = _unmatched_reason(pattern, [m for m in matches if m.is_dir()])
+            diagnostics.append(_unmatched_pattern_diagnostic(pattern, reason))
+
+    by_id: dict[str, PackTarget] = {}
+    seen_paths: set[Path] = set()
+    for path, source in candidates:
+        resolved = path.resolve()
+        if resolved in seen_paths:
+            continue
+        seen_paths.add(resolved)
+        target = PackTarget(path=path, pack_id=_pack_id_for(path), source=source)
+        kept = by_id.get(target.pack_id)
+        if kept is not None:
+            diagnostics.append(_duplicate_pack_diagnostic(target, kept, root))
+            continue
+        by_id[target.pack_id] = target
+    return [by_id[pack_id] for pack_id in sorted(by_id)], diagnostics
+
+
 def _missing_file_diagnostic(path: Path, root: Path, filename: str) -> Diagnostic:
     return Diagnostic(
         code="PACK_FILE_MISSING",
@@ -141,107 +251,364 @@ def _render_failed_diagnostic(
     )
 
 
-def validate_bundled_packs(
-    packs_root: Path,
+SNAPSHOT_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class _RenderOptions:
+    render_on_validation_error: bool
+    render_enabled: bool
+    snapshot_dir: Path | None = None
+    update_snapshots: bool = False
+
+
+def _copier_version() -> str:
+    try:
+        return importlib.metadata.version("copier")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _iter_files(base: Path) -> list[tuple[str, Path]]:
+    files = [
+        (path.relative_to(base).as_posix(), path)
+        for path in base.rglob("*")
+        if path.is_file() and "__pycache__" not in path.parts
+    ]
+    return sorted(files)
+
+
+def _input_digest(pack_dir: Path, answers: dict[str, Any]) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"snapshot-format={SNAPSHOT_FORMAT}\0copier={_copier_version()}\0".encode())
+    digest.update(json.dumps(answers, sort_keys=True, default=str).encode())
+    for rel, path in _iter_files(pack_dir):
+        digest.update(b"\0" + rel.encode() + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def _output_manifest(output_dir: Path) -> dict[str, str]:
+    return {
+        rel: hashlib.sha256(path.read_bytes()).hexdigest()
+        for rel, path in _iter_files(output_dir)
+    }
+
+
+def _snapshot_path(snapshot_dir: Path, pack_id: str) -> Path:
+    return snapshot_dir / f"{pack_id}.json"
+
+
+def _load_snapshot(path: Path) -> dict[str, Any] | None:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(raw, dict):
+        return None
+    snapshot = cast(dict[str, Any], raw)
+    if snapshot.get("format") != SNAPSHOT_FORMAT or not isinstance(snapshot.get("files"), dict):
+        return None
+    return snapshot
+
+
+def _write_snapshot(path: Path, pack_id: str, input_digest: str, files: dict[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "pack_id": pack_id,
+        "input_digest": input_digest,
+        "files": dict(sorted(files.items())),
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def _snapshot_diagnostics(
+    pack_id: str, expected: dict[str, str], actual: dict[str, str]
+) -> list[Diagnostic]:
+    diagnostics: list[Diagnostic] = []
+    added = sorted(actual.keys() - expected.keys())
+    removed = sorted(expected.keys() - actual.keys())
+    changed = sorted(rel for rel in expected.keys() & actual.keys() if expected[rel] != actual[rel])
+    changes = [
+        *(("PACK_SNAPSHOT_FILE_ADDED", "added", rel) for rel in added),
+        *(("PACK_SNAPSHOT_FILE_REMOVED", "removed", rel) for rel in removed),
+        *(("PACK_SNAPSHOT_FILE_CHANGED", "changed", rel) for rel in changed),
+    ]
+    for code, change, rel in changes:
+        diagnostics.append(
+            Diagnostic(
+                code=code,
+                rule="pack.snapshot",
+                severity=Severity.ERROR,
+                message=f"Rendered file {change} compared to snapshot: {rel}",
+                location=FileLocation(rel),
+                hint="Review the render diff and rerun with --update-snapshots if intended.",
+                details={"pack": pack_id, "change": change},
+            )
+        )
+    return diagnostics
+
+
+def _snapshot_missing_diagnostic(path: Path, root: Path, pack_id: str) -> Diagnostic:
+    return Diagnostic(
+        code="PACK_SNAPSHOT_MISSING",
+        rule="pack.snapshot",
+        severity=Severity.WARN,
+        message=f"No render snapshot for pack {pack_id}",
+        location=FileLocation(_relative_path(path, root)),
+        hint="Run validate_packs with --update-snapshots to record one.",
+        details={"pack": pack_id},
+    )
+
+
+@dataclass
+class _PackOutcome:
+    diagnostics: list[Diagnostic]
+    artifact: dict[str, Any]
+    stdout: str = ""
+    stderr: str = ""
+
+
+def _validate_pack_dir(
+    pack_dir: Path,
+    root: Path,
+    engine: PackPolicyEngine,
+    renderer: CopierRenderer,
+    options: _RenderOptions,
+    source: PackSource = "bundled",
+) -> _PackOutcome:
+    pack_diags: list[Diagnostic] = []
+    missing: list[str] = []
+    if not (pack_dir / "pack.yaml").exists():
+        missing.append("pack.yaml")
+    if not (pack_dir / "copier.yml").exists():
+        missing.append("copier.yml")
+    for filename in missing:
+        pack_diags.append(_missing_file_diagnostic(pack_dir, root, filename))
+
+    manifest: dict[str, Any] = {}
+    pack_id = pack_dir.name
+    pack_version = "unknown"
+    if (pack_dir / "pack.yaml").exists():
+        manifest = pack_validator.load_manifest(pack_dir)
+        pack_id = str(manifest.get("id", pack_dir.name))
+        pack_version = str(manifest.get("version", "unknown"))
+    if not missing:
+        result = validate_pack(pack_dir, engine)
+        manifest = result.value or manifest
+        pack_diags.extend(result.diagnostics)
+    elif manifest:
+        pack_diags.extend(pack_validator.validate_manifest_schema(manifest))
+
+    has_validation_errors = any(
+        d.severity == Severity.ERROR for d in pack_diags if not d.is_execution
+    )
+    render_skipped = False
+    status = "passed"
+
+    if has_validation_errors:
+        status = "failed"
+
+    if not options.render_enabled:
+        render_skipped = True
+    elif has_validation_errors and not options.render_on_validation_error:
+        render_skipped = True
+
+    answers = _build_answers(manifest)
+    snapshot: dict[str, Any] | None = None
+    snapshot_info: dict[str, Any] | None = None
+    snapshot_path: Path | None = None
+    input_digest = ""
+    if options.snapshot_dir is not None and not render_skipped and not missing:
+        snapshot_path = _snapshot_path(options.snapshot_dir, pack_id)
+        input_digest = _input_digest(pack_dir, answers)
+        snapshot = _load_snapshot(snapshot_path)
+        snapshot_info = {"input_digest": input_digest, "status": "missing"}
+        if (
+            snapshot is not None
+            and not options.update_snapshots
+            and snapshot.get("input_digest") == input_digest
+        ):
+            render_skipped = True
+            snapshot_info["status"] = "hit"
+
+    stdout = stderr = ""
+    if not render_skipped and not missing:
+        with tempfile.TemporaryDirectory() as tempdir:
+            request = RenderRequest(
+                pack=PackRef(id=pack_id, version=pack_version, source=source),
+                pack_path=pack_dir,
+                staging_dir=Path(tempdir),
+                answers=answers,
+                allow_hooks=False,
+            )
+            out, err = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                try:
+                    renderer.render(request)
+                except RendererExecutionError as exc:
+                    pack_diags.append(_render_failed_diagnostic(pack_dir, root, pack_id, exc))
+                    status = "failed"
+            stdout, stderr = out.getvalue(), err.getvalue()
+            if snapshot_path is not None and snapshot_info is not None and status == "passed":
+                files = _output_manifest(Path(tempdir))
+                if options.update_snapshots:
+                    _write_snapshot(snapshot_path, pack_id, input_digest, files)
+                    snapshot_info["status"] = "updated"
+                elif snapshot is None:
+                    pack_diags.append(_snapshot_missing_diagnostic(snapshot_path, root, pack_id))
+                else:
+                    drift = _snapshot_diagnostics(pack_id, snapshot["files"], files)
+                    pack_diags.extend(drift)
+                    if drift:
+                        snapshot_info["status"] = "drift"
+                        status = "failed"
+                    else:
+                        # Same output from new inputs. Snapshots are only written with
+                        # --update-snapshots, so this pack renders again until then.
+                        snapshot_info["status"] = "matched"
+
+    artifact = {
+        "pack_id": pack_id,
+        "pack_version": pack_version,
+        "source": source,
+        "status": status,
+        "render_skipped": render_skipped,
+        "diagnostics": [_serialize_diagnostic(d) for d in pack_diags],
+    }
+    if snapshot_info is not None:
+        artifact["snapshot"] = snapshot_info
+    return _PackOutcome(diagnostics=pack_diags, artifact=artifact, stdout=stdout, stderr=stderr)
+
+
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(root: Path) -> None:
+    # Each worker process keeps one engine and renderer warm for every pack it
+    # handles, so the compiled schema and Copier imports are paid once.
+    pack_validator.SCHEMA_PATH = pack_validator.schema_path(root)
+    _worker_state["engine"] = PackPolicyEngine()
+    _worker_state["renderer"] = CopierRenderer()
+
+
+def _validate_pack_worker(target: PackTarget, root: Path, options: _RenderOptions) -> _PackOutcome:
+    return _validate_pack_dir(
+        target.path,
+        root,
+        _worker_state["engine"],
+        _worker_state["renderer"],
+        options,
+        target.source,
+    )
+
+
+def validate_pack_targets(
+    targets: list[PackTarget],
     *,
     render_on_validation_error: bool,
     render_enabled: bool,
     quiet: bool,
+    jobs: int = 1,
+    snapshot_dir: Path | None = None,
+    update_snapshots: bool = False,
 ) -> Result[dict[str, Any]]:
     root = _repo_root()
-    pack_validator.SCHEMA_PATH = pack_validator._schema_path(root)
-    engine = PackPolicyEngine()
-    renderer = CopierRenderer()
+    pack_validator.SCHEMA_PATH = pack_validator.schema_path(root)
+    options = _RenderOptions(
+        render_on_validation_error=render_on_validation_error,
+        render_enabled=render_enabled,
+        snapshot_dir=snapshot_dir,
+        update_snapshots=update_snapshots,
+    )
     diagnostics: list[Diagnostic] = []
     artifacts: list[dict[str, Any]] = []
 
-    for pack_dir in _pack_dirs(packs_root):
-        pack_diags: list[Diagnostic] = []
-        missing: list[str] = []
-        if not (pack_dir / "pack.yaml").exists():
-            missing.append("pack.yaml")
-        if not (pack_dir / "copier.yml").exists():
-            missing.append("copier.yml")
-        for filename in missing:
-            diag = _missing_file_diagnostic(pack_dir, root, filename)
-            pack_diags.append(diag)
-            diagnostics.append(diag)
-
-        manifest: dict[str, Any] = {}
-        pack_id = pack_dir.name
-        pack_version = "unknown"
-        if (pack_dir / "pack.yaml").exists():
-            manifest = pack_validator.load_manifest(pack_dir)
-            pack_id = str(manifest.get("id", pack_dir.name))
-            pack_version = str(manifest.get("version", "unknown"))
-        if not missing:
-            result = validate_pack(pack_dir, engine)
-            manifest = result.value or manifest
-            pack_diags.extend(result.diagnostics)
-            diagnostics.extend(result.diagnostics)
-        elif manifest:
-            schema_diags = pack_validator.validate_manifest_schema(manifest)
-            pack_diags.extend(schema_diags)
-            diagnostics.extend(schema_diags)
-
-        has_validation_errors = any(
-            d.severity == Severity.ERROR for d in pack_diags if not d.is_execution
-        )
-        render_skipped = False
-        status = "passed"
-
-        if has_validation_errors:
-            status = "failed"
-
-        if not render_enabled:
-            render_skipped = True
-        elif has_validation_errors and not render_on_validation_error:
-            render_skipped = True
-
-        if not render_skipped and not missing:
-            answers = _build_answers(manifest)
-            with tempfile.TemporaryDirectory() as tempdir:
-                request = RenderRequest(
-                    pack=PackRef(id=pack_id, version=pack_version, source="bundled"),
-                    pack_path=pack_dir,
-                    staging_dir=Path(tempdir),
-                    answers=answers,
-                    allow_hooks=False,
+    # Copier changes the process working directory while rendering, so packs
+    # can only render concurrently in separate processes, not threads.
+    if jobs > 1 and len(targets) > 1:
+        workers = min(jobs, len(targets))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(root,)
+        ) as pool:
+            outcomes = list(
+                pool.map(
+                    _validate_pack_worker,
+                    targets,
+                    [root] * len(targets),
+                    [options] * len(targets),
+                    chunksize=max(1, len(targets) // (workers * 4)),
                 )
-                try:
-                    if quiet:
-                        with open(os.devnull, "w", encoding="utf-8") as devnull:
-                            with contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(
-                                devnull
-                            ):
-                                renderer.render(request)
-                    else:
-                        renderer.render(request)
-                except RendererExecutionError as exc:
-                    diag = _render_failed_diagnostic(pack_dir, root, pack_id, exc)
-                    diagnostics.append(diag)
-                    pack_diags.append(diag)
-                    status = "failed"
-
-        artifacts.append(
-            {
-                "pack_id": pack_id,
-                "pack_version": pack_version,
-                "source": "bundled",
-                "status": status,
-                "render_skipped": render_skipped,
-                "diagnostics": [_serialize_diagnostic(d) for d in pack_diags],
-            }
-        )
+            )
+    else:
+        engine = PackPolicyEngine()
+        renderer = CopierRenderer()
+        outcomes = [
+            _validate_pack_dir(target.path, root, engine, renderer, options, target.source)
+            for target in targets
+        ]
+
+    for outcome in outcomes:
+        diagnostics.extend(outcome.diagnostics)
+        artifacts.append(outcome.artifact)
+        if not quiet:
+            sys.stdout.write(outcome.stdout)
+            sys.stderr.write(outcome.stderr)
 
     return Result(value=None, diagnostics=diagnostics, artifacts=artifacts)
 
 
+def validate_bundled_packs(
+    packs_root: Path,
+    *,
+    render_on_validation_error: bool,
+    render_enabled: bool,
+    quiet: bool,
+    jobs: int = 1,
+    snapshot_dir: Path | None = None,
+    update_snapshots: bool = False,
+) -> Result[dict[str, Any]]:
+    targets, discovery_diags = discover_packs([], bundled_root=packs_root)
+    result = validate_pack_targets(
+        targets,
+        render_on_validation_error=render_on_validation_error,
+        render_enabled=render_enabled,
+        quiet=quiet,
+        jobs=jobs,
+        snapshot_dir=snapshot_dir,
+        update_snapshots=update_snapshots,
+    )
+    result.diagnostics[:0] = discovery_diags
+    return result
+
+
 def _build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(description="Validate bundled Pantsagon packs")
+    parser = argparse.ArgumentParser(description="Validate Pantsagon packs")
+    parser.add_argument(
+        "packs",
+        nargs="*",
+        help="Pack directories, directories of packs, or glob patterns matching either",
+    )
     parser.add_argument("--bundled", action="store_true", help="Validate bundled packs")
     parser.add_argument("--json", action="store_true", help="Emit Result JSON")
     parser.add_argument("--quiet", action="store_true", help="Suppress Copier output")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Validate and render up to N packs concurrently (0 uses all CPUs)",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        type=Path,
+        help="Compare rendered output against per-pack snapshots stored in this directory",
+    )
+    parser.add_argument(
+        "--update-snapshots",
+        action="store_true",
+        help="Re-render every pack and rewrite its snapshot (requires --snapshot-dir)",
+    )
     render_group = parser.add_mutually_exclusive_group()
     render_group.add_argument(
         "--render-on-validation-error",
@@ -257,15 +624,25 @@ def _build_parser() -> argparse.ArgumentParser:
 def main(argv: list[str] | None = None) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
-    if not args.bundled:
-        parser.error("--bundled is required in v1")
-
-    result = validate_bundled_packs(
-        packs_root=_repo_root() / "packs",
+    if not args.bundled and not args.packs:
+        parser.error("pass --bundled and/or one or more pack paths")
+    if args.update_snapshots and args.snapshot_dir is None:
+        parser.error("--update-snapshots requires --snapshot-dir")
+
+    targets, discovery_diags = discover_packs(
+        args.packs,
+        bundled_root=_repo_root() / "packs" if args.bundled else None,
+    )
+    result = validate_pack_targets(
+        targets,
         render_on_validation_error=args.render_on_validation_error,
         render_enabled=not args.no_render,
         quiet=args.quiet or args.json,
+        jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1),
+        snapshot_dir=args.snapshot_dir,
+        update_snapshots=args.update_snapshots,
     )
+    result.diagnostics[:0] = discovery_diags
 
     if args.json:
         payload = {
@@ -277,9 +654,15 @@ def main(argv: list[str] | None = None) -> int:
         print(json.dumps(payload, sort_keys=is_deterministic()))
     else:
         failed = [a for a in result.artifacts if a.get("status") != "passed"]
-        print(f"Validated {len(result.artifacts)} bundled packs")
+        label = "packs" if args.packs else "bundled packs"
+        print(f"Validated {len(result.artifacts)} {label}")
         for artifact in result.artifacts:
-            print(f"- {artifact['pack_id']}: {artifact['status']}")
+            snapshot = artifact.get("snapshot")
+            suffix = f" (snapshot {snapshot['status']})" if snapshot else ""
+            print(f"- {artifact['pack_id']}: {artifact['status']}{suffix}")
+        for diag in discovery_diags:
+            label = "error" if diag.severity == Severity.ERROR else "warning"
+            print(f"{label}: {diag.message}")
         if failed:
             print(f"Failures: {len(failed)}")
 
@@ -0,0 +1,74 @@
+import shutil
+import subprocess
+
+import pytest
+
+from pantsagon.adapters.errors import PackFetchError
+from pantsagon.adapters.pack_catalog.git import GitPackCatalog
+from pantsagon.domain.pack import PackRef
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _pack_repo(tmp_path):
+    work = tmp_path / "work"
+    (work / "packs" / "demo").mkdir(parents=True)
+    (work / "packs" / "demo" / "pack.yaml").write_text("id: demo\nversion: 1.0.0\n")
+    _git(work, "init", "-q")
+    _git(work, "add", ".")
+    _git(work, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-qm", "v1")
+    _git(work, "tag", "v1")
+    bare = tmp_path / "packs.git"
+    subprocess.run(["git", "clone", "-q", "--bare", str(work), str(bare)], check=True)
+    return work, bare
+
+
+def test_git_catalog_exports_ref_into_commit_keyed_cache(tmp_path):
+    _, bare = _pack_repo(tmp_path)
+    catalog = GitPackCatalog(cache_root=tmp_path / "cache")
+    ref = PackRef(
+        id="demo",
+        version="1.0.0",
+        source="git",
+        location=str(bare),
+        git_ref="v1",
+        subdir="packs/demo",
+    )
+
+    path = catalog.get_pack_path(ref)
+
+    commit = _git(bare, "rev-parse", "v1")
+    assert path == tmp_path / "cache" / commit / "packs" / "demo"
+    assert catalog.load_manifest(path)["id"] == "demo"
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == [commit]
+
+
+def test_git_catalog_reuses_cached_commit_without_git(tmp_path):
+    _, bare = _pack_repo(tmp_path)
+    commit = _git(bare, "rev-parse", "HEAD")
+    GitPackCatalog(cache_root=tmp_path / "cache").get_pack_path(
+        PackRef(id="demo", version="1.0.0", source="git", location=str(bare))
+    )
+
+    offline = GitPackCatalog(cache_root=tmp_path / "cache", git=str(tmp_path / "no-git"))
+    assert offline.resolve_commit(bare, commit) == commit
+    path = offline.get_pack_path(
+        PackRef(id="demo", version="1.0.0", source="git", location=str(bare), commit=commit)
+    )
+    assert (path / "packs" / "demo" / "pack.yaml").exists()
+
+
+def test_git_catalog_raises_fetch_error_for_unknown_ref(tmp_path):
+    _, bare = _pack_repo(tmp_path)
+    catalog = GitPackCatalog(cache_root=tmp_path / "cache")
+    with pytest.raises(PackFetchError):
+        catalog.get_pack_path(
+            PackRef(id="demo", version="1.0.0", source="git", location=str(bare), git_ref="nope")
+        )
+    assert not any((tmp_path / "cache").glob("*"))
@@ -0,0 +1,71 @@
+import zipfile
+
+import pytest
+
+from pantsagon.adapters.errors import PackReadError
+from pantsagon.adapters.pack_archive.zip_archive import PackArchive, build_archive
+from pantsagon.adapters.pack_catalog.archive import ArchivePackCatalog
+from pantsagon.adapters.pack_store.content_store import ContentAddressedPackStore
+from pantsagon.adapters.pack_store.digest import tree_digest
+from pantsagon.domain.pack import PackRef
+
+
+def _pack(path):
+    (path / "templates" / "{{ service_name }}").mkdir(parents=True)
+    (path / "templates" / "empty").mkdir()
+    (path / "pack.yaml").write_text("id: acme.demo\nversion: 1.2.0\n")
+    (path / "copier.yml").write_text("_subdirectory: templates\n")
+    (path / "templates" / "{{ service_name }}" / "main.py.jinja").write_text("x = 1\n")
+    hook = path / "templates" / "run.sh"
+    hook.write_text("#!/bin/sh\n")
+    hook.chmod(0o755)
+    return path
+
+
+def test_build_archive_is_reproducible_zip(tmp_path):
+    pack = _pack(tmp_path / "pack")
+    first = build_archive(pack, tmp_path / "a.pantsagon-pack")
+    second = build_archive(pack, tmp_path / "b.pantsagon-pack")
+
+    assert first.path.read_bytes() == second.path.read_bytes()
+    assert (first.pack_id, first.version, first.files) == ("acme.demo", "1.2.0", 4)
+    assert first.digest == tree_digest(pack)
+    with zipfile.ZipFile(first.path) as archive:
+        assert archive.testzip() is None
+        assert "pack.yaml" in archive.namelist()
+
+
+def test_pack_archive_reads_members_without_extracting(tmp_path):
+    pack = _pack(tmp_path / "pack")
+    info = build_archive(pack, tmp_path / "demo.pantsagon-pack")
+
+    with PackArchive(info.path) as archive:
+        assert archive.manifest()["id"] == "acme.demo"
+        assert archive.read_text("templates/{{ service_name }}/main.py.jinja") == "x = 1\n"
+        with pytest.raises(PackReadError):
+            archive.read_bytes("missing.txt")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["demo.pantsagon-pack", "pack"]
+
+
+def test_pack_archive_rejects_plain_zip(tmp_path):
+    with zipfile.ZipFile(tmp_path / "plain.zip", "w") as archive:
+        archive.writestr("pack.yaml", "id: x\n")
+    with pytest.raises(PackReadError):
+        PackArchive(tmp_path / "plain.zip")
+
+
+def test_archive_catalog_unpacks_each_digest_once(tmp_path):
+    pack = _pack(tmp_path / "pack")
+    info = build_archive(pack, tmp_path / "demo.pantsagon-pack")
+    catalog = ArchivePackCatalog(ContentAddressedPackStore(tmp_path / "store"))
+    ref = PackRef(id="acme.demo", version="1.2.0", source="local", location=str(info.path))
+
+    path = catalog.get_pack_path(ref)
+    marker = (path / "pack.yaml").stat().st_mtime_ns
+
+    assert tree_digest(path) == info.digest
+    assert (path / "templates" / "run.sh").stat().st_mode & 0o111
+    assert (path / "templates" / "empty").is_dir()
+    assert catalog.get_pack_path(ref) == path
+    assert (path / "pack.yaml").stat().st_mtime_ns == marker
+    assert catalog.load_manifest(info.path)["version"] == "1.2.0"
@@ -0,0 +1,88 @@
+import os
+
+from pantsagon.adapters.pack_store.content_store import ContentAddressedPackStore
+from pantsagon.adapters.pack_store.digest import DigestEngine, tree_digest
+
+
+def _pack(root):
+    (root / "templates" / "docs").mkdir(parents=True)
+    (root / "pack.yaml").write_text("id: x.y\n")
+    (root / "templates" / "docs" / "README.md.jinja").write_text("Hello {{ name }}")
+    return root
+
+
+def test_tree_digest_tracks_content_and_layout_only(tmp_path):
+    first = _pack(tmp_path / "a")
+    second = _pack(tmp_path / "b")
+    (second / "templates" / "__pycache__").mkdir()
+    (second / "templates" / "__pycache__" / "x.pyc").write_bytes(b"junk")
+    os.utime(second / "pack.yaml", ns=(0, 0))
+    assert tree_digest(first) == tree_digest(second)
+    assert tree_digest(first).startswith("sha256:")
+
+    (second / "templates" / "docs" / "README.md.jinja").write_text("Hi {{ name }}")
+    assert tree_digest(first) != tree_digest(second)
+
+    readme = first / "templates" / "docs" / "README.md.jinja"
+    readme.rename(first / "templates" / "README.md.jinja")
+    assert tree_digest(first) != tree_digest(_pack(tmp_path / "c"))
+
+
+def test_store_put_and_get_snapshot(tmp_path):
+    store = ContentAddressedPackStore(tmp_path / "store")
+    pack = _pack(tmp_path / "pack")
+    digest = store.put(pack)
+
+    snapshot = store.get(digest)
+    assert snapshot is not None
+    assert tree_digest(snapshot) == digest
+    assert store.put(pack) == digest
+
+    (pack / "pack.yaml").write_text("id: x.z\n")
+    assert store.get(store.digest(pack)) is None
+    assert store.get("sha256:not-a-digest") is None
+    assert (snapshot / "pack.yaml").read_text() == "id: x.y\n"
+
+
+def _age(root, seconds=60):
+    for path in root.rglob("*"):
+        if path.is_file():
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_digest_engine_reuses_stat_cache(tmp_path):
+    pack = _pack(tmp_path / "pack")
+    for index in range(40):
+        (pack / "templates" / f"file_{index}.py.jinja").write_text(f"x = {index}\n")
+    _age(pack)
+    cache_path = tmp_path / "cache.json"
+
+    cold = DigestEngine(cache_path, jobs=4)
+    assert cold.digest(pack) == tree_digest(pack)
+    assert cold.hashed == 42
+
+    warm = DigestEngine(cache_path)
+    assert warm.digest(pack) == tree_digest(pack)
+    assert (warm.hashed, warm.reused) == (0, 42)
+
+    (pack / "templates" / "file_3.py.jinja").write_text("x = 'changed'\n")
+    assert warm.digest(pack) == tree_digest(pack)
+    assert warm.hashed == 1
+
+
+def test_digest_engine_does_not_cache_racy_files(tmp_path):
+    pack = _pack(tmp_path / "pack")
+    engine = DigestEngine(tmp_path / "cache.json")
+    engine.digest(pack)
+    engine.digest(pack)
+    assert engine.reused == 0
+    assert engine.hashed == 4
+
+
+def test_digest_engine_survives_an_unwritable_cache(tmp_path):
+    pack = _pack(tmp_path / "pack")
+    _age(pack)
+    (tmp_path / "not-a-dir").write_text("")
+    engine = DigestEngine(tmp_path / "not-a-dir" / "cache.json")
+    assert engine.digest(pack) == tree_digest(pack)
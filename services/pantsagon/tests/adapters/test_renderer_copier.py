@@ -2,6 +2,7 @@ import importlib.util
 
 import pytest
 
+from pantsagon.adapters.io_metrics import IOMetrics
 from pantsagon.adapters.renderer.copier_renderer import CopierRenderer
 from pantsagon.domain.pack import PackRef
 from pantsagon.ports.renderer import RenderRequest
@@ -33,3 +34,60 @@ def test_copier_renders_template(tmp_path):
     )
     CopierRenderer().render(req)
     assert (out / "README.md").read_text() == "Hello World"
+
+
+def test_copier_renderer_counts_io(tmp_path):
+    pack = tmp_path / "pack"
+    (pack / "templates" / "docs").mkdir(parents=True)
+    (pack / "copier.yml").write_text(
+        "name: {type: str}\n_templates_suffix: '.jinja'\n_subdirectory: 'templates'\n"
+    )
+    (pack / "templates" / "README.md.jinja").write_text("Hello {{ name }}")
+    (pack / "templates" / "docs" / "index.md.jinja").write_text("Docs for {{ name }}")
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "README.md").write_text("old")
+    metrics = IOMetrics()
+    req = RenderRequest(
+        pack=PackRef(id="x", version="1.0.0", source="local"),
+        pack_path=pack,
+        staging_dir=out,
+        answers={"name": "World"},
+        allow_hooks=False,
+    )
+    CopierRenderer(metrics=metrics).render(req)
+    snapshot = metrics.snapshot()
+    assert snapshot["files_created"] == 1
+    assert snapshot["files_overwritten"] == 1
+    assert snapshot["dirs_created"] == 1
+    assert snapshot["bytes_written"] == len("Hello World") + len("Docs for World")
+
+
+def test_render_files_matches_copier_output(tmp_path):
+    pack = tmp_path / "pack"
+    (pack / "templates" / "{{ name }}").mkdir(parents=True)
+    (pack / "copier.yml").write_text(
+        "name: {type: str, default: world}\n"
+        "greeting: {type: str, default: 'Hello {{ name }}'}\n"
+        "_templates_suffix: '.jinja'\n_subdirectory: 'templates'\n"
+    )
+    (pack / "templates" / "{{ name }}" / "README.md.jinja").write_text("{{ greeting }}!\n")
+    (pack / "templates" / "{{ name }}" / "raw.txt").write_text("{{ untouched }}\n")
+    out = tmp_path / "out"
+    out.mkdir()
+    renderer = CopierRenderer()
+    renderer.render(
+        RenderRequest(
+            pack=PackRef(id="x", version="1.0.0", source="local"),
+            pack_path=pack,
+            staging_dir=out,
+            answers={},
+            allow_hooks=False,
+        )
+    )
+
+    rendered = renderer.render_files(pack, {}, renderer.template_map(pack, {}))
+
+    assert {path.as_posix() for path in rendered} == {"world/README.md", "world/raw.txt"}
+    for path, data in rendered.items():
+        assert (out / path).read_bytes() == data
@@ -0,0 +1,50 @@
+import itertools
+import threading
+
+from pantsagon.adapters.tracing.span_recorder import SpanRecorder
+from pantsagon.application.tracing import span
+
+
+def test_recorder_builds_nested_timing_tree():
+    ticks = itertools.count()
+    recorder = SpanRecorder(clock=lambda: float(next(ticks)))
+    with recorder.span("init"):
+        with span(recorder, "validate_pack", pack="pantsagon.core"):
+            pass
+        with span(recorder, "commit"):
+            pass
+
+    artifact = recorder.artifact()
+    assert artifact["kind"] == "timing"
+    (root,) = artifact["spans"]
+    assert root["name"] == "init"
+    assert root["duration_ms"] == 5000.0
+    assert [child["name"] for child in root["children"]] == ["validate_pack", "commit"]
+    assert root["children"][0]["attrs"] == {"pack": "pantsagon.core"}
+    assert "validate_pack [pack=pantsagon.core]" in recorder.format_tree()
+
+
+def test_span_helper_is_noop_without_tracer():
+    with span(None, "anything"):
+        pass
+
+
+def test_chrome_trace_puts_threads_in_separate_lanes():
+    recorder = SpanRecorder()
+    with recorder.span("init"):
+        worker = threading.Thread(target=_render, args=(recorder,), name="render-1")
+        worker.start()
+        worker.join()
+
+    events = recorder.chrome_trace()["traceEvents"]
+    complete = {event["name"]: event for event in events if event["ph"] == "X"}
+    lanes = {event["args"]["name"]: event["tid"] for event in events if event["ph"] == "M"}
+    assert set(complete) == {"init", "render_pack"}
+    assert complete["render_pack"]["args"] == {"pack": "pantsagon.core"}
+    assert lanes["render-1"] == complete["render_pack"]["tid"]
+    assert complete["init"]["tid"] != complete["render_pack"]["tid"]
+
+
+def _render(recorder: SpanRecorder) -> None:
+    with recorder.span("render_pack", pack="pantsagon.core"):
+        pass
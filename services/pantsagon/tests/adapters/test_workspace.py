@@ -1,3 +1,5 @@
+from pantsagon.adapters.io_metrics import IOMetrics
+from pantsagon.adapters.tracing.span_recorder import SpanRecorder
 from pantsagon.adapters.workspace.filesystem import FilesystemWorkspace
 
 
@@ -7,3 +9,46 @@ def test_workspace_commit_writes_files(tmp_path):
     (stage / "hello.txt").write_text("hi")
     ws.commit(stage)
     assert (tmp_path / "hello.txt").read_text() == "hi"
+
+
+def test_workspace_commit_traces_file_writes(tmp_path):
+    recorder = SpanRecorder()
+    (tmp_path / "existing.txt").write_text("old")
+    ws = FilesystemWorkspace(tmp_path, tracer=recorder)
+    stage = ws.begin_transaction()
+    (stage / "existing.txt").write_text("new")
+    (stage / "fresh.txt").write_text("hi")
+    ws.commit(stage)
+    names = sorted((span.name, span.attrs["path"]) for span in recorder.roots)
+    assert names == [
+        ("backup_file", "existing.txt"),
+        ("write_file", "existing.txt"),
+        ("write_file", "fresh.txt"),
+    ]
+
+
+def test_workspace_commit_counts_io(tmp_path):
+    (tmp_path / "existing.txt").write_text("old")
+    ws = FilesystemWorkspace(tmp_path, metrics=IOMetrics())
+    stage = ws.begin_transaction()
+    (stage / "existing.txt").write_text("new!")
+    (stage / "pkg" / "sub").mkdir(parents=True)
+    (stage / "pkg" / "sub" / "mod.py").write_text("x = 1\n")
+    ws.commit(stage)
+    assert ws.metrics is not None
+    assert ws.metrics.snapshot() == {
+        "files_created": 1,
+        "files_overwritten": 1,
+        "bytes_written": 4 + 6,
+        "bytes_backed_up": 3,
+        "dirs_created": 2,
+        "files_unchanged": 0,
+    }
+
+
+def test_workspace_collects_no_metrics_by_default(tmp_path):
+    ws = FilesystemWorkspace(tmp_path)
+    stage = ws.begin_transaction()
+    (stage / "hello.txt").write_text("hi")
+    ws.commit(stage)
+    assert ws.metrics is None
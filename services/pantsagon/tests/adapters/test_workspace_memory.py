@@ -0,0 +1,41 @@
+from pantsagon.adapters.io_metrics import IOMetrics
+from pantsagon.adapters.workspace.memory import MemoryWorkspace
+
+
+def test_memory_workspace_commit_buffers_files(tmp_path):
+    (tmp_path / "existing.txt").write_text("old")
+    (tmp_path / "same.txt").write_text("same")
+    ws = MemoryWorkspace(tmp_path)
+    stage = ws.begin_transaction()
+    (stage / "existing.txt").write_text("new")
+    (stage / "same.txt").write_text("same")
+    (stage / "pkg").mkdir()
+    (stage / "pkg" / "mod.py").write_text("x = 1\n")
+    ws.commit(stage)
+
+    assert not stage.exists()
+    assert ws.files == {"existing.txt": b"new", "same.txt": b"same", "pkg/mod.py": b"x = 1\n"}
+    assert (tmp_path / "existing.txt").read_text() == "old"
+    assert not (tmp_path / "pkg").exists()
+    assert [(op["path"], op["action"]) for op in ws.planned_operations()] == [
+        ("existing.txt", "overwrite"),
+        ("pkg/mod.py", "create"),
+        ("same.txt", "unchanged"),
+    ]
+
+
+def test_memory_workspace_flush_writes_in_one_pass(tmp_path):
+    (tmp_path / "existing.txt").write_text("old")
+    ws = MemoryWorkspace(tmp_path, metrics=IOMetrics())
+    ws.files = {"existing.txt": b"new!", "pkg/sub/a.py": b"a", "pkg/sub/b.py": b"bb"}
+    ws.flush()
+
+    assert ws.files == {}
+    assert (tmp_path / "existing.txt").read_text() == "new!"
+    assert (tmp_path / "pkg" / "sub" / "b.py").read_text() == "bb"
+    assert ws.metrics is not None
+    snapshot = ws.metrics.snapshot()
+    assert snapshot["files_created"] == 2
+    assert snapshot["files_overwritten"] == 1
+    assert snapshot["bytes_written"] == 4 + 1 + 2
+    assert snapshot["dirs_created"] == 1
@@ -1,15 +1,20 @@
 import importlib.util
+import json
 from pathlib import Path
 import os
 
 import pytest
 
+from pantsagon.adapters.io_metrics import IOMetrics
 from pantsagon.adapters.policy import pack_validator
 from pantsagon.adapters.policy.pack_validator import PackPolicyEngine
 from pantsagon.adapters.renderer.copier_renderer import CopierRenderer
 from pantsagon.adapters.workspace.filesystem import FilesystemWorkspace
 from pantsagon.application.add_service import add_service
+from pantsagon.application.render_manifest import write_manifest
 from pantsagon.application.repo_lock import read_lock, write_lock
+from pantsagon.application.service_index import read_repo_manifest
+from pantsagon.domain.render_manifest import RenderManifest
 
 
 pytestmark = pytest.mark.skipif(
@@ -20,7 +25,7 @@ pytestmark = pytest.mark.skipif(
 
 def _repo_root() -> Path:
     for parent in Path(__file__).resolve().parents:
-        if (parent / "packs").is_dir():
+        if (parent / "packs" / "_index.json").is_file():
             return parent
     raise RuntimeError("Could not locate repo root")
 
@@ -55,7 +60,7 @@ def _base_lock(repo_path: Path) -> dict:
 def test_add_service_renders_scoped_files(tmp_path, monkeypatch):
     repo_root = _repo_root()
     monkeypatch.setenv("PANTS_BUILDROOT", str(repo_root))
-    pack_validator.SCHEMA_PATH = pack_validator._schema_path(repo_root)
+    pack_validator.SCHEMA_PATH = pack_validator.schema_path(repo_root)
     write_lock(tmp_path / ".pantsagon.toml", _base_lock(tmp_path))
 
     result = add_service(
@@ -95,7 +100,7 @@ def test_add_service_renders_scoped_files(tmp_path, monkeypatch):
 def test_add_service_skips_openapi_readme_if_present(tmp_path, monkeypatch):
     repo_root = _repo_root()
     monkeypatch.setenv("PANTS_BUILDROOT", str(repo_root))
-    pack_validator.SCHEMA_PATH = pack_validator._schema_path(repo_root)
+    pack_validator.SCHEMA_PATH = pack_validator.schema_path(repo_root)
     write_lock(tmp_path / ".pantsagon.toml", _base_lock(tmp_path))
     readme_path = tmp_path / "shared" / "contracts" / "openapi" / "README.md"
     readme_path.parent.mkdir(parents=True, exist_ok=True)
@@ -111,3 +116,160 @@ def test_add_service_skips_openapi_readme_if_present(tmp_path, monkeypatch):
     )
     assert not [d for d in result.diagnostics if d.severity.value == "error"]
     assert readme_path.read_text() == "keep"
+
+
+def test_add_service_renders_each_generated_byte_once(tmp_path, monkeypatch):
+    repo_root = _repo_root()
+    monkeypatch.setenv("PANTS_BUILDROOT", str(repo_root))
+    pack_validator.SCHEMA_PATH = pack_validator.schema_path(repo_root)
+    write_lock(tmp_path / ".pantsagon.toml", _base_lock(tmp_path))
+    renderer = CopierRenderer(metrics=IOMetrics())
+
+    result = add_service(
+        repo_path=tmp_path,
+        name="monitor-cost",
+        lang="python",
+        renderer_port=renderer,
+        policy_engine=PackPolicyEngine(),
+        workspace=FilesystemWorkspace(tmp_path),
+    )
+    assert not [d for d in result.diagnostics if d.severity.value == "error"]
+
+    generated = [
+        path
+        for path in tmp_path.rglob("*")
+        if path.is_file() and ".pantsagon" not in path.relative_to(tmp_path).parts[0]
+    ]
+    snapshot = renderer.metrics.snapshot()
+    assert snapshot["files_created"] == len(generated)
+    assert snapshot["bytes_written"] == sum(path.stat().st_size for path in generated)
+
+
+def test_add_service_sharded_lock_writes_a_fragment(tmp_path, monkeypatch):
+    repo_root = _repo_root()
+    monkeypatch.setenv("PANTS_BUILDROOT", str(repo_root))
+    pack_validator.SCHEMA_PATH = pack_validator.schema_path(repo_root)
+    lock = _base_lock(tmp_path)
+    lock["settings"]["lock_layout"] = "sharded"
+    write_lock(tmp_path / ".pantsagon.toml", lock)
+
+    for name in ("billing", "monitor-cost"):
+        result = add_service(
+            repo_path=tmp_path,
+            name=name,
+            lang="python",
+            renderer_port=CopierRenderer(),
+            policy_engine=PackPolicyEngine(),
+            workspace=FilesystemWorkspace(tmp_path),
+        )
+        assert not [d for d in result.diagnostics if d.severity.value == "error"]
+    lock_text = (tmp_path / ".pantsagon.toml").read_text()
+
+    fragment = tmp_path / ".pantsagon" / "services" / "monitor-cost.toml"
+    assert fragment.read_text() == (
+        'name = "monitor-cost"\npackage = "monitor_cost"\nlang = "python"\n'
+    )
+    assert (tmp_path / "services" / "monitor-cost" / "src" / "monitor_cost").is_dir()
+    lock = read_lock(tmp_path / ".pantsagon.toml").value
+    assert lock["selection"]["services"] == []
+    assert lock["resolved"]["answers"] == {"repo_name": tmp_path.name}
+
+    result = add_service(repo_path=tmp_path, name="billing", lang="python")
+    assert [d.code for d in result.diagnostics] == ["SERVICE_EXISTS"]
+    assert (tmp_path / ".pantsagon.toml").read_text() == lock_text
+
+
+class _RacingWorkspace(FilesystemWorkspace):
+    """Runs another add-service between this one's render plan and its commit."""
+
+    def __init__(self, root: Path, race) -> None:
+        super().__init__(root)
+        self.race = race
+
+    def begin_transaction(self) -> Path:
+        race, self.race = self.race, None
+        if race is not None:
+            race()
+        return super().begin_transaction()
+
+
+def test_add_service_merges_a_concurrent_add(tmp_path, monkeypatch):
+    repo_root = _repo_root()
+    monkeypatch.setenv("PANTS_BUILDROOT", str(repo_root))
+    pack_validator.SCHEMA_PATH = pack_validator.schema_path(repo_root)
+    write_lock(tmp_path / ".pantsagon.toml", _base_lock(tmp_path))
+
+    def add(name: str, workspace: FilesystemWorkspace):
+        return add_service(
+            repo_path=tmp_path,
+            name=name,
+            lang="python",
+            renderer_port=CopierRenderer(),
+            policy_engine=PackPolicyEngine(),
+            workspace=workspace,
+        )
+
+    other = []
+    workspace = _RacingWorkspace(
+        tmp_path, lambda: other.append(add("billing", FilesystemWorkspace(tmp_path)))
+    )
+    result = add("monitor-cost", workspace)
+
+    for item in (other[0], result):
+        assert not [d for d in item.diagnostics if d.severity.value == "error"]
+    lock = read_lock(tmp_path / ".pantsagon.toml").value
+    assert lock["selection"]["services"] == ["billing", "monitor-cost"]
+    assert lock["resolved"]["answers"]["service_packages"] == {
+        "billing": "billing",
+        "monitor-cost": "monitor_cost",
+    }
+    assert lock["resolved"]["answers"]["service_name"] == "monitor-cost"
+    manifest = json.loads((tmp_path / ".pantsagon" / "manifest.json").read_text())
+    assert "services/billing/Dockerfile" in manifest["files"]
+    assert "services/monitor-cost/Dockerfile" in manifest["files"]
+
+    racing = _RacingWorkspace(
+        tmp_path, lambda: other.append(add("orders", FilesystemWorkspace(tmp_path)))
+    )
+    result = add("orders", racing)
+    assert [d.code for d in result.diagnostics] == ["SERVICE_EXISTS"]
+
+
+def test_sharded_adds_from_the_same_base_leave_shared_files_alone(tmp_path, monkeypatch):
+    repo_root = _repo_root()
+    monkeypatch.setenv("PANTS_BUILDROOT", str(repo_root))
+    pack_validator.SCHEMA_PATH = pack_validator.schema_path(repo_root)
+    lock = _base_lock(tmp_path)
+    lock["settings"]["lock_layout"] = "sharded"
+    write_lock(tmp_path / ".pantsagon.toml", lock)
+    write_manifest(tmp_path / ".pantsagon" / "manifest.json", RenderManifest())
+    shared_paths = (".pantsagon.toml", ".pantsagon/manifest.json")
+    shared = {rel: (tmp_path / rel).read_bytes() for rel in shared_paths}
+
+    def add(name: str, workspace: FilesystemWorkspace):
+        return add_service(
+            repo_path=tmp_path,
+            name=name,
+            lang="python",
+            renderer_port=CopierRenderer(),
+            policy_engine=PackPolicyEngine(),
+            workspace=workspace,
+        )
+
+    other = []
+    workspace = _RacingWorkspace(
+        tmp_path, lambda: other.append(add("billing", FilesystemWorkspace(tmp_path)))
+    )
+    result = add("monitor-cost", workspace)
+
+    for item in (other[0], result):
+        assert not [d for d in item.diagnostics if d.severity.value == "error"]
+    assert {rel: (tmp_path / rel).read_bytes() for rel in shared} == shared
+    for name in ("billing", "monitor-cost"):
+        shard = tmp_path / ".pantsagon" / "services" / f"{name}.manifest.json"
+        files = json.loads(shard.read_text())["files"]
+        assert f"services/{name}/Dockerfile" in files
+        assert not [rel for rel in files if rel.startswith("services/") and name not in rel]
+    manifest = read_repo_manifest(tmp_path, read_lock(tmp_path / ".pantsagon.toml").value).value
+    assert "services/billing/Dockerfile" in manifest.files
+    assert "services/monitor-cost/Dockerfile" in manifest.files
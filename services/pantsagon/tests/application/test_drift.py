@@ -0,0 +1,163 @@
+import importlib.util
+import shutil
+from pathlib import Path
+
+import pytest
+
+from pantsagon.adapters.pack_store.content_store import ContentAddressedPackStore
+from pantsagon.adapters.policy import pack_validator
+from pantsagon.adapters.policy.pack_validator import PackPolicyEngine
+from pantsagon.adapters.renderer.copier_renderer import CopierRenderer
+from pantsagon.adapters.workspace.filesystem import FilesystemWorkspace
+from pantsagon.application.add_service import add_service
+from pantsagon.application.drift import detect_drift
+from pantsagon.application.repo_lock import write_lock
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("copier") is None,
+    reason="copier not installed",
+)
+
+README = Path("services/billing/README.md")
+DOMAIN_INIT = Path("services/billing/src/billing/domain/__init__.py")
+README_TEMPLATE = Path("templates/services/{{ service_name }}/README.md.jinja")
+
+
+def _repo_root() -> Path:
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "packs" / "_index.json").is_file():
+            return parent
+    raise RuntimeError("Could not locate repo root")
+
+
+@pytest.fixture(autouse=True)
+def schema_path(monkeypatch):
+    monkeypatch.setattr(pack_validator, "SCHEMA_PATH", pack_validator.schema_path(_repo_root()))
+    monkeypatch.setenv("PANTS_BUILDROOT", str(_repo_root()))
+
+
+def _include_partial(pack: Path) -> None:
+    """Have the README template include a file the pack does not render itself."""
+    (pack / "partials").mkdir()
+    (pack / "partials" / "note.md").write_text("NOTE v1\n")
+    template = pack / README_TEMPLATE
+    template.write_text(template.read_text() + '\n{% include "partials/note.md" %}')
+
+
+def _repo_with_service(tmp_path: Path, partial: bool = False) -> Path:
+    repo = tmp_path / "repo"
+    shutil.copytree(_repo_root() / "packs" / "python", repo / "packs" / "python")
+    if partial:
+        _include_partial(repo / "packs" / "python")
+    write_lock(
+        repo / ".pantsagon.toml",
+        {
+            "tool": {"name": "pantsagon", "version": "1.0.0"},
+            "settings": {"renderer": "copier", "strict": False, "allow_hooks": False},
+            "selection": {"languages": ["python"], "features": [], "services": []},
+            "resolved": {
+                "packs": [
+                    {
+                        "id": "pantsagon.python",
+                        "version": "1.0.0",
+                        "source": "local",
+                        "location": "packs/python",
+                    }
+                ],
+                "answers": {"repo_name": "repo"},
+            },
+        },
+    )
+    result = add_service(
+        repo,
+        name="billing",
+        lang="python",
+        renderer_port=CopierRenderer(),
+        policy_engine=PackPolicyEngine(),
+        workspace=FilesystemWorkspace(repo),
+        pack_store=ContentAddressedPackStore(tmp_path / "store"),
+    )
+    assert not [d for d in result.diagnostics if d.severity.value == "error"]
+    return repo
+
+
+class _CountingRenderer(CopierRenderer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.rendered: list[Path] = []
+
+    def render(self, request):
+        raise AssertionError("drift must not render to disk")
+
+    def render_files(self, pack_path, answers, templates):
+        self.rendered.extend(templates)
+        return super().render_files(pack_path, answers, templates)
+
+
+def _drift(repo: Path, tmp_path: Path, renderer: CopierRenderer | None = None, **kwargs):
+    return detect_drift(
+        repo,
+        renderer_port=renderer or _CountingRenderer(),
+        pack_store=ContentAddressedPackStore(tmp_path / "store"),
+        **kwargs,
+    )
+
+
+def _artifact(result) -> dict:
+    return next(a for a in result.artifacts if a["kind"] == "drift")
+
+
+def test_drift_on_clean_repo_renders_nothing(tmp_path):
+    repo = _repo_with_service(tmp_path)
+    renderer = _CountingRenderer()
+
+    result = _drift(repo, tmp_path, renderer)
+
+    assert result.diagnostics == []
+    assert _artifact(result)["files_checked"] == 11
+    assert renderer.rendered == []
+
+
+def test_drift_reports_edited_and_missing_files(tmp_path):
+    repo = _repo_with_service(tmp_path)
+    (repo / README).write_text("edited\n")
+    (repo / DOMAIN_INIT).unlink()
+
+    result = _drift(repo, tmp_path, jobs=4)
+
+    assert [(d.code, d.location.path) for d in result.diagnostics] == [
+        ("DRIFT_FILE_MODIFIED", README.as_posix()),
+        ("DRIFT_FILE_MISSING", DOMAIN_INIT.as_posix()),
+    ]
+    assert result.exit_code == 0
+    assert _drift(repo, tmp_path, strict=True).exit_code == 2
+
+
+def test_drift_renders_only_changed_templates(tmp_path):
+    repo = _repo_with_service(tmp_path)
+    template = repo / "packs" / "python" / README_TEMPLATE
+    template.write_text(template.read_text().replace("Hexagonal layers:", "Layers:"))
+    before = (repo / README).read_text()
+    renderer = _CountingRenderer()
+
+    result = _drift(repo, tmp_path, renderer)
+
+    assert renderer.rendered == [README]
+    assert [d.code for d in result.diagnostics] == ["DRIFT_FILE_OUTDATED"]
+    assert _artifact(result)["files"] == [
+        {"path": README.as_posix(), "pack": "pantsagon.python", "status": "outdated"}
+    ]
+    assert (repo / README).read_text() == before
+
+
+def test_drift_sees_changes_to_an_included_partial(tmp_path):
+    repo = _repo_with_service(tmp_path, partial=True)
+    (repo / "packs" / "python" / "partials" / "note.md").write_text("NOTE v2\n")
+    renderer = _CountingRenderer()
+
+    result = _drift(repo, tmp_path, renderer)
+
+    assert len(renderer.rendered) == 11
+    assert _artifact(result)["files"] == [
+        {"path": README.as_posix(), "pack": "pantsagon.python", "status": "outdated"}
+    ]
@@ -0,0 +1,123 @@
+import hashlib
+import tomllib
+from pathlib import Path
+from typing import Any
+
+import tomli_w
+
+from pantsagon.application.add_service import _locked_pack_path
+from pantsagon.application.init_repo import init_repo
+from pantsagon.application.validate_repo import validate_repo
+from pantsagon.domain.diagnostics import Diagnostic, Severity
+from pantsagon.domain.result import Result
+
+
+class _Store:
+    def __init__(self) -> None:
+        self.puts: list[Path] = []
+
+    def digest(self, pack_path: Path) -> str:
+        content = (pack_path / "pack.yaml").read_bytes()
+        return f"sha256:{hashlib.sha256(content).hexdigest()}"
+
+    def put(self, pack_path: Path) -> str:
+        self.puts.append(pack_path)
+        return self.digest(pack_path)
+
+    def get(self, digest: str) -> Path | None:
+        return None
+
+
+class _Engine:
+    def __init__(self) -> None:
+        self.validated: list[Path] = []
+
+    def validate_pack(self, pack_path: Path) -> Result[dict[str, Any]]:
+        self.validated.append(pack_path)
+        warning = Diagnostic(
+            code="COPIER_DEFAULT_MISMATCH",
+            rule="pack.variables",
+            severity=Severity.WARN,
+            message=f"Default differs in {pack_path.name}",
+        )
+        return Result(value={}, diagnostics=[warning])
+
+    def validate_repo(self, repo_path: Path) -> Result[None]:
+        return Result()
+
+
+def _init(repo: Path, store: _Store) -> dict:
+    init_repo(
+        repo_path=repo,
+        languages=["python"],
+        services=["svc"],
+        features=[],
+        renderer="copier",
+        pack_store=store,
+    )
+    (repo / "services" / "svc").mkdir(parents=True, exist_ok=True)
+    for layer in ("domain", "ports", "application", "adapters", "entrypoints"):
+        (repo / "services" / "svc" / layer).mkdir(exist_ok=True)
+    return tomllib.loads((repo / ".pantsagon.toml").read_text(encoding="utf-8"))
+
+
+def test_init_records_pack_digests(tmp_path):
+    store = _Store()
+    lock = _init(tmp_path, store)
+    packs = lock["resolved"]["packs"]
+    assert len(store.puts) == len(packs)
+    assert all(pack["digest"].startswith("sha256:") for pack in packs)
+
+
+def test_validate_still_checks_unchanged_packs(tmp_path):
+    store = _Store()
+    lock = _init(tmp_path, store)
+    engine = _Engine()
+
+    result = validate_repo(tmp_path, policy_engine=engine, pack_store=store)
+    packs = lock["resolved"]["packs"]
+    assert len(engine.validated) == len(packs)
+    warnings = [d for d in result.diagnostics if d.code == "COPIER_DEFAULT_MISMATCH"]
+    assert len(warnings) == len(packs)
+    assert not [d for d in result.diagnostics if d.code == "PACK_DIGEST_MISMATCH"]
+
+
+def test_validate_reports_changed_pack(tmp_path):
+    store = _Store()
+    _init(tmp_path, store)
+    lock_path = tmp_path / ".pantsagon.toml"
+    lock = tomllib.loads(lock_path.read_text(encoding="utf-8"))
+    lock["resolved"]["packs"][0]["digest"] = "sha256:" + "0" * 64
+    lock_path.write_text(tomli_w.dumps(lock), encoding="utf-8")
+    engine = _Engine()
+
+    result = validate_repo(tmp_path, policy_engine=engine, pack_store=store)
+    mismatches = [d for d in result.diagnostics if d.code == "PACK_DIGEST_MISMATCH"]
+    assert len(mismatches) == 1
+    assert mismatches[0].details["pack"] == lock["resolved"]["packs"][0]["id"]
+    assert len(engine.validated) == len(lock["resolved"]["packs"])
+
+    strict = validate_repo(tmp_path, strict=True, policy_engine=engine, pack_store=store)
+    assert strict.exit_code == 2
+
+
+def test_add_service_warns_when_rendering_a_locked_snapshot(tmp_path):
+    pack = tmp_path / "pack"
+    pack.mkdir()
+    (pack / "pack.yaml").write_text("id: x\n")
+    snapshot = tmp_path / "snapshot"
+
+    class _SnapshotStore(_Store):
+        def get(self, digest: str) -> Path | None:
+            return snapshot
+
+    store = _SnapshotStore()
+    recorded = "sha256:" + "0" * 64
+    entry = {"id": "x", "digest": recorded}
+    path, verified, diagnostics = _locked_pack_path(entry, pack, store, None)
+
+    assert (path, verified) == (snapshot, True)
+    [warning] = diagnostics
+    assert (warning.code, warning.severity.value) == ("PACK_LOCKED_SNAPSHOT_USED", "warn")
+    assert recorded in warning.message and store.digest(pack) in warning.message
+    assert "pantsagon upgrade" in (warning.hint or "")
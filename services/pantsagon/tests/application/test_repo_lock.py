@@ -1,6 +1,34 @@
+import os
 import tomllib
 
-from pantsagon.application.repo_lock import read_lock, write_lock
+import pytest
+
+from pantsagon.application import repo_lock
+from pantsagon.application.repo_lock import LockRepository, read_lock, write_lock
+
+LOCK_TEXT = """\
+# Managed by pantsagon; comments are kept.
+[tool]
+name = "pantsagon"
+version = "1.0.0"
+
+[selection]  # what the repo was generated with
+languages = ["python"]
+services = [
+    "billing",
+]
+
+[resolved]
+packs = [
+    { id = "pantsagon.python", version = "1.0.0", source = "bundled" },
+]
+
+[resolved.answers]
+repo_name = "demo"
+
+[resolved.answers.service_packages]
+billing = "billing"
+"""
 
 
 def test_read_lock_missing(tmp_path):
@@ -33,3 +61,91 @@ def test_write_lock_roundtrip(tmp_path):
     parsed = tomllib.loads(path.read_text(encoding="utf-8"))
     assert parsed["tool"]["name"] == "pantsagon"
     assert parsed["resolved"]["packs"][0]["id"] == "pantsagon.core"
+
+
+def test_lock_repository_caches_parse_by_stat(tmp_path, monkeypatch):
+    path = tmp_path / ".pantsagon.toml"
+    path.write_text(LOCK_TEXT, encoding="utf-8")
+    repository = LockRepository(path)
+    first = repository.read().value
+    first["selection"]["services"].append("mutated")
+
+    parses = []
+    real_loads = repo_lock.tomllib.loads
+    monkeypatch.setattr(
+        repo_lock.tomllib, "loads", lambda text: parses.append(text) or real_loads(text)
+    )
+    assert repository.read().value["selection"]["services"] == ["billing"]
+    assert parses == []
+
+    path.write_text(LOCK_TEXT.replace('"demo"', '"other"'), encoding="utf-8")
+    assert repository.read().value["resolved"]["answers"]["repo_name"] == "other"
+    assert len(parses) == 1
+
+
+def test_lock_repository_rereads_same_size_rewrite_with_same_mtime(tmp_path):
+    path = tmp_path / ".pantsagon.toml"
+    path.write_text(LOCK_TEXT, encoding="utf-8")
+    repository = LockRepository(path)
+    repository.read()
+    stat = path.stat()
+    path.write_text(LOCK_TEXT.replace('"demo"', '"dumb"'), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert repository.read().value["resolved"]["answers"]["repo_name"] == "dumb"
+
+
+def test_lock_repository_write_replaces_file_and_primes_cache(tmp_path, monkeypatch):
+    path = tmp_path / ".pantsagon.toml"
+    path.write_text(LOCK_TEXT, encoding="utf-8")
+    repository = LockRepository(path)
+    lock = repository.read().value
+    lock["selection"]["services"].append("ledger")
+    lock["resolved"]["answers"]["service_packages"]["ledger"] = "ledger"
+
+    repository.write(lock)
+
+    assert tomllib.loads(path.read_text(encoding="utf-8")) == lock
+    assert [p.name for p in tmp_path.iterdir()] == [".pantsagon.toml"]
+    parses = []
+    real_loads = repo_lock.tomllib.loads
+    monkeypatch.setattr(
+        repo_lock.tomllib, "loads", lambda text: parses.append(text) or real_loads(text)
+    )
+    assert repository.read().value == lock
+    assert parses == []
+
+
+def test_lock_write_is_atomic(tmp_path, monkeypatch):
+    path = tmp_path / ".pantsagon.toml"
+    path.write_text(LOCK_TEXT, encoding="utf-8")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(repo_lock.os, "replace", fail)
+    with pytest.raises(OSError):
+        write_lock(path, {"tool": {"name": "pantsagon"}})
+
+    assert path.read_text(encoding="utf-8") == LOCK_TEXT
+    assert [p.name for p in tmp_path.iterdir()] == [".pantsagon.toml"]
+
+
+def test_write_lock_goes_through_the_shared_repository(tmp_path, monkeypatch):
+    path = tmp_path / ".pantsagon.toml"
+    lock = {"tool": {"name": "pantsagon", "version": "1.0.0"}}
+    write_lock(path, lock)
+    parses = []
+    real_loads = repo_lock.tomllib.loads
+    monkeypatch.setattr(
+        repo_lock.tomllib, "loads", lambda text: parses.append(text) or real_loads(text)
+    )
+
+    assert read_lock(path).value == lock
+    assert parses == []
+
+
+def test_lock_repository_cache_is_bounded(tmp_path):
+    for i in range(repo_lock._REPOSITORY_LIMIT + 5):
+        repo_lock.lock_repository(tmp_path / f"r{i}" / ".pantsagon.toml")
+    assert len(repo_lock._repositories) <= repo_lock._REPOSITORY_LIMIT
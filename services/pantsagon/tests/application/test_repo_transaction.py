@@ -0,0 +1,65 @@
+import threading
+
+from pantsagon.adapters.workspace.filesystem import FilesystemWorkspace
+from pantsagon.application.repo_lock import lock_repository, write_lock
+from pantsagon.application.repo_transaction import (
+    RepoSnapshot,
+    commit_locked,
+    repo_mutex,
+    state_digest,
+)
+from pantsagon.domain.render_manifest import RenderManifest
+
+
+def _commit(repo, lock, snapshot, timeout=1.0):
+    workspace = FilesystemWorkspace(repo)
+    return commit_locked(
+        repo,
+        workspace,
+        workspace.begin_transaction(),
+        snapshot=snapshot,
+        lock=lock,
+        manifest=RenderManifest(),
+        lock_file=lock_repository(repo / ".pantsagon.toml"),
+        timeout=timeout,
+    )
+
+
+def test_commit_locked_times_out_while_the_repo_is_held(tmp_path):
+    write_lock(tmp_path / ".pantsagon.toml", {"tool": {"name": "pantsagon"}})
+    lock = {"tool": {"name": "pantsagon"}}
+    snapshot = RepoSnapshot.take(state_digest(tmp_path), lock, RenderManifest())
+    held, release = threading.Event(), threading.Event()
+
+    def hold():
+        with repo_mutex(tmp_path):
+            held.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    held.wait(5)
+    try:
+        diagnostics = _commit(tmp_path, {**lock, "x": 1}, snapshot, timeout=0.05)
+    finally:
+        release.set()
+        holder.join()
+
+    assert [d.code for d in diagnostics] == ["REPO_LOCK_TIMEOUT"]
+    assert diagnostics[0].is_execution
+    assert "x" not in (tmp_path / ".pantsagon.toml").read_text()
+    assert _commit(tmp_path, {**lock, "x": 1}, snapshot) == []
+
+
+def test_commit_locked_reports_conflicting_concurrent_changes(tmp_path):
+    lock = {"settings": {"strict": False}}
+    write_lock(tmp_path / ".pantsagon.toml", lock)
+    snapshot = RepoSnapshot.take(state_digest(tmp_path), lock, RenderManifest())
+    write_lock(tmp_path / ".pantsagon.toml", {"settings": {"strict": True, "allow_hooks": True}})
+
+    diagnostics = _commit(tmp_path, {"settings": {"strict": "off"}}, snapshot)
+
+    assert [d.code for d in diagnostics] == ["REPO_LOCK_CONFLICT"]
+    assert diagnostics[0].details == {"conflicts": ["settings.strict"]}
+    assert _commit(tmp_path, {"settings": {"strict": False, "renderer": "copier"}}, snapshot) == []
+    assert (tmp_path / ".pantsagon.toml").read_text().count("allow_hooks") == 1
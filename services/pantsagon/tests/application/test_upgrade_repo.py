@@ -0,0 +1,221 @@
+import importlib.util
+import shutil
+from pathlib import Path
+
+import pytest
+
+from pantsagon.adapters.pack_catalog.bundled import BundledPackCatalog
+from pantsagon.adapters.pack_store.content_store import ContentAddressedPackStore
+from pantsagon.adapters.policy import pack_validator
+from pantsagon.adapters.policy.pack_validator import PackPolicyEngine
+from pantsagon.adapters.renderer.copier_renderer import CopierRenderer
+from pantsagon.adapters.workspace.filesystem import FilesystemWorkspace
+from pantsagon.adapters.workspace.memory import MemoryWorkspace
+from pantsagon.application.add_service import add_service
+from pantsagon.application.init_repo import init_repo
+from pantsagon.application.render_manifest import MANIFEST_PATH, read_manifest
+from pantsagon.application.repo_lock import read_lock, write_lock
+from pantsagon.application.upgrade_repo import upgrade_repo
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("copier") is None,
+    reason="copier not installed",
+)
+
+README = Path("services/billing/README.md")
+README_TEMPLATE = Path("templates/services/{{ service_name }}/README.md.jinja")
+
+
+def _repo_root() -> Path:
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "packs" / "_index.json").is_file():
+            return parent
+    raise RuntimeError("Could not locate repo root")
+
+
+@pytest.fixture(autouse=True)
+def schema_path(monkeypatch):
+    monkeypatch.setattr(pack_validator, "SCHEMA_PATH", pack_validator.schema_path(_repo_root()))
+    monkeypatch.setenv("PANTS_BUILDROOT", str(_repo_root()))
+
+
+def _ports(repo: Path, store: Path) -> dict:
+    return {
+        "renderer_port": CopierRenderer(),
+        "policy_engine": PackPolicyEngine(),
+        "workspace": FilesystemWorkspace(repo),
+        "pack_store": ContentAddressedPackStore(store),
+    }
+
+
+def _include_partial(pack: Path) -> None:
+    """Have the README template include a file the pack does not render itself."""
+    (pack / "partials").mkdir()
+    (pack / "partials" / "note.md").write_text("NOTE v1\n")
+    template = pack / README_TEMPLATE
+    template.write_text(template.read_text() + '\n{% include "partials/note.md" %}')
+
+
+def _repo_with_service(tmp_path: Path, partial: bool = False) -> Path:
+    repo = tmp_path / "repo"
+    pack = repo / "packs" / "python"
+    shutil.copytree(_repo_root() / "packs" / "python", pack)
+    if partial:
+        _include_partial(repo / "packs" / "python")
+    write_lock(
+        repo / ".pantsagon.toml",
+        {
+            "tool": {"name": "pantsagon", "version": "1.0.0"},
+            "settings": {"renderer": "copier", "strict": False, "allow_hooks": False},
+            "selection": {"languages": ["python"], "features": [], "services": []},
+            "resolved": {
+                "packs": [
+                    {
+                        "id": "pantsagon.python",
+                        "version": "1.0.0",
+                        "source": "local",
+                        "location": "packs/python",
+                    }
+                ],
+                "answers": {"repo_name": "repo"},
+            },
+        },
+    )
+    result = add_service(repo, name="billing", lang="python", **_ports(repo, tmp_path / "store"))
+    assert not [d for d in result.diagnostics if d.severity.value == "error"]
+    return repo
+
+
+def _edit_template(repo: Path, old: str, new: str) -> None:
+    template = repo / "packs" / "python" / README_TEMPLATE
+    template.write_text(template.read_text().replace(old, new))
+
+
+def _upgrade_stats(result) -> dict:
+    return next(a for a in result.artifacts if a["kind"] == "upgrade")
+
+
+def test_add_service_records_render_manifest(tmp_path):
+    repo = _repo_with_service(tmp_path)
+    manifest = read_manifest(repo / MANIFEST_PATH).value
+
+    entry = manifest.files[README.as_posix()]
+    assert entry.pack == "pantsagon.python"
+    assert entry.template == README_TEMPLATE.as_posix()
+    assert manifest.answers[entry.answers_digest].roots == ["services/billing"]
+    assert all(path.startswith("services/billing/") for path in manifest.files)
+
+
+def test_init_records_render_manifest(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    result = init_repo(
+        repo,
+        ["python"],
+        ["billing"],
+        [],
+        renderer="copier",
+        renderer_port=CopierRenderer(),
+        pack_catalog=BundledPackCatalog(_repo_root() / "packs"),
+        policy_engine=PackPolicyEngine(),
+        workspace=FilesystemWorkspace(repo),
+    )
+    assert not [d for d in result.diagnostics if d.severity.value == "error"]
+
+    manifest = read_manifest(repo / MANIFEST_PATH).value
+    assert manifest.files["pants.toml"].pack == "pantsagon.core"
+    assert manifest.files[README.as_posix()].pack == "pantsagon.python"
+    assert [answers.roots for answers in manifest.answers.values()] == [[""]]
+
+
+def test_upgrade_without_pack_changes_renders_nothing(tmp_path):
+    repo = _repo_with_service(tmp_path)
+    result = upgrade_repo(repo, **_ports(repo, tmp_path / "store"))
+
+    stats = _upgrade_stats(result)
+    assert stats["packs_unchanged"] == 1
+    assert stats["templates_rendered"] == 0
+
+
+def test_upgrade_rerenders_only_changed_templates_and_merges_local_edits(tmp_path):
+    repo = _repo_with_service(tmp_path)
+    (repo / README).write_text((repo / README).read_text() + "\nOwned by the billing team.\n")
+    _edit_template(repo, "Hexagonal layers:", "Hexagonal layers (see docs):")
+
+    result = upgrade_repo(repo, **_ports(repo, tmp_path / "store"))
+
+    stats = _upgrade_stats(result)
+    assert stats["packs_changed"] == 1
+    assert stats["templates_rendered"] == 1
+    assert stats["templates_skipped"] == 10
+    assert stats["files_merged"] == 1
+    assert stats["conflicts"] == 0
+    readme = (repo / README).read_text()
+    assert "Hexagonal layers (see docs):" in readme
+    assert "Owned by the billing team." in readme
+    lock = read_lock(repo / ".pantsagon.toml").value
+    store = ContentAddressedPackStore(tmp_path / "store")
+    assert lock["resolved"]["packs"][0]["digest"] == store.digest(repo / "packs" / "python")
+
+    again = upgrade_repo(repo, **_ports(repo, tmp_path / "store"))
+    assert _upgrade_stats(again)["templates_rendered"] == 0
+
+
+def test_upgrade_leaves_conflicting_files_unchanged_and_fails(tmp_path):
+    repo = _repo_with_service(tmp_path)
+    text = (repo / README).read_text()
+    (repo / README).write_text(text.replace("Hexagonal layers:", "Layers we use:"))
+    _edit_template(repo, "Hexagonal layers:", "Hexagonal layers (see docs):")
+
+    lock_before = (repo / ".pantsagon.toml").read_text()
+
+    result = upgrade_repo(repo, **_ports(repo, tmp_path / "store"))
+
+    assert [d.code for d in result.diagnostics] == ["UPGRADE_MERGE_CONFLICT"]
+    assert result.exit_code == 2
+    assert _upgrade_stats(result)["conflicts"] == 1
+    assert (repo / README).read_text() == text.replace("Hexagonal layers:", "Layers we use:")
+    assert (repo / ".pantsagon.toml").read_text() == lock_before
+
+    (repo / README).write_text(text + "\nOwned by the billing team.\n")
+    retry = upgrade_repo(repo, **_ports(repo, tmp_path / "store"))
+    assert retry.exit_code == 0
+    assert _upgrade_stats(retry)["templates_rendered"] == 1
+    readme = (repo / README).read_text()
+    assert "Hexagonal layers (see docs):" in readme
+    assert "Owned by the billing team." in readme
+
+
+def test_upgrade_into_memory_workspace_leaves_repo_untouched(tmp_path):
+    repo = _repo_with_service(tmp_path)
+    _edit_template(repo, "Hexagonal layers:", "Hexagonal layers (see docs):")
+    before = (repo / README).read_text()
+    lock_before = (repo / ".pantsagon.toml").read_text()
+    workspace = MemoryWorkspace(repo)
+
+    upgrade_repo(repo, **{**_ports(repo, tmp_path / "store"), "workspace": workspace})
+
+    assert (repo / README).read_text() == before
+    assert (repo / ".pantsagon.toml").read_text() == lock_before
+    actions = {op["path"]: op["action"] for op in workspace.planned_operations()}
+    assert actions[README.as_posix()] == "overwrite"
+    assert actions[".pantsagon.toml"] == "overwrite"
+
+    workspace.flush()
+    assert "Hexagonal layers (see docs):" in (repo / README).read_text()
+
+
+def test_upgrade_rerenders_templates_when_an_included_partial_changes(tmp_path):
+    repo = _repo_with_service(tmp_path, partial=True)
+    assert "NOTE v1" in (repo / README).read_text()
+    (repo / "packs" / "python" / "partials" / "note.md").write_text("NOTE v2\n")
+
+    result = upgrade_repo(repo, **_ports(repo, tmp_path / "store"))
+
+    stats = _upgrade_stats(result)
+    assert stats["packs_changed"] == 1
+    assert stats["templates_rendered"] == 11
+    assert stats["templates_skipped"] == 0
+    assert "NOTE v2" in (repo / README).read_text()
+    again = upgrade_repo(repo, **_ports(repo, tmp_path / "store"))
+    assert _upgrade_stats(again)["templates_rendered"] == 0
@@ -3,8 +3,10 @@ from pathlib import Path
 
 import tomli_w
 
+from pantsagon.application import render_manifest
 from pantsagon.application.init_repo import init_repo
 from pantsagon.application.validate_repo import validate_repo
+from pantsagon.domain.render_manifest import RenderedFile, RenderManifest
 
 
 def test_validate_repo_missing_lock(tmp_path):
@@ -19,7 +21,13 @@ def test_validate_repo_invalid_lock(tmp_path):
 
 
 def test_validate_repo_missing_service_dir(tmp_path):
-    init_repo(repo_path=tmp_path, languages=["python"], services=["missing"], features=[], renderer="copier")
+    init_repo(
+        repo_path=tmp_path,
+        languages=["python"],
+        services=["missing"],
+        features=[],
+        renderer="copier",
+    )
     svc_dir = tmp_path / "services" / "missing"
     if svc_dir.exists():
         for path in sorted(svc_dir.rglob("*"), reverse=True):
@@ -33,7 +41,9 @@ def test_validate_repo_missing_service_dir(tmp_path):
 
 
 def test_validate_repo_pack_not_found(tmp_path):
-    init_repo(repo_path=tmp_path, languages=["python"], services=["svc"], features=[], renderer="copier")
+    init_repo(
+        repo_path=tmp_path, languages=["python"], services=["svc"], features=[], renderer="copier"
+    )
     lock_path = tmp_path / ".pantsagon.toml"
     lock = tomllib.loads(lock_path.read_text(encoding="utf-8"))
     lock["resolved"]["packs"][0]["id"] = "pantsagon.missing"
@@ -41,3 +51,176 @@ def test_validate_repo_pack_not_found(tmp_path):
 
     result = validate_repo(repo_path=tmp_path)
     assert any(d.code == "PACK_NOT_FOUND" for d in result.diagnostics)
+
+
+def _lock_with_git_pack(tmp_path):
+    init_repo(
+        repo_path=tmp_path, languages=["python"], services=["svc"], features=[], renderer="copier"
+    )
+    lock_path = tmp_path / ".pantsagon.toml"
+    lock = tomllib.loads(lock_path.read_text(encoding="utf-8"))
+    lock["resolved"]["packs"].append(
+        {
+            "id": "acme.git",
+            "version": "1.0.0",
+            "source": "git",
+            "location": "../packs.git",
+            "ref": "v1",
+        }
+    )
+    lock_path.write_text(tomli_w.dumps(lock), encoding="utf-8")
+
+
+def test_validate_repo_git_pack_requires_catalog(tmp_path):
+    _lock_with_git_pack(tmp_path)
+    result = validate_repo(repo_path=tmp_path)
+    assert any(d.code == "LOCK_PACK_INVALID" for d in result.diagnostics)
+
+
+def test_validate_repo_git_pack_fetch_failure(tmp_path):
+    _lock_with_git_pack(tmp_path)
+    seen = []
+
+    class FailingCatalog:
+        def get_pack_path(self, pack):
+            seen.append(pack)
+            raise RuntimeError("no such ref")
+
+    result = validate_repo(repo_path=tmp_path, git_catalog=FailingCatalog())
+    failures = [d for d in result.diagnostics if d.code == "PACK_FETCH_FAILED"]
+    assert failures and failures[0].is_execution
+    assert seen[0].git_ref == "v1"
+    assert Path(seen[0].location) == tmp_path / "../packs.git"
+
+
+def test_validate_repo_reports_missing_generated_file(tmp_path):
+    init_repo(
+        repo_path=tmp_path, languages=["python"], services=["svc"], features=[], renderer="copier"
+    )
+    kept = tmp_path / "services" / "svc" / "README.md"
+    kept.parent.mkdir(parents=True)
+    kept.write_text("svc\n")
+    manifest = RenderManifest()
+    for rel in ("services/svc/README.md", "services/svc/domain/__init__.py"):
+        manifest.files[rel] = RenderedFile(
+            path=rel,
+            pack="pantsagon.python",
+            template=f"templates/{rel}.jinja",
+            template_digest="sha256:t",
+            answers_digest="sha256:a",
+            content_digest="sha256:c",
+        )
+    render_manifest.write_manifest(tmp_path / render_manifest.MANIFEST_PATH, manifest)
+
+    result = validate_repo(repo_path=tmp_path)
+    codes = [d.code for d in result.diagnostics]
+    missing = [d for d in result.diagnostics if d.code == "REPO_FILE_MISSING"]
+    assert [d.location.path for d in missing] == [
+        str(tmp_path / "services/svc/domain/__init__.py")
+    ]
+    assert missing[0].details["pack"] == "pantsagon.python"
+    assert "REPO_LAYER_MISSING" not in codes
+
+
+def test_missing_files_lists_each_directory_once(tmp_path, monkeypatch):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "one.txt").write_text("1")
+    (tmp_path / "top.txt").write_text("t")
+    scanned = []
+    real_scandir = render_manifest.os.scandir
+
+    def scandir(path):
+        scanned.append(Path(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(render_manifest.os, "scandir", scandir)
+    paths = ["a/one.txt", "a/two.txt", "top.txt", "b/three.txt", "a"]
+    assert render_manifest.missing_files(tmp_path, paths) == ["a", "a/two.txt", "b/three.txt"]
+    assert sorted(scanned) == sorted([tmp_path / "a", tmp_path, tmp_path / "b"])
+
+
+def test_validate_repo_reads_sharded_service_fragments(tmp_path):
+    init_repo(
+        repo_path=tmp_path, languages=["python"], services=["svc"], features=[], renderer="copier"
+    )
+    lock_path = tmp_path / ".pantsagon.toml"
+    lock = tomllib.loads(lock_path.read_text(encoding="utf-8"))
+    lock["settings"]["lock_layout"] = "sharded"
+    lock_path.write_text(tomli_w.dumps(lock), encoding="utf-8")
+    (tmp_path / "services" / "svc").mkdir(parents=True, exist_ok=True)
+    fragments = tmp_path / ".pantsagon" / "services"
+    fragments.mkdir(parents=True)
+    (fragments / "billing.toml").write_text('name = "billing"\npackage = "billing"\n')
+    (fragments / "orders.toml").write_text('name = "shipping"\npackage = "orders"\n')
+
+    result = validate_repo(repo_path=tmp_path)
+    codes = [(d.code, d.location.path if d.location else None) for d in result.diagnostics]
+
+    assert ("REPO_SERVICE_MISSING", str(tmp_path / "services" / "billing")) in codes
+    assert ("REPO_SERVICE_MISSING", str(tmp_path / "services" / "orders")) in codes
+    (tmp_path / "services" / "billing").mkdir()
+    (tmp_path / "services" / "orders").mkdir()
+    result = validate_repo(repo_path=tmp_path)
+    invalid = [d for d in result.diagnostics if d.code == "LOCK_SERVICE_INVALID"]
+    assert [d.location.path for d in invalid] == [str(fragments / "orders.toml")]
+
+
+def test_validate_repos_shares_parsed_packs_and_reports_each_repo(tmp_path, monkeypatch):
+    from pantsagon.application import validate_repo as module
+
+    repos = [tmp_path / name for name in ("a", "b", "c")]
+    for repo in repos:
+        repo.mkdir()
+    for repo in repos[:2]:
+        init_repo(
+            repo_path=repo, languages=["python"], services=["svc"], features=[], renderer="copier"
+        )
+        (repo / "services" / "svc").mkdir(parents=True, exist_ok=True)
+    loads = []
+    load_manifest = module._load_manifest
+    monkeypatch.setattr(
+        module, "_load_manifest", lambda path: loads.append(path) or load_manifest(path)
+    )
+
+    result = module.validate_repos(repos, jobs=2)
+
+    assert loads and sorted(loads) == sorted(set(loads))
+    assert [a["repo"] for a in result.artifacts] == [str(repo) for repo in repos]
+    assert [a["exit_code"] for a in result.artifacts][2] == 2
+    missing = [d for d in result.diagnostics if d.code == "LOCK_MISSING"]
+    assert [d.details for d in missing] == [{"repo": str(repos[2])}]
+    assert result.exit_code == 2
+
+
+def test_validation_cache_loads_each_path_once_across_threads(tmp_path, monkeypatch):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pantsagon.application import validate_repo as module
+
+    packs = [tmp_path / name for name in ("a", "b")]
+    for pack in packs:
+        pack.mkdir()
+        (pack / "pack.yaml").write_text(f"id: {pack.name}\n")
+    loads = []
+    load_manifest = module._load_manifest
+
+    def slow_load(path):
+        loads.append(path)
+        time.sleep(0.05)
+        return load_manifest(path)
+
+    monkeypatch.setattr(module, "_load_manifest", slow_load)
+    cache = module.ValidationCache()
+    start = threading.Barrier(8)
+
+    def read(pack):
+        start.wait()
+        return cache.pack_manifest(pack)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(read, packs * 4))
+
+    assert sorted(loads) == packs
+    assert [result["id"] for result in results] == ["a", "b"] * 4
@@ -0,0 +1,53 @@
+from pantsagon.domain.merge import merge3, merge_data
+
+BASE = "a\nb\nc\nd\n"
+
+
+def test_merge3_combines_non_overlapping_edits():
+    result = merge3(BASE, "a\nB\nc\nd\n", "a\nb\nc\nD\ne\n")
+    assert result.text == "a\nB\nc\nD\ne\n"
+    assert result.conflicts == 0
+
+
+def test_merge3_takes_identical_edits_once():
+    assert merge3(BASE, "a\nX\nc\nd\n", "a\nX\nc\nd\n").text == "a\nX\nc\nd\n"
+
+
+def test_merge3_marks_overlapping_edits():
+    result = merge3(BASE, "a\nX\nc\nd\n", "a\nY\nc\nd\n", theirs_label="pack")
+    assert result.conflicts == 1
+    assert result.text == "a\n<<<<<<< local\nX\n=======\nY\n>>>>>>> pack\nc\nd\n"
+
+
+def test_merge3_terminates_lines_inside_conflicts():
+    result = merge3("", "x", "y")
+    assert result.text == "<<<<<<< local\nx\n=======\ny\n>>>>>>> generated\n"
+
+
+def test_merge_data_combines_independent_edits():
+    base = {"services": ["a"], "packages": {"a": "a"}, "name": "a", "packs": [{"d": 1}]}
+    ours = {
+        "services": ["a", "b"],
+        "packages": {"a": "a", "b": "b"},
+        "name": "b",
+        "packs": [{"d": 1}],
+    }
+    theirs = {"services": ["a", "c"], "packages": {"a": "a", "c": "c"}, "name": "c"}
+    theirs["packs"] = [{"d": 2}]
+
+    result = merge_data(base, ours, theirs, prefer_ours=frozenset({"name"}))
+
+    assert result.conflicts == []
+    assert result.value == {
+        "services": ["a", "c", "b"],
+        "packages": {"a": "a", "c": "c", "b": "b"},
+        "name": "b",
+        "packs": [{"d": 2}],
+    }
+
+
+def test_merge_data_reports_conflicting_edits():
+    result = merge_data({"x": {"y": 1}}, {"x": {"y": 2}}, {"x": {"y": 3}})
+    assert result.conflicts == ["x.y"]
+    assert result.value == {"x": {"y": 2}}
+    assert merge_data({"x": 1}, {}, {"x": 1}).value == {}
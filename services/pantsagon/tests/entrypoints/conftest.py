@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the CLI's pack store and validation memo out of the real user cache."""
+    monkeypatch.setenv("PANTSAGON_CACHE_DIR", str(tmp_path / "pantsagon-cache"))
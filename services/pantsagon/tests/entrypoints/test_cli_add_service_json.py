@@ -64,3 +64,21 @@ def test_cli_add_service_json_output(tmp_path, monkeypatch):
     payload = json.loads(result.stdout)
     assert payload["command"] == "add-service"
     assert payload["exit_code"] == 0
+    assert not [a for a in payload["artifacts"] if a.get("kind") == "io_metrics"]
+
+
+def test_cli_add_service_profile_reports_io_metrics(tmp_path, monkeypatch):
+    write_lock(tmp_path / ".pantsagon.toml", _base_lock(tmp_path))
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(
+        app,
+        ["add-service", "monitor-cost", "--lang", "python", "--json", "--profile"],
+        env={"PANTS_BUILDROOT": str(_repo_root())},
+    )
+    assert result.exit_code == 0
+    payload = json.loads(result.stdout)
+    (metrics,) = [a for a in payload["artifacts"] if a.get("kind") == "io_metrics"]
+    assert metrics["renderer"]["files_created"] > 0
+    assert metrics["workspace"]["files_created"] >= metrics["renderer"]["files_created"]
+    assert "syscalls_saved" not in metrics["total"]
@@ -0,0 +1,84 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from pantsagon.adapters.policy import pack_validator
+from pantsagon.application.repo_lock import write_lock
+from pantsagon.entrypoints.cli import app
+
+
+def _repo_root() -> Path:
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "packs" / "_index.json").is_file():
+            return parent
+    raise RuntimeError("Could not locate repo root")
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch, tmp_path):
+    monkeypatch.setattr(pack_validator, "SCHEMA_PATH", pack_validator.schema_path(_repo_root()))
+    monkeypatch.setenv("PANTS_BUILDROOT", str(_repo_root()))
+    monkeypatch.setenv("PANTSAGON_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def test_pack_build_writes_archive(tmp_path):
+    output = tmp_path / "python.pantsagon-pack"
+    result = CliRunner().invoke(
+        app, ["pack", "build", str(_repo_root() / "packs" / "python"), "-o", str(output), "--json"]
+    )
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.stdout)
+    artifact = next(a for a in payload["artifacts"] if a["kind"] == "pack_archive")
+    assert artifact["path"] == str(output)
+    assert artifact["pack"] == "pantsagon.python"
+    assert artifact["digest"].startswith("sha256:")
+    assert output.is_file()
+
+
+def test_pack_build_rejects_directory_without_manifest(tmp_path):
+    result = CliRunner().invoke(app, ["pack", "build", str(tmp_path), "--json"])
+    assert result.exit_code == 2
+    codes = [d["code"] for d in json.loads(result.stdout)["diagnostics"]]
+    assert codes == ["PACK_NOT_FOUND"]
+
+
+def test_validate_accepts_archived_local_pack(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    pack_dir = tmp_path / "acme"
+    shutil.copytree(_repo_root() / "packs" / "python", pack_dir)
+    archive = repo / "packs" / "python.pantsagon-pack"
+    runner = CliRunner()
+    built = runner.invoke(app, ["pack", "build", str(pack_dir), "-o", str(archive)])
+    assert built.exit_code == 0, built.output
+    assert "Wrote" in built.stdout
+
+    write_lock(
+        repo / ".pantsagon.toml",
+        {
+            "tool": {"name": "pantsagon", "version": "1.0.0"},
+            "settings": {"renderer": "copier", "strict": False},
+            "selection": {"languages": ["python"], "features": [], "services": ["billing"]},
+            "resolved": {
+                "packs": [
+                    {"id": "pantsagon.core", "version": "1.0.0", "source": "bundled"},
+                    {
+                        "id": "pantsagon.python",
+                        "version": "1.0.0",
+                        "source": "local",
+                        "location": "packs/python.pantsagon-pack",
+                    },
+                ],
+                "answers": {"repo_name": "repo"},
+            },
+        },
+    )
+    for layer in ("domain", "ports", "application", "adapters", "entrypoints"):
+        (repo / "services" / "billing" / layer).mkdir(parents=True)
+    monkeypatch.chdir(repo)
+    result = runner.invoke(app, ["validate", "--json"])
+    payload = json.loads(result.stdout)
+    assert [d["code"] for d in payload["diagnostics"] if d["severity"] == "error"] == []
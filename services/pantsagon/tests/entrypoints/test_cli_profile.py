@@ -0,0 +1,118 @@
+import json
+import pstats
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from pantsagon.adapters.policy import pack_validator
+from pantsagon.application.repo_lock import write_lock
+from pantsagon.entrypoints.cli import app
+
+
+def _repo_root() -> Path:
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "packs" / "_index.json").is_file():
+            return parent
+    raise RuntimeError("Could not locate repo root")
+
+
+@pytest.fixture(autouse=True)
+def schema_path(monkeypatch):
+    monkeypatch.setattr(pack_validator, "SCHEMA_PATH", pack_validator.schema_path(_repo_root()))
+
+
+def _write_repo(path: Path) -> None:
+    write_lock(
+        path / ".pantsagon.toml",
+        {
+            "tool": {"name": "pantsagon", "version": "1.0.0"},
+            "settings": {"renderer": "copier", "strict": False},
+            "selection": {"languages": ["python"], "features": [], "services": ["billing"]},
+            "resolved": {
+                "packs": [
+                    {"id": "pantsagon.core", "version": "1.0.0", "source": "bundled"},
+                    {"id": "pantsagon.python", "version": "1.0.0", "source": "bundled"},
+                ],
+                "answers": {"repo_name": path.name},
+            },
+        },
+    )
+    for layer in ("domain", "ports", "application", "adapters", "entrypoints"):
+        (path / "services" / "billing" / layer).mkdir(parents=True)
+
+
+def test_cli_validate_profile_adds_timing_artifact(tmp_path, monkeypatch):
+    _write_repo(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(
+        app,
+        ["validate", "--json", "--profile"],
+        env={"PANTS_BUILDROOT": str(_repo_root())},
+    )
+    payload = json.loads(result.stdout)
+    timing = [a for a in payload["artifacts"] if a.get("kind") == "timing"]
+    assert len(timing) == 1
+    (root,) = timing[0]["spans"]
+    assert root["name"] == "validate"
+    children = [child["name"] for child in root["children"]]
+    assert children[0] == "read_lock"
+    assert children.count("validate_pack") == 2
+    assert "check_services" in children
+
+
+def test_cli_validate_without_profile_has_no_timing(tmp_path, monkeypatch):
+    _write_repo(tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(
+        app, ["validate", "--json"], env={"PANTS_BUILDROOT": str(_repo_root())}
+    )
+    payload = json.loads(result.stdout)
+    assert not [a for a in payload["artifacts"] if a.get("kind") == "timing"]
+
+
+def test_cli_validate_writes_chrome_trace(tmp_path, monkeypatch):
+    _write_repo(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    trace_path = tmp_path / "out" / "trace.json"
+
+    result = CliRunner().invoke(
+        app,
+        ["validate", "--json", "--trace-file", str(trace_path)],
+        env={"PANTS_BUILDROOT": str(_repo_root())},
+    )
+    payload = json.loads(result.stdout)
+    assert {"kind": "trace", "format": "chrome", "path": str(trace_path)} in payload["artifacts"]
+    assert not [a for a in payload["artifacts"] if a.get("kind") == "timing"]
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    packs = [e["args"]["pack"] for e in events if e["name"] == "validate_pack"]
+    assert packs == ["pantsagon.core", "pantsagon.python"]
+    assert all(e["ph"] in {"X", "M"} for e in events)
+
+
+def test_cli_cprofile_and_memprofile_artifacts(tmp_path, monkeypatch):
+    _write_repo(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    stats_path = tmp_path / "validate.pstats"
+
+    result = CliRunner().invoke(
+        app,
+        ["--cprofile", str(stats_path), "--memprofile", "validate", "--json"],
+        env={"PANTS_BUILDROOT": str(_repo_root())},
+    )
+    payload = json.loads(result.stdout)
+    kinds = {a["kind"]: a for a in payload["artifacts"]}
+    assert kinds["cprofile"]["path"] == str(stats_path)
+    stats = pstats.Stats(str(stats_path))
+    assert any(func[2] == "validate_repo" for func in stats.stats)
+    memory = kinds["memory"]
+    assert memory["peak_bytes"] > 0
+    assert memory["top"] and {"file", "line", "size_bytes", "count"} <= set(memory["top"][0])
+
+
+def test_cli_profiling_options_are_hidden():
+    result = CliRunner().invoke(app, ["--help"])
+    assert "--cprofile" not in result.stdout
+    assert "--memprofile" not in result.stdout
@@ -1,10 +1,51 @@
+import os
+from pathlib import Path
+
 from typer.testing import CliRunner
 
+from pantsagon.adapters.policy import pack_validator
+from pantsagon.application.repo_lock import write_lock
 from pantsagon.entrypoints.cli import app
 
 
+def _repo_root() -> Path:
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "packs" / "_index.json").is_file():
+            return parent
+    raise RuntimeError("Could not locate repo root")
+
+
 def test_cli_validate_exits_nonzero_when_lock_missing():
     runner = CliRunner()
     with runner.isolated_filesystem():
         result = runner.invoke(app, ["validate", "--json"])
     assert result.exit_code != 0
+
+
+def test_cli_validate_no_cache_leaves_no_memo_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(pack_validator, "SCHEMA_PATH", pack_validator.schema_path(_repo_root()))
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    write_lock(
+        repo / ".pantsagon.toml",
+        {
+            "tool": {"name": "pantsagon", "version": "1.0.0"},
+            "settings": {"renderer": "copier", "strict": False},
+            "selection": {"languages": ["python"], "features": [], "services": []},
+            "resolved": {
+                "packs": [{"id": "pantsagon.core", "version": "1.0.0", "source": "bundled"}],
+                "answers": {"repo_name": "repo"},
+            },
+        },
+    )
+    monkeypatch.chdir(repo)
+    env = {"PANTS_BUILDROOT": str(_repo_root())}
+    memo = Path(os.environ["PANTSAGON_CACHE_DIR"]) / "pack-validation.json"
+
+    result = CliRunner().invoke(app, ["validate", "--json", "--no-cache"], env=env)
+    assert result.exit_code == 0, result.stdout
+    assert not memo.exists()
+
+    result = CliRunner().invoke(app, ["validate", "--json"], env=env)
+    assert result.exit_code == 0, result.stdout
+    assert memo.is_file()
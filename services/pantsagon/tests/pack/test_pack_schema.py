@@ -1,13 +1,13 @@
 from pathlib import Path
 
-from pantsagon.adapters.policy.pack_validator import PackPolicyEngine, _schema_path
+from pantsagon.adapters.policy.pack_validator import PackPolicyEngine, schema_path
 from pantsagon.application.pack_validation import validate_pack
 
 
 def test_schema_path_points_to_shared_contracts() -> None:
     root = Path(__file__).resolve().parents[4]
     assert (
-        _schema_path(root)
+        schema_path(root)
         .as_posix()
         .endswith("shared/contracts/schemas/pack.schema.v1.json")
     )
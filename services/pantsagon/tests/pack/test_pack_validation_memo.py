@@ -0,0 +1,73 @@
+import shutil
+
+from pantsagon.adapters.policy import pack_validator
+from pantsagon.adapters.policy.pack_validator import PackPolicyEngine
+
+
+def _pack(path):
+    path.mkdir()
+    (path / "pack.yaml").write_text(
+        "id: x\nversion: 1.0.0\ncompatibility: {pants: '>=2.0.0'}\n"
+        "variables: [{name: service_name, type: string}]\n"
+    )
+    (path / "copier.yml").write_text("service_name: {type: str}\nextra_var: {type: str}\n")
+    return path
+
+
+def test_validate_pack_runs_once_per_pack_digest(tmp_path, monkeypatch):
+    calls = []
+    load = pack_validator.load_copier_vars
+    monkeypatch.setattr(
+        pack_validator, "load_copier_vars", lambda path: calls.append(path) or load(path)
+    )
+    first = _pack(tmp_path / "first")
+    second = tmp_path / "second"
+    shutil.copytree(first, second)
+    memo = tmp_path / "memo.json"
+    engine = PackPolicyEngine(memo_path=memo)
+
+    results = [engine.validate_pack(first), engine.validate_pack(second)]
+
+    assert calls == [first]
+    assert (engine.hits, engine.misses) == (1, 1)
+    assert results[0].diagnostics == results[1].diagnostics
+    assert "COPIER_UNDECLARED_VARIABLE" in [d.code for d in results[1].diagnostics]
+    results[1].value["id"] = "changed"
+    assert engine.validate_pack(first).value["id"] == "x"
+
+    fresh = PackPolicyEngine(memo_path=memo)
+    assert fresh.validate_pack(second).diagnostics == results[0].diagnostics
+    assert fresh.hits == 1 and len(calls) == 1
+
+    (second / "copier.yml").write_text("service_name: {type: str}\n")
+    codes = [d.code for d in fresh.validate_pack(second).diagnostics]
+    assert "COPIER_UNDECLARED_VARIABLE" not in codes
+    assert calls == [first, second]
+
+
+def test_engines_sharing_a_memo_file_keep_each_others_entries(tmp_path):
+    memo = tmp_path / "memo.json"
+    first, second = PackPolicyEngine(memo_path=memo), PackPolicyEngine(memo_path=memo)
+    first.validate_pack(_pack(tmp_path / "a"))
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "pack.yaml").write_text("id: b\n")
+    (tmp_path / "b" / "copier.yml").write_text("")
+    second.validate_pack(tmp_path / "b")
+    (tmp_path / "c").mkdir()
+    (tmp_path / "c" / "pack.yaml").write_text("id: c\n")
+    (tmp_path / "c" / "copier.yml").write_text("")
+    first.validate_pack(tmp_path / "c")
+
+    fresh = PackPolicyEngine(memo_path=memo)
+    for name in ("a", "b", "c"):
+        fresh.validate_pack(tmp_path / name)
+    assert (fresh.hits, fresh.misses) == (3, 0)
+
+
+def test_engine_without_memo_does_not_digest_packs(tmp_path, monkeypatch):
+    def fail(self, path):
+        raise AssertionError("digested")
+
+    monkeypatch.setattr(pack_validator.DigestEngine, "digest", fail)
+    result = PackPolicyEngine().validate_pack(_pack(tmp_path / "pack"))
+    assert "COPIER_UNDECLARED_VARIABLE" in [d.code for d in result.diagnostics]
@@ -61,3 +61,24 @@ def test_docker_pack_renders_dockerfile_and_pex(tmp_path):
     _render(pack, out, {"service_name": "monitor-cost", "service_pkg": "monitor_cost"})
     assert (out / "services" / "monitor-cost" / "Dockerfile").exists()
     assert (out / "services" / "monitor-cost" / "BUILD").exists()
+
+
+@pytest.mark.parametrize("pack_name", ["core", "python", "openapi", "docker"])
+def test_in_memory_render_matches_copier(tmp_path, pack_name):
+    pack = Path("packs") / pack_name
+    out = tmp_path / pack_name
+    out.mkdir()
+    answers = {
+        "repo_name": "acme",
+        "service_name": "monitor-cost",
+        "service_pkg": "monitor_cost",
+    }
+    _render(pack, out, answers)
+    renderer = CopierRenderer()
+
+    rendered = renderer.render_files(pack, answers, renderer.template_map(pack, answers))
+
+    written = {path.relative_to(out) for path in out.rglob("*") if path.is_file()}
+    assert set(rendered) == written
+    for path, data in rendered.items():
+        assert (out / path).read_bytes() == data
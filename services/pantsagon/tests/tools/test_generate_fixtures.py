@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+
+from pantsagon.adapters.policy import pack_validator
+from pantsagon.adapters.policy.pack_validator import PackPolicyEngine
+from pantsagon.application.validate_repo import validate_repo
+from pantsagon.tools.generate_fixtures import generate_pack, generate_repo, main
+
+
+@pytest.fixture(autouse=True)
+def schema_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "packs" / "_index.json").is_file():
+            monkeypatch.setattr(pack_validator, "SCHEMA_PATH", pack_validator.schema_path(parent))
+            monkeypatch.setenv("PANTS_BUILDROOT", str(parent))
+            return
+    pytest.skip("Could not locate repo root")
+
+
+def _tree(root: Path) -> dict[str, bytes]:
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+def test_generated_pack_is_deterministic_and_valid(tmp_path: Path) -> None:
+    first = generate_pack(tmp_path / "a", templates=40, depth=3, seed=7)
+    second = generate_pack(tmp_path / "b", templates=40, depth=3, seed=7)
+    other = generate_pack(tmp_path / "c", templates=40, depth=3, seed=8)
+
+    assert _tree(first) == _tree(second)
+    assert _tree(first) != _tree(other)
+    assert len(list((first / "templates").rglob("*.jinja"))) == 40
+    assert PackPolicyEngine().validate_pack(first).exit_code == 0
+
+
+def test_generated_repo_validates(tmp_path: Path) -> None:
+    repo = generate_repo(tmp_path / "repo", services=25, packs=2, files_per_layer=1)
+
+    result = validate_repo(repo, policy_engine=PackPolicyEngine())
+    assert result.exit_code == 0
+    assert (repo / "services" / "svc-00024" / "entrypoints").is_dir()
+    assert (repo / "packs" / "synthetic-0001" / "pack.yaml").is_file()
+
+
+def test_main_refuses_non_empty_target(tmp_path: Path) -> None:
+    (tmp_path / "existing").write_text("x")
+    assert main(["pack", str(tmp_path), "--templates", "1"]) == 2
+    assert main(["repo", str(tmp_path / "new"), "--services", "2"]) == 0
@@ -0,0 +1,148 @@
+import importlib.util
+import shutil
+from pathlib import Path
+
+import pytest
+
+from pantsagon.tools.validate_packs import discover_packs, main, validate_bundled_packs
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("copier") is None,
+    reason="copier not installed",
+)
+
+
+def _packs_root() -> Path:
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "packs" / "_index.json").is_file():
+            return parent / "packs"
+    pytest.skip("Could not locate bundled packs")
+    return Path(".")
+
+
+def test_parallel_validation_matches_serial_order():
+    packs_root = _packs_root()
+    serial = validate_bundled_packs(
+        packs_root, render_on_validation_error=False, render_enabled=True, quiet=True
+    )
+    parallel = validate_bundled_packs(
+        packs_root, render_on_validation_error=False, render_enabled=True, quiet=True, jobs=4
+    )
+    assert [a["pack_id"] for a in parallel.artifacts] == [a["pack_id"] for a in serial.artifacts]
+    assert parallel.artifacts == serial.artifacts
+    assert parallel.exit_code == 0
+
+
+def test_render_output_is_captured_per_pack(capsys):
+    assert main(["--bundled", "--jobs", "2"]) == 0
+    out = capsys.readouterr()
+    assert "Validated 4 bundled packs" in out.out
+    assert out.err.count("Copying from template") == 4
+    assert "pants.toml" in out.err
+
+
+def test_quiet_suppresses_render_output(capsys):
+    assert main(["--bundled", "--jobs", "2", "--quiet"]) == 0
+    assert "Copying from template" not in capsys.readouterr().err
+
+
+def _snapshot_run(packs_root: Path, snapshot_dir: Path, update: bool = False):
+    return validate_bundled_packs(
+        packs_root,
+        render_on_validation_error=False,
+        render_enabled=True,
+        quiet=True,
+        snapshot_dir=snapshot_dir,
+        update_snapshots=update,
+    )
+
+
+def test_snapshot_hit_skips_render_and_drift_is_reported(tmp_path):
+    packs_root = tmp_path / "packs"
+    shutil.copytree(_packs_root() / "openapi", packs_root / "openapi")
+    snapshot_dir = tmp_path / "snapshots"
+
+    first = _snapshot_run(packs_root, snapshot_dir)
+    assert [d.code for d in first.diagnostics] == ["PACK_SNAPSHOT_MISSING"]
+
+    _snapshot_run(packs_root, snapshot_dir, update=True)
+    assert (snapshot_dir / "pantsagon.openapi.json").is_file()
+
+    hit = _snapshot_run(packs_root, snapshot_dir)
+    assert hit.artifacts[0]["render_skipped"] is True
+    assert hit.artifacts[0]["snapshot"]["status"] == "hit"
+    assert hit.exit_code == 0
+
+    with (packs_root / "openapi" / "pack.yaml").open("a") as manifest:
+        manifest.write("# comment only\n")
+    recorded = (snapshot_dir / "pantsagon.openapi.json").read_text()
+    for _ in range(2):
+        matched = _snapshot_run(packs_root, snapshot_dir)
+        assert matched.artifacts[0]["snapshot"]["status"] == "matched"
+        assert matched.artifacts[0]["render_skipped"] is False
+        assert matched.exit_code == 0
+    assert (snapshot_dir / "pantsagon.openapi.json").read_text() == recorded
+    _snapshot_run(packs_root, snapshot_dir, update=True)
+    assert _snapshot_run(packs_root, snapshot_dir).artifacts[0]["snapshot"]["status"] == "hit"
+
+    readme = packs_root / "openapi" / "templates" / "shared" / "contracts" / "openapi"
+    (readme / "README.md.jinja").write_text("changed\n")
+    (readme / "extra.md").write_text("new\n")
+    drift = _snapshot_run(packs_root, snapshot_dir)
+    assert drift.artifacts[0]["snapshot"]["status"] == "drift"
+    assert sorted((d.code, d.location.path) for d in drift.diagnostics) == [
+        ("PACK_SNAPSHOT_FILE_ADDED", "shared/contracts/openapi/extra.md"),
+        ("PACK_SNAPSHOT_FILE_CHANGED", "shared/contracts/openapi/README.md"),
+    ]
+    assert drift.exit_code == 2
+
+
+def test_discovers_local_roots_and_globs_deduped_by_pack_id(tmp_path):
+    bundled = _packs_root()
+    first = tmp_path / "team-a"
+    second = tmp_path / "team-b"
+    shutil.copytree(bundled / "openapi", first / "openapi")
+    shutil.copytree(bundled / "docker", first / "docker")
+    shutil.copytree(bundled / "openapi", second / "openapi-fork")
+
+    targets, diagnostics = discover_packs([str(first), str(tmp_path / "team-*" / "openapi*")])
+    assert [(t.pack_id, t.path, t.source) for t in targets] == [
+        ("pantsagon.docker", first / "docker", "local"),
+        ("pantsagon.openapi", first / "openapi", "local"),
+    ]
+    assert [d.code for d in diagnostics] == ["PACK_ID_DUPLICATE"]
+    assert diagnostics[0].location.path == str(second / "openapi-fork")
+
+
+def test_main_validates_local_packs_in_one_batch(tmp_path, capsys):
+    shutil.copytree(_packs_root() / "openapi", tmp_path / "local" / "openapi")
+    assert main([str(tmp_path / "local"), "--quiet", "--no-render"]) == 0
+    out = capsys.readouterr().out
+    assert "Validated 1 packs" in out
+    assert "- pantsagon.openapi: passed" in out
+
+
+def test_patterns_matching_no_pack_are_errors(tmp_path, capsys):
+    (tmp_path / "empty").mkdir()
+    (tmp_path / "notes.txt").write_text("x")
+    patterns = [
+        str(tmp_path / "missing"),
+        str(tmp_path / "nothing-*"),
+        str(tmp_path / "notes.txt"),
+        str(tmp_path / "empty"),
+    ]
+
+    targets, diagnostics = discover_packs(patterns)
+    assert targets == []
+    assert [(d.code, d.severity.value, d.details["pattern"]) for d in diagnostics] == [
+        ("PACK_PATTERN_UNMATCHED", "error", pattern) for pattern in patterns
+    ]
+    assert [d.message.split(": ")[-1] for d in diagnostics] == [
+        "no such directory",
+        "no directory matches",
+        "not a directory",
+        "no pack found",
+    ]
+
+    assert main([str(tmp_path / "missing"), "--quiet", "--no-render"]) == 2
+    assert "error: " in capsys.readouterr().out
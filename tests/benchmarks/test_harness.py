@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from benchmarks import suite  # noqa: F401
+from benchmarks.harness import REGISTRY, CaseResult, compare, results_payload, run_case
+from benchmarks.run import main
+
+
+def test_suite_registers_core_use_cases() -> None:
+    names = {bench.name for bench in REGISTRY}
+    assert {"init_repo", "add_service", "validate_repo", "workspace_commit"} <= names
+
+
+def test_compare_flags_regressions_and_new_cases() -> None:
+    current = [
+        CaseResult("a", 1, [2.0]).to_dict(),
+        CaseResult("b", 1, [0.5]).to_dict(),
+        CaseResult("c", 1, [1.1]).to_dict(),
+        CaseResult("d", 1, [1.0]).to_dict(),
+    ]
+    baseline = {item["id"]: {**item, "median": 1.0} for item in current[:3]}
+
+    statuses = {row["id"]: row["status"] for row in compare(current, baseline, 0.25)}
+    assert statuses == {
+        "a[1]": "regression",
+        "b[1]": "improvement",
+        "c[1]": "unchanged",
+        "d[1]": "new",
+    }
+
+
+def test_validate_repo_benchmark_runs(tmp_path: Path) -> None:
+    bench = next(b for b in REGISTRY if b.name == "validate_repo")
+    result = run_case(bench, 5, tmp_path, rounds=1)
+    payload = results_payload([result])
+    assert payload["benchmark_schema_version"] == 1
+    assert payload["results"][0]["id"] == "validate_repo[5]"
+    assert payload["results"][0]["rounds"] == 1
+
+
+def test_run_fails_without_a_baseline(tmp_path: Path, capsys) -> None:
+    missing = tmp_path / "baseline.json"
+    assert main(["-k", "no-such-case", "--baseline", str(missing)]) == 2
+    assert "--save-baseline" in capsys.readouterr().err
+    assert main(["-k", "no-such-case", "--baseline", str(missing), "--no-compare"]) == 0
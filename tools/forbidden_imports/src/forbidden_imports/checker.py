@@ -1,11 +1,35 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 import ast
 import fnmatch
+import os
+import re
+import tomllib
+from typing import Iterator
+
 import yaml
 
+DEFAULT_EXCLUDES = [
+    ".git",
+    ".hg",
+    ".svn",
+    ".pants.d",
+    ".pids",
+    "dist",
+    "node_modules",
+    ".venv",
+    "venv",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".tox",
+    ".nox",
+    "*.egg-info",
+]
+
 
 @dataclass(frozen=True)
 class LayerRule:
@@ -17,6 +41,11 @@ class LayerRule:
 @dataclass(frozen=True)
 class Config:
     layers: list[LayerRule]
+    exclude: list[str] = field(default_factory=lambda: list(DEFAULT_EXCLUDES))
+    respect_gitignore: bool = True
+    source_roots: list[str] = field(default_factory=list)
+    transitive: bool = False
+    detect_cycles: bool = False
 
 
 def load_config(path: Path) -> Config:
@@ -24,10 +53,51 @@ def load_config(path: Path) -> Config:
     layers = []
     for name, rules in (data.get("layers") or {}).items():
         layers.append(LayerRule(name=name, include=rules.get("include", []), deny=rules.get("deny", [])))
-    return Config(layers=layers)
+    exclude = [*DEFAULT_EXCLUDES, *[str(item) for item in data.get("exclude") or []]]
+    return Config(
+        layers=layers,
+        exclude=exclude,
+        respect_gitignore=bool(data.get("respect_gitignore", True)),
+        source_roots=[str(item) for item in data.get("source_roots") or []],
+        transitive=bool(data.get("transitive", False)),
+        detect_cycles=bool(data.get("detect_cycles", False)),
+    )
+
+
+def load_source_roots(pants_toml: Path) -> list[str]:
+    try:
+        data = tomllib.loads(pants_toml.read_text(encoding="utf-8"))
+    except (OSError, tomllib.TOMLDecodeError):
+        return []
+    patterns = (data.get("source") or {}).get("root_patterns") or []
+    return [str(item) for item in patterns]
+
+
+def _anchors(root: Path) -> list[str]:
+    """Where layer globs may start: at ``root`` itself or at any of its ancestors.
+
+    For ``/repo/services`` these are ``""``, ``"services/"`` and ``"repo/services/"``,
+    so ``services/**`` still matches when only that subdirectory is scanned.
+    """
+    parts = [part for part in root.absolute().as_posix().split("/") if part]
+    return ["", *("/".join(parts[i:]) + "/" for i in reversed(range(len(parts))))]
 
 
-def _matches_any(path: Path, patterns: list[str]) -> bool:
+def _matches_any(
+    path: Path, patterns: list[str], root: Path | None = None, anchors: list[str] | None = None
+) -> bool:
+    if root is not None:
+        try:
+            rel = path.relative_to(root).as_posix()
+        except ValueError:
+            pass
+        else:
+            candidates = [anchor + rel for anchor in anchors or _anchors(root)]
+            return any(
+                fnmatch.fnmatch(candidate, pattern)
+                for pattern in patterns
+                for candidate in candidates
+            )
     rel = path.as_posix()
     return any(
         fnmatch.fnmatch(rel, pattern) or fnmatch.fnmatch(rel, f"**/{pattern}")
@@ -39,27 +109,421 @@ def _deny_hit(import_name: str, deny: list[str]) -> bool:
     return any(import_name == d or import_name.startswith(d + ".") for d in deny)
 
 
-def scan_files(config: Config, files: list[Path]) -> list[str]:
-    violations: list[str] = []
+@dataclass(frozen=True)
+class ImportRef:
+    name: str
+    lineno: int
+    names: tuple[str, ...] = ()
+
+    def candidates(self) -> list[str]:
+        return [self.name, *(f"{self.name}.{n}" for n in self.names)]
+
+
+@dataclass
+class ModuleNode:
+    name: str
+    path: Path
+    is_package: bool
+    imports: list[ImportRef] = field(default_factory=list)
+
+
+@dataclass
+class ImportGraph:
+    modules: dict[str, ModuleNode] = field(default_factory=dict)
+
+    def resolve(self, import_name: str) -> str | None:
+        name = import_name
+        while name:
+            if name in self.modules:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def targets(self, ref: ImportRef) -> list[str]:
+        submodules = [f"{ref.name}.{n}" for n in ref.names if f"{ref.name}.{n}" in self.modules]
+        if submodules:
+            return submodules
+        target = self.resolve(ref.name)
+        return [target] if target is not None else []
+
+    def successors(self, module: str) -> list[str]:
+        found: list[str] = []
+        for ref in self.modules[module].imports:
+            for target in self.targets(ref):
+                if target != module and target not in found:
+                    found.append(target)
+        return found
+
+
+def _source_root_for(rel_dir: str, source_roots: list[str]) -> str | None:
+    parts = rel_dir.split("/") if rel_dir else []
+    best: str | None = None
+    for depth in range(len(parts) + 1):
+        candidate = "/".join(parts[:depth])
+        for pattern in source_roots:
+            anchored = pattern.startswith("/")
+            pattern = pattern.strip("/")
+            if fnmatch.fnmatch(candidate, pattern) or (
+                not anchored and fnmatch.fnmatch(candidate, f"*/{pattern}")
+            ):
+                best = candidate
+    return best
+
+
+def _package_parts(path: Path) -> list[str]:
+    parts: list[str] = []
+    parent = path.parent
+    while (parent / "__init__.py").exists() and parent.name:
+        parts.insert(0, parent.name)
+        parent = parent.parent
+    return parts
+
+
+def module_name(path: Path, root: Path | None = None, source_roots: list[str] | None = None) -> str:
+    stem_parts = [] if path.name == "__init__.py" else [path.stem]
+    if root is not None and source_roots:
+        try:
+            rel = path.relative_to(root)
+        except ValueError:
+            rel = None
+        if rel is not None:
+            rel_dir = rel.parent.as_posix()
+            rel_dir = "" if rel_dir == "." else rel_dir
+            source_root = _source_root_for(rel_dir, source_roots)
+            if source_root is not None:
+                package = rel_dir[len(source_root) :].strip("/")
+                parts = [*(package.split("/") if package else []), *stem_parts]
+                if parts:
+                    return ".".join(parts)
+    parts = [*_package_parts(path), *stem_parts]
+    return ".".join(parts) if parts else path.parent.name
+
+
+def _resolve_from(node: ast.ImportFrom, module: str, is_package: bool) -> list[ImportRef]:
+    names = tuple(alias.name for alias in node.names if alias.name != "*")
+    if node.level == 0:
+        return [ImportRef(node.module, node.lineno, names)] if node.module else []
+    package = module.split(".") if is_package else module.split(".")[:-1]
+    if node.level - 1 > len(package):
+        return []
+    base = package[: len(package) - (node.level - 1)]
+    if node.module:
+        base = [*base, *node.module.split(".")]
+    if base:
+        return [ImportRef(".".join(base), node.lineno, names)]
+    return [ImportRef(name, node.lineno) for name in names]
+
+
+def _parse_imports(node_info: ModuleNode) -> None:
+    tree = ast.parse(node_info.path.read_text(), filename=str(node_info.path))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                node_info.imports.append(ImportRef(alias.name, node.lineno))
+        elif isinstance(node, ast.ImportFrom):
+            node_info.imports.extend(_resolve_from(node, node_info.name, node_info.is_package))
+
+
+def build_import_graph(
+    files: list[Path],
+    root: Path | None = None,
+    source_roots: list[str] | None = None,
+) -> ImportGraph:
+    graph = ImportGraph()
     for file in files:
-        for layer in config.layers:
-            if _matches_any(file, layer.include):
-                tree = ast.parse(file.read_text(), filename=str(file))
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            if _deny_hit(alias.name, layer.deny):
-                                violations.append(
-                                    f"{file}:{node.lineno} forbidden import '{alias.name}' in layer {layer.name}"
-                                )
-                    elif isinstance(node, ast.ImportFrom) and node.module:
-                        if _deny_hit(node.module, layer.deny):
-                            violations.append(
-                                f"{file}:{node.lineno} forbidden import '{node.module}' in layer {layer.name}"
-                            )
+        name = module_name(file, root, source_roots)
+        if name in graph.modules:
+            name = file.as_posix()
+        node = ModuleNode(name=name, path=file, is_package=file.name == "__init__.py")
+        _parse_imports(node)
+        graph.modules[name] = node
+    return graph
+
+
+def _strongly_connected(edges: dict[str, list[str]]) -> list[list[str]]:
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    components: list[list[str]] = []
+    counter = 0
+    for start in sorted(edges):
+        if start in index:
+            continue
+        work: list[tuple[str, Iterator[str]]] = [(start, iter(edges[start]))]
+        index[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            current, successors = work[-1]
+            advanced = False
+            for succ in successors:
+                if succ not in index:
+                    index[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(edges[succ])))
+                    advanced = True
+                    break
+                if succ in on_stack:
+                    lowlink[current] = min(lowlink[current], index[succ])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[current])
+            if lowlink[current] == index[current]:
+                component: list[str] = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == current:
+                        break
+                components.append(component)
+    # Tarjan emits components in reverse topological order: every component's
+    # successors have already been emitted when it is.
+    return components
+
+
+def _ref_hit(ref: ImportRef, deny: list[str]) -> str | None:
+    for name in ref.candidates():
+        if _deny_hit(name, deny):
+            return name
+    return None
+
+
+def check_graph(config: Config, graph: ImportGraph, root: Path | None = None) -> list[str]:
+    """Violations in ``graph``.
+
+    With ``root``, layer globs match file paths relative to ``root`` or one of its
+    ancestors (see ``_anchors``), the same rule ``iter_python_files`` prunes by.
+    Without it they match anywhere in the path.
+    """
+    violations: list[str] = []
+    anchors = _anchors(root) if root is not None else None
+    layers_by_module: dict[str, list[LayerRule]] = {
+        name: [
+            layer
+            for layer in config.layers
+            if _matches_any(node.path, layer.include, root, anchors)
+        ]
+        for name, node in graph.modules.items()
+    }
+    for name, node in graph.modules.items():
+        for layer in layers_by_module[name]:
+            for ref in node.imports:
+                hit = _ref_hit(ref, layer.deny)
+                if hit is not None:
+                    violations.append(
+                        f"{node.path}:{ref.lineno} forbidden import '{hit}' in layer {layer.name}"
+                    )
+
+    if not config.transitive and not config.detect_cycles:
+        return violations
+
+    # One pass over the strongly connected components yields both cycles and,
+    # per module, the external imports reachable through internal modules.
+    edges = {name: graph.successors(name) for name in graph.modules}
+    reachable: dict[str, set[str]] = {}
+    for component in _strongly_connected(edges):
+        members = set(component)
+        external: set[str] = set()
+        for member in component:
+            for ref in graph.modules[member].imports:
+                if not graph.targets(ref):
+                    external.update(ref.candidates())
+            for succ in edges[member]:
+                if succ not in members:
+                    external |= reachable[succ]
+        for member in component:
+            reachable[member] = external
+
+        if config.detect_cycles and len(component) > 1:
+            cycle = sorted(component)
+            violations.append(f"import cycle: {' -> '.join([*cycle, cycle[0]])}")
+
+    if config.transitive:
+        for name, node in graph.modules.items():
+            direct = {candidate for ref in node.imports for candidate in ref.candidates()}
+            for layer in layers_by_module[name]:
+                reported: set[str] = set()
+                for succ in edges[name]:
+                    for import_name in sorted(reachable[succ] - direct):
+                        if import_name in reported or not _deny_hit(import_name, layer.deny):
+                            continue
+                        reported.add(import_name)
+                        violations.append(
+                            f"{node.path} transitive forbidden import '{import_name}' "
+                            f"in layer {layer.name} via {succ}"
+                        )
     return violations
 
 
+def scan_files(
+    config: Config,
+    files: list[Path],
+    root: Path | None = None,
+) -> list[str]:
+    source_roots = config.source_roots
+    if root is not None and not source_roots:
+        source_roots = load_source_roots(root / "pants.toml")
+    graph = build_import_graph(files, root, source_roots)
+    return check_graph(config, graph, root)
+
+
+@dataclass(frozen=True)
+class _IgnorePattern:
+    base: str
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+def _glob_regex(pattern: str) -> str:
+    """Regex for a .gitignore glob: ``*``, ``?`` and ``[...]`` stay within one path
+    segment, ``**/`` matches zero or more directories and a trailing ``/**``
+    everything below."""
+    out: list[str] = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index) and (index == 0 or pattern[index - 1] == "/"):
+            out.append("(?:.*/)?")
+            index += 3
+        elif pattern.startswith("**", index) and index + 2 == len(pattern) and (
+            index == 0 or pattern[index - 1] == "/"
+        ):
+            out.append(".*")
+            index += 2
+        elif pattern[index] == "*":
+            out.append("[^/]*")
+            index += 1
+        elif pattern[index] == "?":
+            out.append("[^/]")
+            index += 1
+        elif pattern[index] == "[" and "]" in pattern[index + 2 :]:
+            end = pattern.index("]", index + 2)
+            body = pattern[index + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            index = end + 1
+        elif pattern[index] == "\\" and index + 1 < len(pattern):
+            out.append(re.escape(pattern[index + 1]))
+            index += 2
+        else:
+            out.append(re.escape(pattern[index]))
+            index += 1
+    return "".join(out)
+
+
+def _read_gitignore(directory: Path, base: str) -> list[_IgnorePattern]:
+    """Patterns from ``directory/.gitignore``, whose path below the scan root is ``base``.
+
+    Supported: comments, ``!`` negation (the last matching pattern wins), a trailing
+    ``/`` for directories only, patterns containing a ``/`` being anchored to the
+    file's directory, ``*``, ``?``, ``[...]``, ``**`` and ``\\`` escapes. As in git, a
+    path inside an ignored directory cannot be re-included, since that directory is
+    never walked. Trailing spaces are dropped even when escaped, and global excludes
+    (``core.excludesFile``, ``.git/info/exclude``) are not read.
+    """
+    try:
+        lines = (directory / ".gitignore").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    patterns: list[_IgnorePattern] = []
+    for raw in lines:
+        line = raw.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            continue
+        regex = _glob_regex(line)
+        if not anchored:
+            regex = f"(?:.*/)?{regex}"
+        patterns.append(_IgnorePattern(base, re.compile(regex), negate, dir_only))
+    return patterns
+
+
+def _gitignored(rel: str, is_dir: bool, patterns: list[_IgnorePattern]) -> bool:
+    ignored = False
+    for item in patterns:
+        if item.dir_only and not is_dir:
+            continue
+        if item.base:
+            if not rel.startswith(item.base + "/"):
+                continue
+            local = rel[len(item.base) + 1 :]
+        else:
+            local = rel
+        if item.regex.fullmatch(local):
+            ignored = not item.negate
+    return ignored
+
+
+def _literal_prefix(pattern: str) -> str:
+    for index, char in enumerate(pattern):
+        if char in "*?[":
+            return pattern[:index]
+    return pattern
+
+
+def _could_contain_match(rel_dir: str, prefixes: list[str], anchors: list[str]) -> bool:
+    # fnmatch's "*" also matches "/", so anything after the first wildcard can
+    # reach any depth; only the literal prefix constrains which subtrees matter.
+    # Globs start at one of the anchors, as in ``_matches_any``.
+    for anchor in anchors:
+        candidate = f"{anchor}{rel_dir}/"
+        if any(candidate.startswith(p) or p.startswith(candidate) for p in prefixes):
+            return True
+    return False
+
+
+def _excluded(name: str, rel: str, patterns: list[str]) -> bool:
+    return any(fnmatch.fnmatchcase(name, p) or fnmatch.fnmatchcase(rel, p) for p in patterns)
+
+
+def iter_python_files(config: Config, root: Path) -> Iterator[Path]:
+    prefixes = [_literal_prefix(p) for layer in config.layers for p in layer.include]
+    anchors = _anchors(root)
+    stack: list[tuple[Path, str, list[_IgnorePattern]]] = [(root, "", [])]
+    while stack:
+        directory, rel_dir, ignores = stack.pop()
+        if config.respect_gitignore:
+            ignores = [*ignores, *_read_gitignore(directory, rel_dir)]
+        try:
+            with os.scandir(directory) as entries:
+                children = sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirs: list[tuple[Path, str, list[_IgnorePattern]]] = []
+        for entry in children:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if _excluded(entry.name, rel, config.exclude):
+                    continue
+                if not _could_contain_match(rel, prefixes, anchors):
+                    continue
+                if ignores and _gitignored(rel, True, ignores):
+                    continue
+                subdirs.append((Path(entry.path), rel, ignores))
+            elif entry.name.endswith(".py") and entry.is_file():
+                if ignores and _gitignored(rel, False, ignores):
+                    continue
+                yield Path(entry.path)
+        stack.extend(reversed(subdirs))
+
+
 def scan_tree(config: Config, root: Path) -> list[str]:
-    files: list[Path] = [p for p in root.rglob("*.py") if p.is_file()]
-    return scan_files(config, files)
+    files = list(iter_python_files(config, root))
+    return scan_files(config, files, root)
@@ -18,3 +18,57 @@ def test_ports_reject_framework_import(tmp_path: Path) -> None:
     config = load_config(cfg)
     violations = scan_files(config, [bad])
     assert violations, "Expected a violation for ports layer"
+
+
+def _write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _graph_config(tmp_path: Path, extra: str = "") -> Path:
+    cfg = tmp_path / "forbidden_imports.yaml"
+    cfg.write_text(
+        "source_roots: ['src']\n"
+        f"{extra}"
+        "layers:\n"
+        "  domain:\n"
+        "    include: ['src/app/domain/*.py']\n"
+        "    deny: ['app.adapters', 'requests']\n"
+    )
+    return cfg
+
+
+def test_relative_imports_resolve_against_source_roots(tmp_path: Path) -> None:
+    _write(tmp_path / "src" / "app" / "__init__.py", "")
+    _write(tmp_path / "src" / "app" / "adapters" / "__init__.py", "")
+    _write(tmp_path / "src" / "app" / "adapters" / "http.py", "")
+    model = tmp_path / "src" / "app" / "domain" / "model.py"
+    _write(model, "from ..adapters import http\n")
+
+    config = load_config(_graph_config(tmp_path))
+    violations = scan_files(config, sorted((tmp_path / "src").rglob("*.py")), tmp_path)
+    assert violations == [f"{model}:1 forbidden import 'app.adapters' in layer domain"]
+
+
+def test_transitive_violation_reported_via_graph(tmp_path: Path) -> None:
+    _write(tmp_path / "src" / "app" / "helpers.py", "import requests\n")
+    model = tmp_path / "src" / "app" / "domain" / "model.py"
+    _write(model, "from app import helpers\n")
+
+    files = sorted((tmp_path / "src").rglob("*.py"))
+    assert not scan_files(load_config(_graph_config(tmp_path)), files, tmp_path)
+    config = load_config(_graph_config(tmp_path, "transitive: true\n"))
+    violations = scan_files(config, files, tmp_path)
+    assert violations == [
+        f"{model} transitive forbidden import 'requests' in layer domain via app.helpers"
+    ]
+
+
+def test_import_cycles_detected(tmp_path: Path) -> None:
+    _write(tmp_path / "src" / "app" / "a.py", "from . import b\n")
+    _write(tmp_path / "src" / "app" / "b.py", "import app.a\n")
+    _write(tmp_path / "src" / "app" / "c.py", "from app import a\n")
+
+    config = load_config(_graph_config(tmp_path, "detect_cycles: true\n"))
+    violations = scan_files(config, sorted((tmp_path / "src").rglob("*.py")), tmp_path)
+    assert violations == ["import cycle: app.a -> app.b -> app.a"]
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from forbidden_imports.checker import Config, LayerRule, iter_python_files, scan_tree
+
+
+def _write(path: Path, content: str = "") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _config(**kwargs) -> Config:
+    layer = LayerRule(name="domain", include=["services/**/domain/*.py"], deny=["requests"])
+    return Config(layers=[layer], **kwargs)
+
+
+def test_walk_prunes_subtrees_outside_layer_globs(tmp_path: Path) -> None:
+    _write(tmp_path / "services" / "svc" / "domain" / "model.py")
+    _write(tmp_path / "docs" / "conf.py")
+    _write(tmp_path / "setup.py")
+
+    files = [p.relative_to(tmp_path).as_posix() for p in iter_python_files(_config(), tmp_path)]
+    assert files == ["setup.py", "services/svc/domain/model.py"]
+
+
+def test_walk_skips_default_excludes_and_gitignored(tmp_path: Path) -> None:
+    _write(tmp_path / ".gitignore", "generated/\n")
+    _write(tmp_path / "services" / "svc" / "domain" / "model.py")
+    _write(tmp_path / "services" / "svc" / "domain" / "__pycache__" / "stale.py")
+    _write(tmp_path / "services" / "node_modules" / "domain" / "x.py")
+    _write(tmp_path / "services" / "generated" / "domain" / "y.py", "import requests\n")
+
+    files = [p.relative_to(tmp_path).as_posix() for p in iter_python_files(_config(), tmp_path)]
+    assert files == ["services/svc/domain/model.py"]
+    assert not scan_tree(_config(), tmp_path)
+
+
+def test_walk_can_ignore_gitignore_and_extend_excludes(tmp_path: Path) -> None:
+    _write(tmp_path / ".gitignore", "generated/\n")
+    _write(tmp_path / "services" / "generated" / "domain" / "y.py", "import requests\n")
+    _write(tmp_path / "services" / "vendored" / "domain" / "z.py")
+
+    config = _config(respect_gitignore=False, exclude=["vendored"])
+    violations = scan_tree(config, tmp_path)
+    assert len(violations) == 1
+    assert "forbidden import 'requests'" in violations[0]
+
+
+def test_scanning_a_subdirectory_matches_globs_from_its_ancestors(tmp_path: Path) -> None:
+    _write(tmp_path / "services" / "svc" / "domain" / "model.py", "import requests\n")
+    _write(tmp_path / "docs" / "domain" / "conf.py", "import requests\n")
+
+    for root in (tmp_path, tmp_path / "services", tmp_path / "services" / "svc"):
+        violations = scan_tree(_config(), root)
+        assert len(violations) == 1
+        assert "model.py" in violations[0]
+    assert not scan_tree(_config(), tmp_path / "docs")
+
+
+def test_walk_supports_gitignore_double_star_negation_and_anchoring(tmp_path: Path) -> None:
+    _write(
+        tmp_path / ".gitignore",
+        "# generated code\n**/gen/\nservices/**/tmp_*.py\n"
+        "*.py\n!model.py\n!/services/a/domain/keep.py\n",
+    )
+    _write(tmp_path / "services" / "svc" / "domain" / "gen" / "x.py")
+    _write(tmp_path / "services" / "svc" / "domain" / "tmp_a.py")
+    _write(tmp_path / "services" / "svc" / "domain" / "model.py")
+    _write(tmp_path / "services" / "svc" / "domain" / "other.py")
+    _write(tmp_path / "services" / "a" / "domain" / "keep.py")
+    _write(tmp_path / "services" / "b" / "domain" / "keep.py")
+
+    files = [p.relative_to(tmp_path).as_posix() for p in iter_python_files(_config(), tmp_path)]
+    assert files == ["services/a/domain/keep.py", "services/svc/domain/model.py"]